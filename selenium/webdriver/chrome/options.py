@@ -18,10 +18,44 @@
 import base64
 import os
 import platform
+import threading
 import warnings
+from collections import OrderedDict
 
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
+# Encoded extension files by path, size and modification time, shared by
+# all Options instances.
+_MAX_ENCODED_EXTENSIONS = 32
+_encoded_extensions = OrderedDict()
+_encoded_extensions_lock = threading.Lock()
+
+
+def _read_encoded(path):
+    with open(path, 'rb') as file_:
+        # Should not use base64.encodestring() which inserts newlines every
+        # 76 characters (per RFC 1521).  Chromedriver has to remove those
+        # unnecessary newlines before decoding, causing performance hit.
+        return base64.b64encode(file_.read()).decode('UTF-8')
+
+
+def _encoded_extension(path):
+    """Returns an extension file base64 encoded, encoding it once while it is unchanged."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _read_encoded(path)
+    key = (path, stat.st_size, stat.st_mtime)
+    with _encoded_extensions_lock:
+        encoded = _encoded_extensions.get(key)
+    if encoded is None:
+        encoded = _read_encoded(path)
+        with _encoded_extensions_lock:
+            _encoded_extensions[key] = encoded
+            while len(_encoded_extensions) > _MAX_ENCODED_EXTENSIONS:
+                _encoded_extensions.popitem(last=False)
+    return encoded
+
 
 class Options(object):
     KEY = "goog:chromeOptions"
@@ -31,6 +65,7 @@ class Options(object):
         self._arguments = []
         self._extension_files = []
         self._extensions = []
+        self._extension_dirs = []
         self._experimental_options = {}
         self._debugger_address = None
         self._caps = DesiredCapabilities.CHROME.copy()
@@ -104,15 +139,7 @@ class Options(object):
         Returns a list of encoded extensions that will be loaded into chrome
 
         """
-        encoded_extensions = []
-        for ext in self._extension_files:
-            file_ = open(ext, 'rb')
-            # Should not use base64.encodestring() which inserts newlines every
-            # 76 characters (per RFC 1521).  Chromedriver has to remove those
-            # unnecessary newlines before decoding, causing performance hit.
-            encoded_extensions.append(base64.b64encode(file_.read()).decode('UTF-8'))
-
-            file_.close()
+        encoded_extensions = [_encoded_extension(ext) for ext in self._extension_files]
         return encoded_extensions + self._extensions
 
     def add_extension(self, extension):
@@ -132,6 +159,24 @@ class Options(object):
         else:
             raise ValueError("argument can not be null")
 
+    def add_unpacked_extension(self, directory):
+        """
+        Adds the path to an unpacked extension directory, which Chrome loads
+        with the --load-extension argument. Nothing is read or sent to the
+        ChromeDriver, so the directory must be on the machine Chrome runs on.
+
+        :Args:
+         - directory: path to the extension directory
+        """
+        if directory:
+            directory = os.path.abspath(os.path.expanduser(directory))
+            if os.path.isdir(directory):
+                self._extension_dirs.append(directory)
+            else:
+                raise IOError("Path to the extension directory doesn't exist")
+        else:
+            raise ValueError("argument can not be null")
+
     def add_encoded_extension(self, extension):
         """
         Adds Base64 encoded string with extension data to a list that will be used to extract it
@@ -203,6 +248,9 @@ class Options(object):
         if self.binary_location:
             chrome_options["binary"] = self.binary_location
         chrome_options["args"] = self.arguments
+        if self._extension_dirs:
+            chrome_options["args"] = self.arguments + [
+                '--load-extension=%s' % ','.join(self._extension_dirs)]
         if self.debugger_address:
             chrome_options["debuggerAddress"] = self.debugger_address
 
@@ -33,7 +33,7 @@ class WebDriver(RemoteWebDriver):
     def __init__(self, executable_path="chromedriver", port=0,
                  options=None, service_args=None,
                  desired_capabilities=None, service_log_path=None,
-                 chrome_options=None, keep_alive=True):
+                 chrome_options=None, keep_alive=True, service=None):
         """
         Creates a new instance of the chrome driver.
 
@@ -49,6 +49,9 @@ class WebDriver(RemoteWebDriver):
          - service_log_path - Where to log information from the driver.
          - chrome_options - Deprecated argument for options
          - keep_alive - Whether to configure ChromeRemoteConnection to use HTTP keep-alive.
+         - service - Service to use instead of starting a new one, e.g. a
+           lease from a ServicePool. executable_path, port, service_args and
+           service_log_path are ignored if given.
         """
         if chrome_options:
             warnings.warn('use options instead of chrome_options',
@@ -65,11 +68,13 @@ class WebDriver(RemoteWebDriver):
             else:
                 desired_capabilities.update(options.to_capabilities())
 
-        self.service = Service(
-            executable_path,
-            port=port,
-            service_args=service_args,
-            log_path=service_log_path)
+        if service is None:
+            service = Service(
+                executable_path,
+                port=port,
+                service_args=service_args,
+                log_path=service_log_path)
+        self.service = service
         self.service.start()
 
         try:
@@ -20,7 +20,6 @@ import os
 import platform
 import subprocess
 from subprocess import PIPE
-import time
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common import utils
 
@@ -34,6 +33,14 @@ except ImportError:
 
 class Service(object):
 
+    #: Seconds to wait for the service to accept connections when started, and
+    #: to stop accepting them when shut down.
+    start_timeout = 30
+
+    #: Whether the service is only considered started once its /status
+    #: endpoint responds, rather than as soon as its port accepts connections.
+    wait_for_status = False
+
     def __init__(self, executable, port=0, log_file=DEVNULL, env=None, start_error_message=""):
         self.path = executable
 
@@ -93,15 +100,14 @@ class Service(object):
             raise WebDriverException(
                 "The executable %s needs to be available in the path. %s\n%s" %
                 (os.path.basename(self.path), self.start_error_message, str(e)))
-        count = 0
-        while True:
-            self.assert_process_still_running()
-            if self.is_connectable():
-                break
-            count += 1
-            time.sleep(1)
-            if count == 30:
-                raise WebDriverException("Can not connect to the Service %s" % self.path)
+        if not utils.poll_until(self._is_ready, self.start_timeout):
+            raise WebDriverException("Can not connect to the Service %s" % self.path)
+
+    def _is_ready(self):
+        self.assert_process_still_running()
+        if not self.is_connectable():
+            return False
+        return not self.wait_for_status or utils.is_url_connectable(self.port)
 
     def assert_process_still_running(self):
         return_code = self.process.poll()
@@ -128,11 +134,7 @@ class Service(object):
         except URLError:
             return
 
-        for x in range(30):
-            if not self.is_connectable():
-                break
-            else:
-                time.sleep(1)
+        utils.poll_until(lambda: not self.is_connectable(), self.start_timeout)
 
     def stop(self):
         """
@@ -0,0 +1,217 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Sharing running driver executables between sessions."""
+
+import threading
+from multiprocessing.pool import ThreadPool
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.utils import _clock
+
+
+class ServiceLease(object):
+    """
+    A slot on a service running in a ServicePool. It can be passed as the
+    `service` of a local WebDriver, which starts and stops it like a Service
+    of its own; stopping it gives the slot back to the pool and leaves the
+    driver executable running.
+    """
+
+    def __init__(self, pool, service):
+        self._pool = pool
+        self._service = service
+        self._released = False
+
+    @property
+    def service(self):
+        """The Service this lease is on."""
+        return self._service
+
+    @property
+    def port(self):
+        """The port the service listens on."""
+        return self._service.port
+
+    @property
+    def service_url(self):
+        """Gets the url of the Service."""
+        return self._service.service_url
+
+    def start(self):
+        """Does nothing, the pool has already started the service."""
+
+    def stop(self):
+        """Gives the slot back to the pool."""
+        if not self._released:
+            self._released = True
+            self._pool._release(self._service)
+
+
+class ServicePool(object):
+    """
+    Keeps driver executables such as chromedriver running, so sessions start
+    without waiting for a driver process to come up, and runs up to
+    `max_sessions` sessions on each of them.
+
+    Services are started concurrently, each on a port of its own. Drivers
+    that support several sessions per process, like chromedriver, can share
+    a service; geckodriver runs one session at a time, so keep `max_sessions`
+    at 1 for Firefox.
+
+    Example::
+
+        from selenium.webdriver.chrome.service import Service
+
+        pool = ServicePool(lambda: Service('chromedriver'), size=4, max_sessions=8)
+        pool.start()
+        driver = webdriver.Chrome(options=options, service=pool.acquire())
+        ...
+        driver.quit()  # gives the slot back, chromedriver keeps running
+        pool.stop()
+    """
+
+    def __init__(self, service_factory, size=1, max_sessions=1):
+        """
+        :Args:
+         - service_factory - callable taking no arguments and returning a
+           new, unstarted Service.
+         - size - maximum number of services kept running.
+         - max_sessions - maximum number of sessions per service.
+        """
+        self._factory = service_factory
+        self._size = size
+        self._max_sessions = max_sessions
+        self._lock = threading.Condition()
+        self._sessions = {}
+        self._starting = 0
+        self._stopped = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """
+        Starts services concurrently until `size` of them are running.
+        """
+        with self._lock:
+            self._stopped = False
+            count = self._size - len(self._sessions) - self._starting
+            self._starting += max(count, 0)
+        if count <= 0:
+            return
+
+        def start(_):
+            try:
+                return self._start()
+            except Exception as e:
+                return e
+
+        pool = ThreadPool(count)
+        try:
+            started = pool.map(start, range(count))
+        finally:
+            pool.close()
+            pool.join()
+        errors = [e for e in started if isinstance(e, Exception)]
+        if errors:
+            raise errors[0]
+
+    def acquire(self, timeout=None):
+        """
+        Takes a slot on the least busy running service, starting a service if
+        all are full and the pool has room, or waiting for a slot otherwise.
+
+        :Args:
+         - timeout - seconds to wait for a slot, None to wait indefinitely.
+
+        :Returns:
+          A ServiceLease to pass as the `service` of a local WebDriver.
+
+        :Raises:
+         - TimeoutException - if no slot became available in time.
+        """
+        end_time = None if timeout is None else _clock() + timeout
+        with self._lock:
+            while True:
+                if self._stopped:
+                    raise WebDriverException("The service pool is stopped")
+                service = self._least_busy()
+                if service is not None:
+                    self._sessions[service] += 1
+                    return ServiceLease(self, service)
+                if len(self._sessions) + self._starting < self._size:
+                    self._starting += 1
+                    break
+                remaining = None if end_time is None else end_time - _clock()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutException("No driver service became available")
+                self._lock.wait(remaining)
+        return ServiceLease(self, self._start(sessions=1))
+
+    def stop(self):
+        """
+        Stops every service, including those sessions are still running on.
+        """
+        with self._lock:
+            self._stopped = True
+            services, self._sessions = list(self._sessions), {}
+            self._lock.notify_all()
+        for service in services:
+            service.stop()
+
+    def _least_busy(self):
+        available = []
+        for service, sessions in list(self._sessions.items()):
+            if service.process.poll() is not None:
+                del self._sessions[service]
+            elif sessions < self._max_sessions:
+                available.append((sessions, service))
+        if not available:
+            return None
+        return min(available, key=lambda item: item[0])[1]
+
+    def _start(self, sessions=0):
+        try:
+            service = self._factory()
+            service.start()
+        except BaseException:
+            with self._lock:
+                self._starting -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._starting -= 1
+            stopped = self._stopped
+            if not stopped:
+                self._sessions[service] = sessions
+            self._lock.notify_all()
+        if stopped:
+            # The pool was stopped while the service started.
+            service.stop()
+            raise WebDriverException("The service pool is stopped")
+        return service
+
+    def _release(self, service):
+        with self._lock:
+            if service in self._sessions:
+                self._sessions[service] -= 1
+                self._lock.notify()
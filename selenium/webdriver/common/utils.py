@@ -19,6 +19,9 @@
 The Utils methods.
 """
 import socket
+import threading
+import time
+from collections import deque
 from selenium.webdriver.common.keys import Keys
 
 try:
@@ -27,16 +30,45 @@ except NameError:
     # Python 3
     basestring = str
 
+try:
+    _clock = time.monotonic
+except AttributeError:  # 2.7
+    _clock = time.time
+
+
+_allocated_ports = set()
+_allocated_order = deque()
+_allocated_lock = threading.Lock()
+_MAX_ALLOCATED_PORTS = 1024
+
 
 def free_port():
     """
     Determines a free port using sockets.
+
+    The port is only free when it is returned, so a port handed out earlier
+    by this process is not handed out again until many others have been, as
+    the caller that got it may not have bound it yet. This keeps services
+    started concurrently from being given the same port.
     """
-    free_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    free_socket.bind(('0.0.0.0', 0))
-    free_socket.listen(5)
-    port = free_socket.getsockname()[1]
-    free_socket.close()
+    sockets = []
+    try:
+        with _allocated_lock:
+            while True:
+                free_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sockets.append(free_socket)
+                free_socket.bind(('0.0.0.0', 0))
+                free_socket.listen(5)
+                port = free_socket.getsockname()[1]
+                if port not in _allocated_ports:
+                    break
+            _allocated_ports.add(port)
+            _allocated_order.append(port)
+            if len(_allocated_order) > _MAX_ALLOCATED_PORTS:
+                _allocated_ports.discard(_allocated_order.popleft())
+    finally:
+        for free_socket in sockets:
+            free_socket.close()
     return port
 
 
@@ -136,6 +168,35 @@ def is_url_connectable(port):
         return False
 
 
+def poll_until(condition, timeout, interval=0.005, max_interval=0.25, backoff=2):
+    """
+    Calls `condition` until it returns a true value or `timeout` seconds have
+    passed. The wait between calls starts at `interval` seconds and grows by a
+    factor of `backoff` up to `max_interval`, so conditions that are met
+    quickly are noticed quickly without polling in a tight loop for long. The
+    last wait is cut short so the deadline is never overslept.
+
+    :Args:
+     - condition - callable taking no arguments.
+     - timeout - seconds after which to give up.
+     - interval - seconds to wait after the first call.
+     - max_interval - longest wait between two calls.
+     - backoff - factor the wait grows by after each call.
+
+    :Returns:
+      Whether the condition was met in time.
+    """
+    end_time = _clock() + timeout
+    while True:
+        if condition():
+            return True
+        remaining = end_time - _clock()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+
 def keys_to_typing(value):
     """Processes the values that will be typed in the element."""
     typing = []
@@ -27,7 +27,7 @@ class WebDriver(RemoteWebDriver):
 
     def __init__(self, executable_path='MicrosoftWebDriver.exe',
                  capabilities=None, port=0, verbose=False, service_log_path=None,
-                 log_path=None, keep_alive=False):
+                 log_path=None, keep_alive=False, service=None):
         """
         Creates a new instance of the chrome driver.
 
@@ -42,17 +42,24 @@ class WebDriver(RemoteWebDriver):
          - service_log_path - Where to log information from the driver.
          - log_path: Deprecated argument for service_log_path
          - keep_alive - Whether to configure ChromeRemoteConnection to use HTTP keep-alive.
+         - service - Service to use instead of starting a new one, e.g. a
+           lease from a ServicePool. executable_path, port, verbose and
+           service_log_path are ignored if given.
          """
         if log_path:
             warnings.warn('use service_log_path instead of log_path',
                           DeprecationWarning, stacklevel=2)
             service_log_path = log_path
 
-        self.port = port
-        if self.port == 0:
-            self.port = utils.free_port()
+        if service is None:
+            self.port = port
+            if self.port == 0:
+                self.port = utils.free_port()
+            service = Service(executable_path, port=self.port, verbose=verbose, log_path=service_log_path)
+        else:
+            self.port = service.port
 
-        self.edge_service = Service(executable_path, port=self.port, verbose=verbose, log_path=service_log_path)
+        self.edge_service = service
         self.edge_service.start()
 
         if capabilities is None:
@@ -60,7 +67,7 @@ class WebDriver(RemoteWebDriver):
 
         RemoteWebDriver.__init__(
             self,
-            command_executor=RemoteConnection('http://localhost:%d' % self.port,
+            command_executor=RemoteConnection(self.edge_service.service_url,
                                               resolve_ip=False,
                                               keep_alive=keep_alive),
             desired_capabilities=capabilities)
@@ -19,13 +19,17 @@ from __future__ import with_statement
 
 import base64
 import copy
+import fnmatch
+import hashlib
 import json
 import os
 import re
 import shutil
 import sys
 import tempfile
+import threading
 import zipfile
+from collections import OrderedDict
 
 try:
     from cStringIO import StringIO as BytesIO
@@ -46,10 +50,235 @@ class AddonFormatError(Exception):
     """Exception for not well-formed add-on manifest files"""
 
 
+def _profile_files(path):
+    """Yields the path and relative name of every file of a profile, in a stable order."""
+    path_root = len(path) + 1  # account for trailing slash
+    for base, dirs, files in os.walk(path):
+        dirs.sort()
+        for fyle in sorted(files):
+            filename = os.path.join(base, fyle)
+            yield filename, filename[path_root:]
+
+
+def _zip_profile(path, compress_level):
+    """Zips and base64 encodes a profile directory."""
+    kwargs = {}
+    if compress_level == 0:
+        compression = zipfile.ZIP_STORED
+    else:
+        compression = zipfile.ZIP_DEFLATED
+        if compress_level is not None and sys.version_info >= (3, 7):
+            kwargs['compresslevel'] = compress_level
+    fp = BytesIO()
+    zipped = zipfile.ZipFile(fp, 'w', compression, **kwargs)
+    for filename, name in _profile_files(path):
+        zipped.write(filename, name)
+    zipped.close()
+    return base64.b64encode(fp.getvalue()).decode('UTF-8')
+
+
+class _EncodedProfileCache(object):
+    """
+    Encoded profiles keyed by a hash of the content of the profile directory
+    and the compression level, kept in memory and, optionally, on disk.
+
+    Hashing the content of a directory means reading all of it, so the key
+    is also remembered for the size and modification time of its files, and
+    only computed again once one of them changes. Modification times can be
+    too coarse to tell quick rewrites apart, so the profile also passes a
+    generation it bumps whenever it writes to the directory itself.
+
+    The encoded profiles kept in memory are bounded by their total size,
+    but the most recent one is always kept.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=64 * 1024 * 1024):
+        self.directory = None
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()
+        self._encoded = OrderedDict()
+
+    def encode(self, path, compress_level, generation=0):
+        fingerprint, files = self._fingerprint(path, compress_level, generation)
+        with self._lock:
+            key = self._keys.get(fingerprint)
+        if key is None:
+            key = self._content_key(files, compress_level)
+            self._remember(self._keys, fingerprint, key)
+        with self._lock:
+            encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = self._read(key)
+            if encoded is None:
+                encoded = _zip_profile(path, compress_level)
+                self._write(key, encoded)
+            with self._lock:
+                self._encoded[key] = encoded
+                size = sum(len(value) for value in self._encoded.values())
+                while size > self._max_bytes and len(self._encoded) > 1:
+                    size -= len(self._encoded.popitem(last=False)[1])
+        return encoded
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._encoded.clear()
+
+    def _fingerprint(self, path, compress_level, generation):
+        files = list(_profile_files(path))
+        stats = []
+        for filename, name in files:
+            stat = os.stat(filename)
+            stats.append((name, stat.st_size, stat.st_mtime))
+        return (path, compress_level, generation, tuple(stats)), files
+
+    def _content_key(self, files, compress_level):
+        digest = hashlib.sha1(repr(compress_level).encode('UTF-8'))
+        for filename, name in files:
+            digest.update(name.encode('UTF-8') + b'\0')
+            with open(filename, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _remember(self, entries, key, value):
+        with self._lock:
+            entries[key] = value
+            while len(entries) > self._max_entries:
+                entries.popitem(last=False)
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, key + '.b64')) as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def _write(self, key, encoded):
+        if self.directory is None:
+            return
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(encoded)
+            # Renaming makes the file appear complete to other processes.
+            os.rename(temp, os.path.join(self.directory, key + '.b64'))
+        except (IOError, OSError):
+            pass
+
+
+_encoded_cache = _EncodedProfileCache()
+
+_TEMPLATES_DIR = 'webdriver-py-profile-templates'
+_IGNORED_FILES = shutil.ignore_patterns("parent.lock", "lock", ".parentlock")
+
+
+def _profile_template(profile_directory, root):
+    """
+    Returns a private copy of a profile directory, made the first time it is
+    cloned in this state, to hardlink the files of clones to. Templates are
+    shared by processes using the same root directory.
+    """
+    digest = hashlib.sha1(os.path.abspath(profile_directory).encode('UTF-8'))
+    for filename, name in _profile_files(profile_directory):
+        stat = os.stat(filename)
+        digest.update(('%s\0%d\0%r\0' % (name, stat.st_size, stat.st_mtime)).encode('UTF-8'))
+    templates = os.path.join(root or tempfile.gettempdir(), _TEMPLATES_DIR)
+    template = os.path.join(templates, digest.hexdigest())
+    if not os.path.isdir(template):
+        if not os.path.isdir(templates):
+            try:
+                os.makedirs(templates)
+            except OSError:
+                pass  # made by another process meanwhile
+        building = tempfile.mkdtemp(dir=templates, suffix='.tmp')
+        try:
+            shutil.copytree(profile_directory, os.path.join(building, 'profile'),
+                            ignore=_IGNORED_FILES)
+            os.rename(os.path.join(building, 'profile'), template)
+        except OSError:
+            if not os.path.isdir(template):
+                raise
+            # Another process built the same template meanwhile.
+        finally:
+            shutil.rmtree(building, ignore_errors=True)
+    return template
+
+
+def _link_profile(template, destination, linked_files):
+    """
+    Clones a profile template, hardlinking the files matching `linked_files`
+    and copying the rest. Files are copied too if they can't be linked, e.g.
+    because the template is on another file system.
+    """
+    for base, dirs, files in os.walk(template):
+        relative = os.path.relpath(base, template)
+        target = destination if relative == os.curdir else os.path.join(destination, relative)
+        os.mkdir(target)
+        for fyle in files:
+            name = fyle if relative == os.curdir else os.path.join(relative, fyle)
+            name = name.replace(os.sep, '/')
+            source = os.path.join(base, fyle)
+            if any(fnmatch.fnmatch(name, pattern) for pattern in linked_files):
+                try:
+                    os.link(source, os.path.join(target, fyle))
+                    continue
+                except (OSError, AttributeError):  # no os.link on Windows with 2.x
+                    pass
+            shutil.copy2(source, os.path.join(target, fyle))
+
+
 class FirefoxProfile(object):
     ANONYMOUS_PROFILE_NAME = "WEBDRIVER_ANONYMOUS_PROFILE"
     DEFAULT_PREFERENCES = None
 
+    # How a profile_directory is cloned: 'copy' copies every file, 'link'
+    # hardlinks the LINKED_FILES, which Firefox doesn't write to, to a
+    # template copy of the profile made once, and copies the others.
+    # Databases such as cert9.db are opened read-write and must be copied,
+    # or writes would reach the template and every other clone.
+    clone_mode = 'copy'
+    # Directory profiles are created in, e.g. a tmpfs like /dev/shm. None
+    # for the default temporary directory.
+    clone_root = None
+    LINKED_FILES = ('extensions/*.xpi',)
+
+    # Compression level of the zipped profile sent to the remote end: None
+    # for zlib's default, 0 to store files uncompressed, up to 9 for the
+    # smallest profile. Levels other than 0 need Python 3.7.
+    compress_level = None
+
+    @staticmethod
+    def set_encoded_cache_dir(directory):
+        """
+        Keeps encoded profiles in a directory as well as in memory, so other
+        processes sending the same profile don't need to encode it again.
+
+        :Args:
+         - directory - path of the cache directory, created if missing, or
+           None to only cache encoded profiles in memory.
+        """
+        _encoded_cache.directory = directory
+
+    @staticmethod
+    def remove_templates(root=None):
+        """
+        Removes the profile templates made by the 'link' clone mode. Clones
+        already made keep working.
+
+        :Args:
+         - root - the clone_root the templates were made in.
+        """
+        shutil.rmtree(os.path.join(root or tempfile.gettempdir(), _TEMPLATES_DIR),
+                      ignore_errors=True)
+
     def __init__(self, profile_directory=None):
         """
         Initialises a new instance of a Firefox Profile
@@ -69,15 +298,19 @@ class FirefoxProfile(object):
         self.default_preferences = copy.deepcopy(
             FirefoxProfile.DEFAULT_PREFERENCES['mutable'])
         self.native_events_enabled = True
+        self._generation = 0
         self.profile_dir = profile_directory
         self.tempfolder = None
         if self.profile_dir is None:
             self.profile_dir = self._create_tempfolder()
         else:
-            self.tempfolder = tempfile.mkdtemp()
+            self.tempfolder = tempfile.mkdtemp(dir=self.clone_root)
             newprof = os.path.join(self.tempfolder, "webdriver-py-profilecopy")
-            shutil.copytree(self.profile_dir, newprof,
-                            ignore=shutil.ignore_patterns("parent.lock", "lock", ".parentlock"))
+            if self.clone_mode == 'link':
+                _link_profile(_profile_template(self.profile_dir, self.clone_root), newprof,
+                              self.LINKED_FILES)
+            else:
+                shutil.copytree(self.profile_dir, newprof, ignore=_IGNORED_FILES)
             self.profile_dir = newprof
             os.chmod(self.profile_dir, 0o755)
             self._read_existing_userjs(os.path.join(self.profile_dir, "user.js"))
@@ -171,15 +404,7 @@ class FirefoxProfile(object):
         for use with remote WebDriver JSON wire protocol
         """
         self.update_preferences()
-        fp = BytesIO()
-        zipped = zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED)
-        path_root = len(self.path) + 1  # account for trailing slash
-        for base, dirs, files in os.walk(self.path):
-            for fyle in files:
-                filename = os.path.join(base, fyle)
-                zipped.write(filename, filename[path_root:])
-        zipped.close()
-        return base64.b64encode(fp.getvalue()).decode('UTF-8')
+        return _encoded_cache.encode(self.path, self.compress_level, self._generation)
 
     def set_proxy(self, proxy):
         import warnings
@@ -217,15 +442,25 @@ class FirefoxProfile(object):
         """
         Creates a temp folder to store User.js and the extension
         """
-        return tempfile.mkdtemp()
+        return tempfile.mkdtemp(dir=self.clone_root)
 
     def _write_user_prefs(self, user_prefs):
         """
         writes the current user prefs dictionary to disk
         """
+        content = ''.join('user_pref("%s", %s);\n' % (key, json.dumps(value))
+                          for key, value in user_prefs.items())
+        # Leave the file alone if it is up to date, so the encoded profile
+        # is still cached.
+        try:
+            with open(self.userPrefs) as f:
+                if f.read() == content:
+                    return
+        except (IOError, OSError):
+            pass
         with open(self.userPrefs, "w") as f:
-            for key, value in user_prefs.items():
-                f.write('user_pref("%s", %s);\n' % (key, json.dumps(value)))
+            f.write(content)
+        self._generation += 1
 
     def _read_existing_userjs(self, userjs):
         import warnings
@@ -283,10 +518,14 @@ class FirefoxProfile(object):
             if not os.path.exists(self.extensionsDir):
                 os.makedirs(self.extensionsDir)
                 os.chmod(self.extensionsDir, 0o755)
+            if os.path.exists(addon_path + '.xpi'):
+                # It may be linked to a profile template, don't write through it.
+                os.remove(addon_path + '.xpi')
             shutil.copy(xpifile, addon_path + '.xpi')
         else:
             if not os.path.exists(addon_path):
                 shutil.copytree(addon, addon_path, symlinks=True)
+        self._generation += 1
 
         # remove the temporary directory, if any
         if tmpdir:
@@ -52,7 +52,7 @@ class WebDriver(RemoteWebDriver):
                  executable_path="geckodriver", options=None,
                  service_log_path="geckodriver.log", firefox_options=None,
                  service_args=None, desired_capabilities=None, log_path=None,
-                 keep_alive=True):
+                 keep_alive=True, service=None):
         """Starts a new local session of Firefox.
 
         Based on the combination and specificity of the various keyword
@@ -104,6 +104,9 @@ class WebDriver(RemoteWebDriver):
         :param log_path: Deprecated argument for service_log_path
         :param keep_alive: Whether to configure remote_connection.RemoteConnection to use
              HTTP keep-alive.
+        :param service: Service to use instead of starting a new geckodriver,
+            e.g. a lease from a ServicePool. executable_path, service_args and
+            service_log_path are ignored if given.
         """
         if log_path:
             warnings.warn('use service_log_path instead of log_path',
@@ -157,10 +160,12 @@ class WebDriver(RemoteWebDriver):
 
         if capabilities.get("marionette"):
             capabilities.pop("marionette")
-            self.service = Service(
-                executable_path,
-                service_args=service_args,
-                log_path=service_log_path)
+            if service is None:
+                service = Service(
+                    executable_path,
+                    service_args=service_args,
+                    log_path=service_log_path)
+            self.service = service
             self.service.start()
 
             capabilities.update(options.to_capabilities())
@@ -20,6 +20,8 @@ from selenium.webdriver.remote.webelement import WebElement as RemoteWebElement
 
 class FirefoxWebElement(RemoteWebElement):
 
+    __slots__ = ()
+
     @property
     def anonymous_children(self):
         """Retrieve the anonymous children of this element in an XBL
@@ -0,0 +1,231 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""The asyncio connection with the Remote WebDriver server. Requires Python 3.5+."""
+
+import asyncio
+import logging
+import ssl
+from urllib import parse
+
+from selenium.common.exceptions import WebDriverException
+from .remote_connection import RemoteConnection, _LoggedBody, _parse_response
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncRemoteConnection(RemoteConnection):
+    """An asyncio connection with the Remote WebDriver server.
+
+    Uses the same command table, headers and response handling as
+    RemoteConnection, but `execute` is a coroutine and requests are sent over
+    non-blocking sockets, so a single event loop can drive many sessions at
+    once. Connections to the server are kept alive and reused between commands.
+    """
+
+    def __init__(self, remote_server_addr, resolve_ip=False, max_idle_connections=10):
+        """
+        Creates a connection to the remote server. No network traffic happens
+        until the first command is executed.
+
+        :Args:
+         - remote_server_addr - URL of the remote server.
+         - resolve_ip - Whether to resolve the hostname to an IP address up front.
+           This blocks, so it is off by default.
+         - max_idle_connections - Number of idle connections kept open for reuse.
+        """
+        RemoteConnection.__init__(self, remote_server_addr, keep_alive=False,
+                                  resolve_ip=resolve_ip)
+        self._max_idle = max_idle_connections
+        self._idle = {}
+
+    async def execute(self, command, params):
+        """
+        Send a command to the remote server.
+
+        Any path subtitutions required for the URL mapped to the command should be
+        included in the command parameters.
+
+        :Args:
+         - command - A string specifying the command to execute.
+         - params - A dictionary of named parameters to send with the command as
+           its JSON payload.
+        """
+        method, url, data = self._command_request(command, params)
+        return await self._request(method, url, body=data)
+
+    def execute_streaming(self, command, params, output, base64_value=False):
+        """Not supported, streaming responses to a file would block the event loop."""
+        raise WebDriverException("AsyncRemoteConnection does not support execute_streaming")
+
+    def execute_with_body(self, command, params, body):
+        """Not supported, use `execute` with the parsed payload instead."""
+        raise WebDriverException("AsyncRemoteConnection does not support execute_with_body")
+
+    def add_command_listener(self, listener):
+        """Not supported, commands sent over this connection are not measured."""
+        raise WebDriverException("AsyncRemoteConnection does not support command listeners")
+
+    async def close(self):
+        """
+        Closes the idle connections held open to the remote server.
+        """
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                writer.close()
+
+    async def _request(self, method, url, body=None):
+        """
+        Send an HTTP request to the remote server.
+
+        :Args:
+         - method - A string for the HTTP method to send the request with.
+         - url - A string for the URL to send the request to.
+         - body - UTF-8 encoded request body. Ignored unless method is POST or PUT.
+
+        :Returns:
+          A dictionary with the server's parsed JSON response.
+        """
+        LOGGER.debug('%s %s %s', method, url, _LoggedBody(body, self._log_body_limit))
+
+        headers = self._request_headers(url)
+        if body and method != 'POST' and method != 'PUT':
+            body = None
+
+        exchange = self._exchange(parse.urlparse(url), method, headers, body)
+        timeout = self.get_timeout()
+        if timeout is not None:
+            statuscode, resp_headers, data = await asyncio.wait_for(exchange, timeout)
+        else:
+            statuscode, resp_headers, data = await exchange
+        LOGGER.debug("Finished Request")
+
+        if 300 <= statuscode < 304:
+            return await self._request('GET', parse.urljoin(url, resp_headers.get('location')))
+        return _parse_response(statuscode, resp_headers.get('content-type'), data)
+
+    async def _exchange(self, parsed_url, method, headers, body):
+        """
+        Writes a request on a pooled connection and reads the response.
+
+        :Returns:
+          A tuple of the status code, a dictionary of lower cased response
+          headers and the response body as bytes.
+        """
+        secure = parsed_url.scheme == 'https'
+        key = (parsed_url.scheme, parsed_url.hostname,
+               parsed_url.port or (443 if secure else 80))
+        path = parsed_url.path or '/'
+        if parsed_url.query:
+            path = '%s?%s' % (path, parsed_url.query)
+
+        lines = ['%s %s HTTP/1.1' % (method, path),
+                 'Host: %s' % parsed_url.netloc.rpartition('@')[2]]
+        lines.extend('%s: %s' % item for item in headers.items())
+        payload = b''
+        if body is not None:
+            payload = body if isinstance(body, bytes) else body.encode('utf-8')
+            lines.append('Content-Length: %d' % len(payload))
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload
+
+        while True:
+            reader, writer, reused = await self._acquire(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                statuscode, resp_headers, data, keep_alive = await _read_response(reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    # The server dropped an idle keep-alive connection, retry on a new one.
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                self._release(key, reader, writer)
+            else:
+                writer.close()
+            return statuscode, resp_headers, data
+
+    async def _acquire(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        ssl_context = ssl.create_default_context() if scheme == 'https' else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return reader, writer, False
+
+    def _release(self, key, reader, writer):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self._max_idle:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+
+async def _read_response(reader, method):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('Remote end closed connection without response')
+    parts = status_line.decode('latin-1').split(None, 2)
+    version, statuscode = parts[0], int(parts[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        keep_alive = connection == 'keep-alive'
+    else:
+        keep_alive = connection != 'close'
+
+    if method == 'HEAD' or statuscode in (204, 304) or 100 <= statuscode < 200:
+        data = b''
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        data = await _read_chunked(reader)
+    elif 'content-length' in headers:
+        data = await reader.readexactly(int(headers['content-length']))
+    else:
+        data = await reader.read()
+        keep_alive = False
+    return statuscode, headers, data, keep_alive
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b';')[0], 16)
+        if size == 0:
+            # Skip any trailers up to the terminating blank line.
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            return b''.join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
@@ -0,0 +1,171 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""asyncio counterparts of SwitchTo and Alert. Requires Python 3.5+."""
+
+from selenium.common.exceptions import NoSuchElementException, NoSuchFrameException, NoSuchWindowException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.utils import keys_to_typing
+from .command import Command
+
+
+class AsyncAlert(object):
+    """
+    Allows to work with alerts of a page driven by an AsyncWebDriver.
+
+    Usage::
+
+        alert = await driver.switch_to.alert
+        text = await alert.text
+        await alert.accept()
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    async def text(self):
+        """
+        Gets the text of the Alert.
+        """
+        if self.driver.w3c:
+            return (await self.driver.execute(Command.W3C_GET_ALERT_TEXT))["value"]
+        else:
+            return (await self.driver.execute(Command.GET_ALERT_TEXT))["value"]
+
+    async def dismiss(self):
+        """
+        Dismisses the alert available.
+        """
+        if self.driver.w3c:
+            await self.driver.execute(Command.W3C_DISMISS_ALERT)
+        else:
+            await self.driver.execute(Command.DISMISS_ALERT)
+
+    async def accept(self):
+        """
+        Accepts the alert available.
+        """
+        if self.driver.w3c:
+            await self.driver.execute(Command.W3C_ACCEPT_ALERT)
+        else:
+            await self.driver.execute(Command.ACCEPT_ALERT)
+
+    async def send_keys(self, keysToSend):
+        """
+        Send Keys to the Alert.
+
+        :Args:
+         - keysToSend: The text to be sent to Alert.
+        """
+        if self.driver.w3c:
+            await self.driver.execute(Command.W3C_SET_ALERT_VALUE, {'value': keys_to_typing(keysToSend),
+                                                                    'text': keysToSend})
+        else:
+            await self.driver.execute(Command.SET_ALERT_VALUE, {'text': keysToSend})
+
+
+class AsyncSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    @property
+    async def active_element(self):
+        """
+        Returns the element with focus, or BODY if nothing has focus.
+
+        :Usage:
+            element = await driver.switch_to.active_element
+        """
+        if self._driver.w3c:
+            return (await self._driver.execute(Command.W3C_GET_ACTIVE_ELEMENT))['value']
+        else:
+            return (await self._driver.execute(Command.GET_ACTIVE_ELEMENT))['value']
+
+    @property
+    async def alert(self):
+        """
+        Switches focus to an alert on the page.
+
+        :Usage:
+            alert = await driver.switch_to.alert
+        """
+        alert = AsyncAlert(self._driver)
+        await alert.text
+        return alert
+
+    async def default_content(self):
+        """
+        Switch focus to the default frame.
+        """
+        await self._driver.execute(Command.SWITCH_TO_FRAME, {'id': None})
+
+    async def frame(self, frame_reference):
+        """
+        Switches focus to the specified frame, by index, name, or webelement.
+
+        :Args:
+         - frame_reference: The name of the window to switch to, an integer representing the index,
+                            or a webelement that is an (i)frame to switch to.
+        """
+        if isinstance(frame_reference, str) and self._driver.w3c:
+            try:
+                frame_reference = await self._driver.find_element(By.ID, frame_reference)
+            except NoSuchElementException:
+                try:
+                    frame_reference = await self._driver.find_element(By.NAME, frame_reference)
+                except NoSuchElementException:
+                    raise NoSuchFrameException(frame_reference)
+
+        await self._driver.execute(Command.SWITCH_TO_FRAME, {'id': frame_reference})
+
+    async def parent_frame(self):
+        """
+        Switches focus to the parent context.
+        """
+        await self._driver.execute(Command.SWITCH_TO_PARENT_FRAME)
+
+    async def window(self, window_name):
+        """
+        Switches focus to the specified window.
+
+        :Args:
+         - window_name: The name or window handle of the window to switch to.
+        """
+        if self._driver.w3c:
+            await self._w3c_window(window_name)
+            return
+        await self._driver.execute(Command.SWITCH_TO_WINDOW, {'name': window_name})
+
+    async def _w3c_window(self, window_name):
+        async def send_handle(h):
+            await self._driver.execute(Command.SWITCH_TO_WINDOW, {'handle': h})
+
+        try:
+            # Try using it as a handle first.
+            await send_handle(window_name)
+        except NoSuchWindowException as e:
+            # Check every window to try to find the given window name.
+            original_handle = await self._driver.current_window_handle
+            handles = await self._driver.window_handles
+            for handle in handles:
+                await send_handle(handle)
+                current_name = await self._driver.execute_script('return window.name')
+                if window_name == current_name:
+                    return
+            await send_handle(original_handle)
+            raise e
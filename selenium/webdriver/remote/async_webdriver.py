@@ -0,0 +1,393 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""The asyncio WebDriver implementation. Requires Python 3.5+."""
+
+import base64
+
+from selenium.common.exceptions import (InvalidArgumentException,
+                                        WebDriverException,
+                                        NoSuchCookieException)
+from selenium.webdriver.common.by import By
+from .async_remote_connection import AsyncRemoteConnection
+from .async_switch_to import AsyncSwitchTo
+from .async_webelement import AsyncWebElement, _to_w3c_locator
+from .command import Command
+from .errorhandler import ErrorHandler
+from .webdriver import WebDriver, _dialects, _new_session_parameters
+
+
+class AsyncWebDriver(object):
+    """
+    Controls a browser by sending commands to a remote server from an
+    asyncio event loop.
+
+    Mirrors remote.webdriver.WebDriver, but every method that talks to the
+    server is a coroutine, and so is every property that does. The session is
+    started by ``await driver.start_session()`` or by using the driver as an
+    async context manager::
+
+        async with AsyncWebDriver(desired_capabilities=caps) as driver:
+            await driver.get('http://www.python.org')
+            title = await driver.title
+            element = await driver.find_element(By.NAME, 'q')
+            await element.send_keys('pycon')
+
+    :Attributes:
+     - session_id - String ID of the browser session started and controlled by this WebDriver.
+     - capabilities - Dictionary of effective capabilities of this browser session as returned
+         by the remote server.
+     - command_executor - async_remote_connection.AsyncRemoteConnection object used to execute commands.
+     - error_handler - errorhandler.ErrorHandler object used to handle errors.
+    """
+
+    _web_element_cls = AsyncWebElement
+    session_dialect = None  # See WebDriver.session_dialect
+
+    def __init__(self, command_executor='http://127.0.0.1:4444/wd/hub',
+                 desired_capabilities=None, options=None):
+        """
+        Create a new driver that will issue commands using the wire protocol.
+
+        :Args:
+         - command_executor - Either a string representing URL of the remote server or a custom
+             async_remote_connection.AsyncRemoteConnection object.
+         - desired_capabilities - A dictionary of capabilities to request when
+             starting the browser session.
+         - options - instance of a driver options.Options class
+        """
+        capabilities = {}
+        if options is not None:
+            capabilities = options.to_capabilities()
+        if desired_capabilities is not None:
+            if not isinstance(desired_capabilities, dict):
+                raise WebDriverException("Desired Capabilities must be a dictionary")
+            else:
+                capabilities.update(desired_capabilities)
+        self._owns_executor = isinstance(command_executor, (str, bytes))
+        if self._owns_executor:
+            command_executor = AsyncRemoteConnection(command_executor)
+        self.command_executor = command_executor
+        self._is_remote = True
+        self._requested_capabilities = capabilities
+        self.session_id = None
+        self.capabilities = {}
+        self.w3c = False
+        self.error_handler = ErrorHandler()
+        self._switch_to = AsyncSwitchTo(self)
+
+    __repr__ = WebDriver.__repr__
+    name = WebDriver.name
+    create_web_element = WebDriver.create_web_element
+    _session_dialect = WebDriver._session_dialect
+    _dialect_key = WebDriver._dialect_key
+    _create_web_elements = WebDriver._create_web_elements
+    _wrap_value = WebDriver._wrap_value
+    _wrap_element = WebDriver._wrap_element
+    _unwrap_value = WebDriver._unwrap_value
+    _unwrap_element = WebDriver._unwrap_element
+
+    async def __aenter__(self):
+        if self.session_id is None:
+            await self.start_session()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.quit()
+
+    async def start_session(self, capabilities=None):
+        """
+        Creates a new session with the desired capabilities.
+
+        :Args:
+         - capabilities - A dictionary of capabilities to request. Defaults to the
+           capabilities the driver was created with.
+        """
+        if capabilities is None:
+            capabilities = self._requested_capabilities
+        if not isinstance(capabilities, dict):
+            raise InvalidArgumentException("Capabilities must be a dictionary")
+        dialect = self._session_dialect()
+        try:
+            response = await self.execute(Command.NEW_SESSION,
+                                          _new_session_parameters(capabilities, dialect))
+        except WebDriverException:
+            if self.session_dialect != 'detect' or dialect is None:
+                raise
+            response = await self.execute(Command.NEW_SESSION,
+                                          _new_session_parameters(capabilities, None))
+        if 'sessionId' not in response:
+            response = response['value']
+        self.session_id = response['sessionId']
+        self.capabilities = response.get('value')
+
+        # if capabilities is none we are probably speaking to
+        # a W3C endpoint
+        if self.capabilities is None:
+            self.capabilities = response.get('capabilities')
+
+        # Double check to see if we have a W3C Compliant browser
+        self.w3c = response.get('status') is None
+        self.command_executor.w3c = self.w3c
+        if self.session_dialect == 'detect':
+            _dialects[self._dialect_key()] = 'w3c' if self.w3c else 'oss'
+
+    async def execute(self, driver_command, params=None):
+        """
+        Sends a command to be executed by the command executor.
+
+        :Args:
+         - driver_command: The name of the command to execute as a string.
+         - params: A dictionary of named parameters to send with the command.
+
+        :Returns:
+          The command's JSON response loaded into a dictionary object.
+        """
+        if self.session_id is not None:
+            if not params:
+                params = {'sessionId': self.session_id}
+            elif 'sessionId' not in params:
+                params['sessionId'] = self.session_id
+
+        params = self._wrap_value(params)
+        response = await self.command_executor.execute(driver_command, params)
+        if response:
+            self.error_handler.check_response(response)
+            response['value'] = self._unwrap_value(
+                response.get('value', None))
+            return response
+        # If the server doesn't send a response, assume the command was
+        # a success
+        return {'success': 0, 'value': None, 'sessionId': self.session_id}
+
+    async def get(self, url):
+        """
+        Loads a web page in the current browser session.
+        """
+        await self.execute(Command.GET, {'url': url})
+
+    @property
+    async def title(self):
+        """Returns the title of the current page."""
+        resp = await self.execute(Command.GET_TITLE)
+        return resp['value'] if resp['value'] is not None else ""
+
+    async def find_element(self, by=By.ID, value=None):
+        """
+        Find an element given a By strategy and locator.
+
+        :Usage:
+            element = await driver.find_element(By.ID, 'foo')
+        """
+        if self.w3c:
+            by, value = _to_w3c_locator(by, value)
+        return (await self.execute(Command.FIND_ELEMENT, {
+            'using': by,
+            'value': value}))['value']
+
+    async def find_elements(self, by=By.ID, value=None):
+        """
+        Find elements given a By strategy and locator.
+
+        :Usage:
+            elements = await driver.find_elements(By.CLASS_NAME, 'foo')
+        """
+        if self.w3c:
+            by, value = _to_w3c_locator(by, value)
+        return (await self.execute(Command.FIND_ELEMENTS, {
+            'using': by,
+            'value': value}))['value'] or []
+
+    async def execute_script(self, script, *args):
+        """
+        Synchronously Executes JavaScript in the current window/frame.
+
+        :Usage:
+            await driver.execute_script('return document.title;')
+        """
+        command = Command.W3C_EXECUTE_SCRIPT if self.w3c else Command.EXECUTE_SCRIPT
+        return (await self.execute(command, {
+            'script': script,
+            'args': list(args)}))['value']
+
+    async def execute_async_script(self, script, *args):
+        """
+        Asynchronously Executes JavaScript in the current window/frame.
+        """
+        command = Command.W3C_EXECUTE_SCRIPT_ASYNC if self.w3c else Command.EXECUTE_ASYNC_SCRIPT
+        return (await self.execute(command, {
+            'script': script,
+            'args': list(args)}))['value']
+
+    @property
+    async def current_url(self):
+        """Gets the URL of the current page."""
+        return (await self.execute(Command.GET_CURRENT_URL))['value']
+
+    @property
+    async def page_source(self):
+        """Gets the source of the current page."""
+        return (await self.execute(Command.GET_PAGE_SOURCE))['value']
+
+    async def close(self):
+        """Closes the current window."""
+        await self.execute(Command.CLOSE)
+
+    async def quit(self):
+        """Quits the driver and closes every associated window."""
+        try:
+            await self.execute(Command.QUIT)
+        finally:
+            await self.stop_client()
+
+    async def stop_client(self):
+        """
+        Called after executing a quit command. Closes the connection to the
+        remote server if this driver created it.
+        """
+        if self._owns_executor:
+            await self.command_executor.close()
+
+    @property
+    async def current_window_handle(self):
+        """Returns the handle of the current window."""
+        if self.w3c:
+            return (await self.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE))['value']
+        else:
+            return (await self.execute(Command.GET_CURRENT_WINDOW_HANDLE))['value']
+
+    @property
+    async def window_handles(self):
+        """Returns the handles of all windows within the current session."""
+        if self.w3c:
+            return (await self.execute(Command.W3C_GET_WINDOW_HANDLES))['value']
+        else:
+            return (await self.execute(Command.GET_WINDOW_HANDLES))['value']
+
+    async def maximize_window(self):
+        """Maximizes the current window that webdriver is using."""
+        params = None
+        command = Command.W3C_MAXIMIZE_WINDOW
+        if not self.w3c:
+            command = Command.MAXIMIZE_WINDOW
+            params = {'windowHandle': 'current'}
+        await self.execute(command, params)
+
+    @property
+    def switch_to(self):
+        """
+        :Returns:
+            - AsyncSwitchTo: an object containing all options to switch focus into
+
+        :Usage:
+            element = await driver.switch_to.active_element
+            await driver.switch_to.frame('frame_name')
+        """
+        return self._switch_to
+
+    async def back(self):
+        """Goes one step backward in the browser history."""
+        await self.execute(Command.GO_BACK)
+
+    async def forward(self):
+        """Goes one step forward in the browser history."""
+        await self.execute(Command.GO_FORWARD)
+
+    async def refresh(self):
+        """Refreshes the current page."""
+        await self.execute(Command.REFRESH)
+
+    async def get_cookies(self):
+        """Returns a set of dictionaries, corresponding to cookies visible in the current session."""
+        return (await self.execute(Command.GET_ALL_COOKIES))['value']
+
+    async def get_cookie(self, name):
+        """Get a single cookie by name. Returns the cookie if found, None if not."""
+        if self.w3c:
+            try:
+                return (await self.execute(Command.GET_COOKIE, {'name': name}))['value']
+            except NoSuchCookieException:
+                return None
+        for cookie in await self.get_cookies():
+            if cookie['name'] == name:
+                return cookie
+        return None
+
+    async def delete_cookie(self, name):
+        """Deletes a single cookie with the given name."""
+        await self.execute(Command.DELETE_COOKIE, {'name': name})
+
+    async def delete_all_cookies(self):
+        """Delete all cookies in the scope of the session."""
+        await self.execute(Command.DELETE_ALL_COOKIES)
+
+    async def add_cookie(self, cookie_dict):
+        """Adds a cookie to your current session."""
+        await self.execute(Command.ADD_COOKIE, {'cookie': cookie_dict})
+
+    async def implicitly_wait(self, time_to_wait):
+        """Sets a sticky timeout to implicitly wait for an element to be found."""
+        if self.w3c:
+            await self.execute(Command.SET_TIMEOUTS, {
+                'implicit': int(float(time_to_wait) * 1000)})
+        else:
+            await self.execute(Command.IMPLICIT_WAIT, {
+                'ms': float(time_to_wait) * 1000})
+
+    async def set_script_timeout(self, time_to_wait):
+        """Set the amount of time that an execute_async_script call may take."""
+        if self.w3c:
+            await self.execute(Command.SET_TIMEOUTS, {
+                'script': int(float(time_to_wait) * 1000)})
+        else:
+            await self.execute(Command.SET_SCRIPT_TIMEOUT, {
+                'ms': float(time_to_wait) * 1000})
+
+    async def set_page_load_timeout(self, time_to_wait):
+        """Set the amount of time to wait for a page load to complete."""
+        try:
+            await self.execute(Command.SET_TIMEOUTS, {
+                'pageLoad': int(float(time_to_wait) * 1000)})
+        except WebDriverException:
+            await self.execute(Command.SET_TIMEOUTS, {
+                'ms': float(time_to_wait) * 1000,
+                'type': 'page load'})
+
+    async def get_screenshot_as_base64(self):
+        """Gets the screenshot of the current window as a base64 encoded string."""
+        return (await self.execute(Command.SCREENSHOT))['value']
+
+    async def get_screenshot_as_png(self):
+        """Gets the screenshot of the current window as a binary data."""
+        return base64.b64decode((await self.get_screenshot_as_base64()).encode('ascii'))
+
+    async def get_window_rect(self):
+        """Gets the x, y coordinates, height and width of the current window."""
+        return (await self.execute(Command.GET_WINDOW_RECT))['value']
+
+    async def set_window_rect(self, x=None, y=None, width=None, height=None):
+        """Sets the x, y coordinates, height and width of the current window."""
+        if (x is None and y is None) and (height is None and width is None):
+            raise InvalidArgumentException("x and y or height and width need values")
+
+        return (await self.execute(Command.SET_WINDOW_RECT, {"x": x, "y": y,
+                                                             "width": width,
+                                                             "height": height}))['value']
+
+    async def get_log(self, log_type):
+        """Gets the log for a given log type."""
+        return (await self.execute(Command.GET_LOG, {'type': log_type}))['value']
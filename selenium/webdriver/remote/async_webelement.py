@@ -0,0 +1,236 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""The asyncio WebElement implementation. Requires Python 3.5+."""
+
+import base64
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.utils import keys_to_typing
+from .command import Command
+from .webelement import (WebElement, _ATOM_MISSING, _intern_id,
+                         _getAttribute_stub_js, _getAttribute_install_js,
+                         _isDisplayed_stub_js, _isDisplayed_install_js)
+
+
+def _to_w3c_locator(by, value):
+    """Maps locator strategies W3C endpoints don't support to CSS selectors."""
+    if by == By.ID:
+        return By.CSS_SELECTOR, '[id="%s"]' % value
+    elif by == By.TAG_NAME:
+        return By.CSS_SELECTOR, value
+    elif by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, ".%s" % value
+    elif by == By.NAME:
+        return By.CSS_SELECTOR, '[name="%s"]' % value
+    return by, value
+
+
+class AsyncWebElement(object):
+    """Represents a DOM element of a page driven by an AsyncWebDriver.
+
+    Mirrors remote.webelement.WebElement, but every method that talks to the
+    server is a coroutine, and so is every property that does::
+
+        text = await element.text
+        await element.click()
+    """
+
+    __slots__ = WebElement.__slots__
+
+    def __init__(self, parent, id_, w3c=False):
+        self._parent = parent
+        self._id = _intern_id(id_)
+        self._w3c = w3c
+        self._hash = hash(self._id)
+
+    __repr__ = WebElement.__repr__
+    __eq__ = WebElement.__eq__
+    __ne__ = WebElement.__ne__
+    __hash__ = WebElement.__hash__
+    parent = WebElement.parent
+    id = WebElement.id
+
+    @property
+    async def tag_name(self):
+        """This element's ``tagName`` property."""
+        return (await self._execute(Command.GET_ELEMENT_TAG_NAME))['value']
+
+    @property
+    async def text(self):
+        """The text of the element."""
+        return (await self._execute(Command.GET_ELEMENT_TEXT))['value']
+
+    async def click(self):
+        """Clicks the element."""
+        await self._execute(Command.CLICK_ELEMENT)
+
+    async def submit(self):
+        """Submits a form."""
+        if self._w3c:
+            form = await self.find_element(By.XPATH, "./ancestor-or-self::form")
+            await self._parent.execute_script(
+                "var e = arguments[0].ownerDocument.createEvent('Event');"
+                "e.initEvent('submit', true, true);"
+                "if (arguments[0].dispatchEvent(e)) { arguments[0].submit() }", form)
+        else:
+            await self._execute(Command.SUBMIT_ELEMENT)
+
+    async def clear(self):
+        """Clears the text if it's a text entry element."""
+        await self._execute(Command.CLEAR_ELEMENT)
+
+    async def get_property(self, name):
+        """
+        Gets the given property of the element.
+
+        :Args:
+            - name - Name of the property to retrieve.
+        """
+        try:
+            return (await self._execute(Command.GET_ELEMENT_PROPERTY, {"name": name}))["value"]
+        except WebDriverException:
+            return await self._parent.execute_script('return arguments[0][arguments[1]]', self, name)
+
+    async def get_attribute(self, name):
+        """Gets the given attribute or property of the element.
+
+        See WebElement.get_attribute for how the value is resolved.
+
+        :Args:
+            - name - Name of the attribute/property to retrieve.
+        """
+        if self._w3c:
+            return await self._execute_atom(
+                _getAttribute_stub_js, _getAttribute_install_js, name)
+        resp = await self._execute(Command.GET_ELEMENT_ATTRIBUTE, {'name': name})
+        attributeValue = resp.get('value')
+        if attributeValue is not None:
+            if name != 'value' and attributeValue.lower() in ('true', 'false'):
+                attributeValue = attributeValue.lower()
+        return attributeValue
+
+    async def is_selected(self):
+        """Returns whether the element is selected."""
+        return (await self._execute(Command.IS_ELEMENT_SELECTED))['value']
+
+    async def is_enabled(self):
+        """Returns whether the element is enabled."""
+        return (await self._execute(Command.IS_ELEMENT_ENABLED))['value']
+
+    async def is_displayed(self):
+        """Whether the element is visible to a user."""
+        if self._w3c:
+            return await self._execute_atom(_isDisplayed_stub_js, _isDisplayed_install_js)
+        return (await self._execute(Command.IS_ELEMENT_DISPLAYED))['value']
+
+    async def send_keys(self, *value):
+        """Simulates typing into the element.
+
+        Unlike WebElement.send_keys, local file paths are not uploaded to the
+        remote server.
+
+        :Args:
+            - value - A string for typing, or setting form fields.
+        """
+        await self._execute(Command.SEND_KEYS_TO_ELEMENT,
+                            {'text': "".join(keys_to_typing(value)),
+                             'value': keys_to_typing(value)})
+
+    @property
+    async def size(self):
+        """The size of the element."""
+        if self._w3c:
+            size = (await self._execute(Command.GET_ELEMENT_RECT))['value']
+        else:
+            size = (await self._execute(Command.GET_ELEMENT_SIZE))['value']
+        return {"height": size["height"],
+                "width": size["width"]}
+
+    @property
+    async def location(self):
+        """The location of the element in the renderable canvas."""
+        if self._w3c:
+            old_loc = (await self._execute(Command.GET_ELEMENT_RECT))['value']
+        else:
+            old_loc = (await self._execute(Command.GET_ELEMENT_LOCATION))['value']
+        return {"x": round(old_loc['x']),
+                "y": round(old_loc['y'])}
+
+    @property
+    async def rect(self):
+        """A dictionary with the size and location of the element."""
+        if self._w3c:
+            return (await self._execute(Command.GET_ELEMENT_RECT))['value']
+        rect = (await self.size).copy()
+        rect.update(await self.location)
+        return rect
+
+    async def value_of_css_property(self, property_name):
+        """The value of a CSS property."""
+        return (await self._execute(Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, {
+            'propertyName': property_name}))['value']
+
+    @property
+    async def screenshot_as_base64(self):
+        """Gets the screenshot of the current element as a base64 encoded string."""
+        return (await self._execute(Command.ELEMENT_SCREENSHOT))['value']
+
+    @property
+    async def screenshot_as_png(self):
+        """Gets the screenshot of the current element as a binary data."""
+        return base64.b64decode((await self.screenshot_as_base64).encode('ascii'))
+
+    async def find_element(self, by=By.ID, value=None):
+        """
+        Find a child element given a By strategy and locator.
+
+        :Usage:
+            element = await element.find_element(By.ID, 'foo')
+        """
+        if self._w3c:
+            by, value = _to_w3c_locator(by, value)
+        return (await self._execute(Command.FIND_CHILD_ELEMENT,
+                                    {"using": by, "value": value}))['value']
+
+    async def find_elements(self, by=By.ID, value=None):
+        """
+        Find child elements given a By strategy and locator.
+
+        :Usage:
+            elements = await element.find_elements(By.CLASS_NAME, 'foo')
+        """
+        if self._w3c:
+            by, value = _to_w3c_locator(by, value)
+        return (await self._execute(Command.FIND_CHILD_ELEMENTS,
+                                    {"using": by, "value": value}))['value']
+
+    # Private Methods
+    async def _execute_atom(self, stub, install, *args):
+        """Calls an atom installed in the page, installing it first if needed."""
+        result = await self._parent.execute_script(stub, self, *args)
+        if result == _ATOM_MISSING:
+            result = await self._parent.execute_script(install, self, *args)
+        return result
+
+    async def _execute(self, command, params=None):
+        """Executes a command against the underlying HTML element."""
+        if not params:
+            params = {}
+        params['id'] = self._id
+        return await self._parent.execute(command, params)
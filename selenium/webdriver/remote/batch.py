@@ -0,0 +1,141 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Sending many WebDriver commands concurrently."""
+
+from multiprocessing.pool import ThreadPool
+
+from selenium.common.exceptions import WebDriverException
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class BatchResult(object):
+    """The pending result of a command queued in a CommandBatch."""
+
+    def __init__(self):
+        self._done = False
+        self._value = None
+        self._exception = None
+
+    def done(self):
+        """Returns whether the command has been sent and answered."""
+        return self._done
+
+    def result(self):
+        """
+        Returns the value of the command, or raises the exception the command
+        raised, e.g. NoSuchElementException.
+
+        :Raises:
+         - WebDriverException - if the batch has not been run yet.
+        """
+        if not self._done:
+            raise WebDriverException("The batch this result belongs to has not been run")
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+
+class CommandBatch(object):
+    """
+    Collects commands and sends them to the remote server concurrently.
+
+    Each queued command returns a BatchResult right away. The commands are
+    sent on `run`, or when leaving the ``with`` block, over up to
+    `max_workers` connections at once. Responses go through the driver's
+    ErrorHandler one by one, so a failing command only fails its own result.
+
+    Example::
+
+        with driver.batch() as batch:
+            texts = [batch.call(getattr, cell, 'text') for cell in cells]
+            links = [batch.call(cell.get_attribute, 'href') for cell in cells]
+        print([text.result() for text in texts])
+    """
+
+    def __init__(self, driver, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        :Args:
+         - driver - the WebDriver instance to send the commands with.
+         - max_workers - maximum number of commands in flight at once.
+        """
+        self._driver = driver
+        self._max_workers = max_workers
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.run()
+
+    def execute(self, driver_command, params=None):
+        """
+        Queues a command, like WebDriver.execute.
+
+        :Args:
+         - driver_command: The name of the command to execute as a string.
+         - params: A dictionary of named parameters to send with the command.
+
+        :Returns:
+          A BatchResult holding the command's value once the batch has run.
+        """
+        return self.call(lambda: self._driver.execute(driver_command, params)['value'])
+
+    def call(self, method, *args, **kwargs):
+        """
+        Queues a call to any driver or element method, e.g. ``element.get_attribute``.
+
+        :Returns:
+          A BatchResult holding the method's return value once the batch has run.
+        """
+        result = BatchResult()
+        self._pending.append((result, method, args, kwargs))
+        return result
+
+    def run(self):
+        """
+        Sends every queued command and waits for all of them to complete.
+
+        :Returns:
+          The BatchResults of the commands sent, in the order they were queued.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        if len(pending) == 1 or self._max_workers <= 1:
+            for item in pending:
+                _run_one(item)
+        else:
+            pool = ThreadPool(min(self._max_workers, len(pending)))
+            try:
+                pool.map(_run_one, pending)
+            finally:
+                pool.close()
+                pool.join()
+        return [item[0] for item in pending]
+
+
+def _run_one(item):
+    result, method, args, kwargs = item
+    try:
+        result._value = method(*args, **kwargs)
+    except Exception as e:
+        result._exception = e
+    result._done = True
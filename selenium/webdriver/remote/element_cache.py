@@ -0,0 +1,209 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Client side cache of the elements found by locator."""
+
+import threading
+from collections import OrderedDict
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from .command import Command
+
+DEFAULT_MAX_ENTRIES = 1000
+
+# Lists of elements can grow or shrink without any of them going stale, so
+# only single elements are cached.
+_FIND_COMMANDS = frozenset([Command.FIND_ELEMENT, Command.FIND_CHILD_ELEMENT])
+_NAVIGATION_COMMANDS = frozenset([Command.GET, Command.GO_BACK, Command.GO_FORWARD,
+                                  Command.REFRESH])
+
+_DOCUMENT_TOKEN_JS = """
+var key = '__webdriver_cache_token';
+if (!document[key]) {
+  document[key] = String(Math.random()).slice(2) + String(new Date().getTime());
+}
+return document[key];
+"""
+
+
+class ElementCache(object):
+    """
+    Remembers the elements found by locator, so finding the same element
+    again does not need a round trip to the remote server. Enable it with
+    `WebDriver.enable_element_cache`.
+
+    Only `find_element` is answered from the cache. `find_elements` always
+    asks the remote server, since the elements matching a locator change as
+    the page adds or removes them, e.g. while waiting for a list to fill.
+
+    Elements are cached per window and frame. Switching to another window
+    or frame keeps the elements found in the previous one, navigating drops
+    those of the current window, and closing the window or quitting drops
+    them too.
+
+    When a command on an element found with `find_element` fails with a
+    StaleElementReferenceException, the element is found again with the
+    same locator and the command is retried, once. Later commands on the
+    stale WebElement are sent to the element found instead.
+
+    A cached element is returned as long as it exists, even if it no
+    longer matches its locator after the page changed it. Call `validate`
+    to drop the cached elements of a page that was replaced without
+    navigating, e.g. after a click followed a link, or `clear` to drop all.
+    """
+
+    def __init__(self, driver, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        :Args:
+         - driver - the WebDriver instance to cache elements of.
+         - max_entries - number of locators to remember at most.
+        """
+        self._driver = driver
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._locators = {}
+        self._redirects = {}
+        self._tokens = {}
+        self._window = None
+        self._frames = ()
+
+    @property
+    def _context(self):
+        return self._window, self._frames
+
+    def clear(self):
+        """Forgets every cached element."""
+        with self._lock:
+            self._entries.clear()
+            self._locators.clear()
+            self._redirects.clear()
+            self._tokens.clear()
+
+    def validate(self):
+        """
+        Checks with a single script call whether the document of the current
+        frame is still the one its elements were cached in, and forgets them
+        if it isn't.
+        """
+        context = self._context
+        token = self._driver.execute_script(_DOCUMENT_TOKEN_JS)
+        with self._lock:
+            if self._tokens.get(context, token) != token:
+                self._forget(lambda key: key[0] == context)
+            self._tokens[context] = token
+
+    def execute(self, driver_command, params):
+        """
+        Sends a command through the driver, answering it from the cache if
+        it finds elements that were found before.
+        """
+        if params and 'id' in params:
+            redirect = self._redirects.get(params['id'])
+            if redirect is not None:
+                params['id'] = redirect
+
+        if driver_command in _FIND_COMMANDS:
+            return self._find(driver_command, params)
+        if driver_command in (Command.SWITCH_TO_FRAME, Command.SWITCH_TO_PARENT_FRAME,
+                              Command.SWITCH_TO_WINDOW, Command.CLOSE, Command.QUIT) \
+                or driver_command in _NAVIGATION_COMMANDS:
+            response = self._driver._execute(driver_command, params)
+            self._update_context(driver_command, params)
+            return response
+        if params and 'id' in params:
+            try:
+                return self._driver._execute(driver_command, params)
+            except StaleElementReferenceException:
+                new_id = self._find_again(params['id'])
+                if new_id is None:
+                    raise
+                params['id'] = new_id
+        return self._driver._execute(driver_command, params)
+
+    def _find(self, driver_command, params):
+        key = (self._context, driver_command, params.get('using'), params.get('value'),
+               params.get('id'))
+        with self._lock:
+            value = self._entries.get(key)
+        if value is not None:
+            return {'status': 0, 'value': value}
+
+        find_params = dict(params)
+        response = self._driver._execute(driver_command, params)
+        value = response.get('value')
+        if value:
+            with self._lock:
+                self._entries[key] = value
+                self._locators[value.id] = (key, driver_command, find_params)
+                while len(self._entries) > self._max_entries:
+                    self._forget_entry(next(iter(self._entries)))
+        return response
+
+    def _find_again(self, element_id):
+        """Finds a stale element again with its locator, returns the new id or None."""
+        with self._lock:
+            located = self._locators.get(element_id)
+            self._forget(lambda key: located is not None and key == located[0])
+        if located is None or located[0][0] != self._context:
+            return None
+        key, driver_command, find_params = located
+        try:
+            element = self._driver._execute(driver_command, dict(find_params))['value']
+        except NoSuchElementException:
+            return None
+        with self._lock:
+            self._entries[key] = element
+            self._locators[element.id] = located
+            self._redirects[element_id] = element.id
+            for old_id, new_id in self._redirects.items():
+                if new_id == element_id:
+                    self._redirects[old_id] = element.id
+        return element.id
+
+    def _update_context(self, driver_command, params):
+        window = self._window
+        if driver_command == Command.SWITCH_TO_WINDOW:
+            self._window = params.get('handle', params.get('name'))
+            self._frames = ()
+        elif driver_command == Command.SWITCH_TO_FRAME:
+            frame = params.get('id')
+            if frame is None:
+                self._frames = ()
+            else:
+                self._frames = self._frames + (getattr(frame, 'id', frame),)
+        elif driver_command == Command.SWITCH_TO_PARENT_FRAME:
+            self._frames = self._frames[:-1]
+        elif driver_command == Command.QUIT:
+            self.clear()
+        else:
+            # Navigating replaces the documents of the window and its frames,
+            # and closing the window removes them.
+            self._frames = ()
+            with self._lock:
+                self._forget(lambda key: key[0][0] == window)
+
+    def _forget(self, predicate):
+        for key in [key for key in self._entries if predicate(key)]:
+            self._forget_entry(key)
+        for context in [context for context in self._tokens if predicate((context,))]:
+            del self._tokens[context]
+
+    def _forget_entry(self, key):
+        element = self._entries.pop(key)
+        if self._locators.get(element.id, (None,))[0] == key:
+            del self._locators[element.id]
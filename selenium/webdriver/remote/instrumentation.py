@@ -0,0 +1,242 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Measuring the commands sent to the remote server."""
+
+import json
+import threading
+
+from .errorhandler import ErrorCode
+from . import utils
+
+try:
+    str = basestring
+except NameError:
+    pass
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_ERROR_NAMES = dict(value for value in vars(ErrorCode).values()
+                    if isinstance(value, list) and len(value) == 2)
+
+
+def error_name(response):
+    """
+    Returns the name of the error a parsed response from the remote server
+    reports, such as 'no such element', or None if it reports success.
+    """
+    status = response.get('status')
+    value = response.get('value')
+    if isinstance(value, str) and status and status != ErrorCode.SUCCESS:
+        # Error responses of W3C servers are passed on unparsed.
+        try:
+            value = utils.load_json(value)
+            value = value.get('value', value)
+        except (ValueError, AttributeError):
+            pass
+    if isinstance(value, dict) and isinstance(value.get('error'), str):
+        return value['error']
+    if status and status != ErrorCode.SUCCESS:
+        return _ERROR_NAMES.get(status, '%s' % status)
+    return None
+
+
+class CommandEvent(object):
+    """
+    Measurements of a command sent to the remote server, passed to the
+    command listeners of a RemoteConnection once the command completes.
+
+    :Attributes:
+     - command - name of the command, from remote.command.Command.
+     - method - HTTP method of the request.
+     - url - URL of the request, before any redirect.
+     - status - HTTP status of the final response, None if there was none.
+     - error - name of the error the server reported, such as
+       'no such element', or of the exception raised sending the command,
+       or None if the command succeeded.
+     - request_size - bytes of JSON sent, redirects included.
+     - response_size - bytes received, redirects included.
+     - redirects - number of redirects followed.
+     - retries - number of times urllib3 retried a request after a
+       connection error, redirects not included.
+     - response_time - seconds spent connecting and waiting for the server
+       to answer, until the response headers arrived.
+     - transfer_time - seconds spent receiving response bodies.
+     - parse_time - seconds spent parsing the response.
+     - duration - seconds the whole command took.
+
+    urllib3 doesn't report name resolution and connecting separately, so
+    both are part of `response_time`.
+    """
+
+    __slots__ = ('command', 'method', 'url', 'status', 'error', 'request_size',
+                 'response_size', 'redirects', 'retries', 'response_time', 'transfer_time',
+                 'parse_time', 'duration')
+
+    def __init__(self, command):
+        self.command = command
+        self.method = self.url = self.status = self.error = None
+        self.request_size = self.response_size = self.redirects = self.retries = 0
+        self.response_time = self.transfer_time = self.parse_time = self.duration = 0.0
+
+    def __repr__(self):
+        return '<{0.__module__}.{0.__name__} (command="{1}", duration={2:.6f})>'.format(
+            type(self), self.command, self.duration)
+
+    def as_dict(self):
+        """Returns the measurements as a dictionary."""
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class _CommandStats(object):
+
+    __slots__ = ('count', 'sum', 'buckets', 'request_bytes', 'response_bytes',
+                 'redirects', 'retries', 'errors')
+
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * bucket_count
+        self.request_bytes = self.response_bytes = self.redirects = self.retries = 0
+        self.errors = {}
+
+
+class CommandHistogram(object):
+    """
+    A command listener keeping a histogram of command durations per command,
+    along with the bytes sent and received, redirects, retries and errors. Add it to
+    the command executor of every session to measure, and export it as JSON
+    or in the Prometheus text format.
+
+    Example::
+
+        histogram = CommandHistogram()
+        driver.command_executor.add_command_listener(histogram)
+        ...
+        print(histogram.to_prometheus())
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :Args:
+         - buckets - ascending upper bounds of the histogram buckets, in seconds.
+        """
+        self._bounds = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __call__(self, event):
+        self.record(event)
+
+    def record(self, event):
+        """Adds a CommandEvent to the histogram."""
+        with self._lock:
+            stats = self._stats.get(event.command)
+            if stats is None:
+                stats = self._stats[event.command] = _CommandStats(len(self._bounds))
+            stats.count += 1
+            stats.sum += event.duration
+            for i, bound in enumerate(self._bounds):
+                if event.duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.request_bytes += event.request_size
+            stats.response_bytes += event.response_size
+            stats.redirects += event.redirects
+            stats.retries += event.retries
+            if event.error is not None:
+                stats.errors[event.error] = stats.errors.get(event.error, 0) + 1
+
+    def reset(self):
+        """Forgets every command recorded."""
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self):
+        """
+        Returns a dictionary of the statistics of every command recorded,
+        keyed by command name. Bucket counts are cumulative, like in
+        Prometheus, and paired with their upper bound.
+        """
+        with self._lock:
+            snapshot = {}
+            for command, stats in self._stats.items():
+                cumulative, buckets = 0, []
+                for bound, count in zip(self._bounds, stats.buckets):
+                    cumulative += count
+                    buckets.append([bound, cumulative])
+                snapshot[command] = {
+                    'count': stats.count,
+                    'sum': stats.sum,
+                    'buckets': buckets,
+                    'request_bytes': stats.request_bytes,
+                    'response_bytes': stats.response_bytes,
+                    'redirects': stats.redirects,
+                    'retries': stats.retries,
+                    'errors': dict(stats.errors),
+                }
+            return snapshot
+
+    def to_json(self):
+        """Returns the snapshot as a JSON string."""
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_prometheus(self, prefix='selenium_command'):
+        """
+        Returns the statistics in the Prometheus text exposition format.
+
+        :Args:
+         - prefix - prefix of the metric names.
+        """
+        snapshot = sorted(self.snapshot().items())
+        lines = [
+            '# HELP %s_duration_seconds Time taken by WebDriver commands.' % prefix,
+            '# TYPE %s_duration_seconds histogram' % prefix,
+        ]
+        for command, stats in snapshot:
+            labels = 'command="%s"' % _escape_label(command)
+            for bound, count in stats['buckets']:
+                lines.append('%s_duration_seconds_bucket{%s,le="%s"} %d'
+                             % (prefix, labels, _format_bound(bound), count))
+            lines.append('%s_duration_seconds_bucket{%s,le="+Inf"} %d'
+                         % (prefix, labels, stats['count']))
+            lines.append('%s_duration_seconds_sum{%s} %r' % (prefix, labels, stats['sum']))
+            lines.append('%s_duration_seconds_count{%s} %d' % (prefix, labels, stats['count']))
+        for name, text in (('request_bytes', 'Bytes sent'),
+                           ('response_bytes', 'Bytes received'),
+                           ('redirects', 'Redirects followed'),
+                           ('retries', 'Retries made')):
+            lines.append('# HELP %s_%s_total %s by WebDriver commands.' % (prefix, name, text))
+            lines.append('# TYPE %s_%s_total counter' % (prefix, name))
+            for command, stats in snapshot:
+                lines.append('%s_%s_total{command="%s"} %d'
+                             % (prefix, name, _escape_label(command), stats[name]))
+        lines.append('# HELP %s_errors_total Errors reported for WebDriver commands.' % prefix)
+        lines.append('# TYPE %s_errors_total counter' % prefix)
+        for command, stats in snapshot:
+            for error, count in sorted(stats['errors'].items()):
+                lines.append('%s_errors_total{command="%s",error="%s"} %d'
+                             % (prefix, _escape_label(command), _escape_label(error), count))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return repr(float(bound))
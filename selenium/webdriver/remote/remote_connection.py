@@ -17,9 +17,15 @@
 
 import base64
 import logging
+import os
 import platform
+import re
 import socket
 import string
+import struct
+import threading
+import time
+from collections import OrderedDict
 
 import urllib3
 
@@ -28,14 +34,271 @@ try:
 except ImportError:  # above is available in py3+, below is py2.7
     import urlparse as parse
 
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common import utils as common_utils
 from selenium import __version__
 from .command import Command
 from .errorhandler import ErrorCode
+from .instrumentation import CommandEvent, error_name
 from . import utils
 
 LOGGER = logging.getLogger(__name__)
 
+_path_builders = {}
+
+
+def _compile_path(template):
+    """
+    Compiles a command path template such as '/session/$sessionId/element/$id'
+    into a function building the path from the command parameters.
+
+    Compiled builders are cached, so each template is only parsed once.
+    Behaves like `string.Template.substitute`, raising a KeyError for
+    parameters missing from the command.
+    """
+    builder = _path_builders.get(template)
+    if builder is not None:
+        return builder
+
+    fmt = []
+    names = []
+    pos = 0
+    for match in string.Template.pattern.finditer(template):
+        fmt.append(template[pos:match.start()].replace('%', '%%'))
+        pos = match.end()
+        if match.group('escaped') is not None:
+            fmt.append('$')
+        elif match.group('invalid') is not None:
+            raise ValueError('Invalid placeholder in command path: %s' % template)
+        else:
+            fmt.append('%s')
+            names.append(match.group('named') or match.group('braced'))
+    fmt.append(template[pos:].replace('%', '%%'))
+    fmt = ''.join(fmt)
+    names = tuple(names)
+
+    if names:
+        def builder(params):
+            return fmt % tuple([params[name] for name in names])
+    else:
+        path = fmt % ()
+
+        def builder(params):
+            return path
+    _path_builders[template] = builder
+    return builder
+
+
+def _parse_response(statuscode, content_type, data):
+    """
+    Converts the status, content type and body of a response from the
+    remote server into the dictionary expected by the ErrorHandler.
+
+    The body is given as bytes and parsed without first decoding it to a
+    string, unless it turns out not to be JSON.
+    """
+    if 399 < statuscode <= 500:
+        return {'status': statuscode, 'value': data.decode('UTF-8')}
+    content_type = content_type.split(';') if content_type is not None else []
+    if not any([x.startswith('image/png') for x in content_type]):
+
+        try:
+            data = utils.load_json(data)
+        except ValueError:
+            if 199 < statuscode < 300:
+                status = ErrorCode.SUCCESS
+            else:
+                status = ErrorCode.UNKNOWN_ERROR
+            return {'status': status, 'value': data.decode('UTF-8').strip()}
+
+        # Some of the drivers incorrectly return a response
+        # with no 'value' field when they should return null.
+        if 'value' not in data:
+            data['value'] = None
+        return data
+    else:
+        data = {'status': 0, 'value': data.decode('UTF-8')}
+        return data
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+_VALUE_KEY = re.compile(br'"value"\s*:\s*')
+_STRING_SPECIAL = re.compile(br'[\\"]')
+_STRING_ESCAPES = {b'"': b'"', b'\\': b'\\', b'/': b'/', b'b': b'\b',
+                   b'f': b'\f', b'n': b'\n', b'r': b'\r', b't': b'\t'}
+_REPLACEMENT_CHARACTER = u'\ufffd'.encode('utf-8')
+
+
+def _unicode_escape(data, pos):
+    """
+    Decodes the \\uXXXX escape (or surrogate pair of escapes) at `pos` to
+    UTF-8. Returns a tuple of the bytes and the length of the escape, or
+    (None, 0) if more data is needed to decode it.
+    """
+    if len(data) < pos + 6:
+        return None, 0
+    code = int(data[pos + 2:pos + 6], 16)
+    if 0xd800 <= code < 0xdc00:
+        if len(data) < pos + 8:
+            return None, 0
+        if data[pos + 6:pos + 8] == b'\\u':
+            if len(data) < pos + 12:
+                return None, 0
+            low = int(data[pos + 8:pos + 12], 16)
+            if 0xdc00 <= low < 0xe000:
+                code = 0x10000 + ((code - 0xd800) << 10) + (low - 0xdc00)
+                return struct.pack('>I', code).decode('utf-32-be').encode('utf-8'), 12
+        return _REPLACEMENT_CHARACTER, 6
+    if 0xdc00 <= code < 0xe000:
+        return _REPLACEMENT_CHARACTER, 6
+    return struct.pack('>I', code).decode('utf-32-be').encode('utf-8'), 6
+
+
+class _Base64Writer(object):
+    """Decodes base64 written to it in arbitrary pieces into a file object."""
+
+    def __init__(self, output):
+        self._output = output
+        self._pending = b''
+
+    def write(self, data):
+        data = self._pending + data.translate(None, b' \t\r\n')
+        end = len(data) - len(data) % 4
+        if end:
+            self._output.write(base64.b64decode(data[:end]))
+        self._pending = data[end:]
+
+    def flush(self):
+        if self._pending:
+            padding = b'=' * (-len(self._pending) % 4)
+            self._output.write(base64.b64decode(self._pending + padding))
+            self._pending = b''
+
+
+class _ResponseValueWriter(object):
+    """
+    Writes the string "value" of a JSON response to a file object while the
+    response is being received, unescaping it and optionally decoding base64
+    along the way, so the value is never held in memory as a whole.
+
+    Responses whose value is not a string, such as errors, are buffered and
+    parsed as usual.
+    """
+
+    def __init__(self, output, base64_value=False):
+        self._base64 = _Base64Writer(output) if base64_value else None
+        self._output = self._base64 or output
+        self._state = 'key'
+        self._head = b''
+        self._tail = []
+        self._pending = b''
+
+    def feed(self, chunk):
+        if self._state == 'key':
+            self._head += chunk
+            match = _VALUE_KEY.search(self._head)
+            if match is None or match.end() == len(self._head):
+                return
+            start = match.end()
+            if self._head[start:start + 1] != b'"':
+                self._state = 'buffer'
+                return
+            self._state = 'string'
+            self._head, chunk = self._head[:start], self._head[start + 1:]
+        if self._state == 'string':
+            self._feed_string(chunk)
+        elif self._state == 'buffer':
+            self._head += chunk
+        else:
+            self._tail.append(chunk)
+
+    def _feed_string(self, data):
+        data = self._pending + data
+        self._pending = b''
+        out = []
+        pos = 0
+        while True:
+            match = _STRING_SPECIAL.search(data, pos)
+            if match is None:
+                out.append(data[pos:])
+                break
+            i = match.start()
+            out.append(data[pos:i])
+            if data[i:i + 1] == b'"':
+                self._state = 'end'
+                self._tail.append(data[i + 1:])
+                break
+            code = data[i + 1:i + 2]
+            if code == b'u':
+                decoded, length = _unicode_escape(data, i)
+            elif code:
+                decoded, length = _STRING_ESCAPES.get(code, code), 2
+            else:
+                decoded = None
+            if decoded is None:
+                self._pending = data[i:]
+                break
+            out.append(decoded)
+            pos = i + length
+        self._output.write(b''.join(out))
+
+    def close(self, statuscode, content_type):
+        """
+        Returns the parsed response. Its value is None if it was written to
+        the file object.
+        """
+        if self._state in ('key', 'buffer'):
+            return _parse_response(statuscode, content_type, self._head)
+        if self._state == 'string':
+            raise WebDriverException("The response ended before its value did")
+        if self._base64 is not None:
+            self._base64.flush()
+        response = utils.load_json(self._head + b'null' + b''.join(self._tail))
+        response.setdefault('value', None)
+        return response
+
+
+_BASE64_RUN = re.compile(r'[A-Za-z0-9+/\\]{256,}={0,2}')
+
+
+def _elide_base64(match):
+    return '<%d base64 characters>' % len(match.group(0))
+
+
+class _LoggedBody(object):
+    """
+    A request body passed to the debug log, which is only formatted if the
+    message is actually logged. Long runs of base64 data, like uploaded
+    files, screenshots and profiles, are elided and the rest is truncated
+    to `limit` characters.
+    """
+
+    __slots__ = ('_body', '_limit')
+
+    def __init__(self, body, limit):
+        self._body = body
+        self._limit = limit
+
+    def __str__(self):
+        body = self._body
+        if not body:
+            return '%s' % (body,)
+        if hasattr(body, 'read'):
+            return '<body streamed from a file>'
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        text = _BASE64_RUN.sub(_elide_base64, body)
+        if self._limit is not None and len(text) > self._limit:
+            text = '%s... (%d characters)' % (text[:self._limit], len(body))
+        return text
+
+
+def _system_name():
+    system = platform.system().lower()
+    if system == "darwin":
+        system = "mac"
+    return system
+
 
 class RemoteConnection(object):
     """A connection with the Remote WebDriver server.
@@ -44,6 +307,16 @@ class RemoteConnection(object):
     https://github.com/SeleniumHQ/selenium/wiki/JsonWireProtocol"""
 
     _timeout = socket._GLOBAL_DEFAULT_TIMEOUT
+    _system = None
+
+    _pool_maxsize = 10
+    _pool_idle_timeout = 300
+    _max_pools = 50
+    _pools = OrderedDict()
+    _pools_lock = threading.Lock()
+
+    _command_listeners = ()
+    _log_body_limit = 1024
 
     @classmethod
     def get_timeout(cls):
@@ -70,6 +343,75 @@ class RemoteConnection(object):
         """
         cls._timeout = socket._GLOBAL_DEFAULT_TIMEOUT
 
+    @classmethod
+    def set_connection_pool_options(cls, maxsize=None, idle_timeout=None, max_pools=None):
+        """
+        Configure the connection pools shared by all non keep-alive connections.
+
+        Pools that already exist keep their size; new settings apply to pools
+        created afterwards. Call `close_connection_pools` to apply them everywhere.
+        Keep-alive connections created afterwards also use `maxsize`.
+
+        :Args:
+         - maxsize - maximum number of connections kept open per remote server
+         - idle_timeout - seconds after which an unused pool is closed, or None to never close it
+         - max_pools - maximum number of remote servers to keep pools for
+        """
+        with cls._pools_lock:
+            if maxsize is not None:
+                cls._pool_maxsize = maxsize
+            if idle_timeout is not None:
+                cls._pool_idle_timeout = idle_timeout
+            if max_pools is not None:
+                cls._max_pools = max_pools
+
+    @classmethod
+    def set_log_body_limit(cls, limit):
+        """
+        Sets how many characters of each request body are written to the
+        debug log, after base64 data in it has been elided.
+
+        :Args:
+         - limit - number of characters, or None to log whole bodies.
+        """
+        cls._log_body_limit = limit
+
+    @classmethod
+    def close_connection_pools(cls):
+        """
+        Close every shared connection pool and the sockets it holds.
+        """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool, _ in pools:
+            pool.clear()
+
+    @classmethod
+    def _get_shared_pool(cls, key):
+        """
+        Returns the process wide connection pool for the given remote server,
+        creating it if needed and evicting pools that have been idle too long.
+        """
+        now = time.time()
+        evicted = []
+        with cls._pools_lock:
+            if cls._pool_idle_timeout is not None:
+                for k, (pool, last_used) in list(cls._pools.items()):
+                    if now - last_used > cls._pool_idle_timeout:
+                        evicted.append(cls._pools.pop(k)[0])
+            entry = cls._pools.pop(key, None)
+            if entry is None:
+                pool = urllib3.PoolManager(num_pools=1, maxsize=cls._pool_maxsize)
+            else:
+                pool = entry[0]
+            cls._pools[key] = (pool, now)
+            while len(cls._pools) > cls._max_pools:
+                evicted.append(cls._pools.popitem(last=False)[1][0])
+        for stale in evicted:
+            stale.clear()
+        return pool
+
     @classmethod
     def get_remote_connection_headers(cls, parsed_url, keep_alive=False):
         """
@@ -80,14 +422,13 @@ class RemoteConnection(object):
          - keep_alive (Boolean) - Is this a keep-alive connection (default: False)
         """
 
-        system = platform.system().lower()
-        if system == "darwin":
-            system = "mac"
+        if cls._system is None:
+            cls._system = _system_name()
 
         headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json;charset=UTF-8',
-            'User-Agent': 'selenium/{} (python {})'.format(__version__, system)
+            'User-Agent': 'selenium/{} (python {})'.format(__version__, cls._system)
         }
 
         if parsed_url.username:
@@ -137,7 +478,14 @@ class RemoteConnection(object):
 
         self._url = remote_server_addr
         if keep_alive:
-            self._conn = urllib3.PoolManager(timeout=self._timeout)
+            # Room for the connections of a command batch, see WebDriver.batch.
+            kwargs = {'maxsize': self._pool_maxsize}
+            if self._timeout != socket._GLOBAL_DEFAULT_TIMEOUT:
+                kwargs['timeout'] = self._timeout
+            self._conn = urllib3.PoolManager(**kwargs)
+        parsed_addr = parse.urlparse(remote_server_addr)
+        self._pool_key = (parsed_addr.scheme, parsed_addr.netloc)
+        self._headers = None
 
         self._commands = {
             Command.STATUS: ('GET', '/status'),
@@ -364,16 +712,163 @@ class RemoteConnection(object):
          - params - A dictionary of named parameters to send with the command as
            its JSON payload.
         """
+        method, url, data = self._command_request(command, params)
+        if not self._command_listeners:
+            return self._request(method, url, body=data)
+        return self._record(command, lambda event: self._request(method, url, data, event))
+
+    def execute_with_body(self, command, params, body):
+        """
+        Send a command whose JSON payload is read from a file object, such as
+        a file upload, so large payloads are never held in memory at once.
+
+        :Args:
+         - command - A string specifying the command to execute.
+         - params - A dictionary of the parameters the URL mapped to the
+           command needs.
+         - body - A seekable binary file object holding the JSON payload.
+        """
+        method, url, _ = self._command_request(command, params)
+        if not self._command_listeners:
+            return self._request(method, url, body=body)
+        return self._record(command, lambda event: self._request(method, url, body, event))
+
+    def add_command_listener(self, listener):
+        """
+        Adds a callable that is called with an instrumentation.CommandEvent,
+        measuring how long the command took and how much data it moved,
+        after every command sent through this connection. A CommandHistogram
+        can be shared by several connections.
+
+        :Args:
+         - listener - callable taking a CommandEvent.
+        """
+        self._command_listeners = self._command_listeners + (listener,)
+
+    def remove_command_listener(self, listener):
+        """
+        Removes a callable added with `add_command_listener`.
+        """
+        self._command_listeners = tuple(
+            existing for existing in self._command_listeners if existing != listener)
+
+    def _record(self, command, send):
+        """Sends a command with `send`, passing it a CommandEvent to fill, and notifies the listeners."""
+        event = CommandEvent(command)
+        start = common_utils._clock()
+        try:
+            response = send(event)
+            event.error = error_name(response)
+            return response
+        except Exception as e:
+            event.error = type(e).__name__
+            raise
+        finally:
+            event.duration = common_utils._clock() - start
+            for listener in self._command_listeners:
+                try:
+                    listener(event)
+                except Exception:
+                    LOGGER.exception('Command listener %r failed', listener)
+
+    def execute_streaming(self, command, params, output, base64_value=False):
+        """
+        Send a command whose response value is a string, such as a screenshot
+        or the page source, and write the value to a file object as it is
+        received rather than loading the whole response into memory.
+
+        :Args:
+         - command - A string specifying the command to execute.
+         - params - A dictionary of named parameters to send with the command as
+           its JSON payload.
+         - output - A binary file object the value is written to, UTF-8 encoded.
+         - base64_value - Whether to base64 decode the value before writing it.
+
+        :Returns:
+          A dictionary with the server's parsed JSON response. Its 'value' is
+          None if the value was written to `output`, which is the case for
+          every successful response with a string value.
+        """
+        method, url, data = self._command_request(command, params)
+        if not self._command_listeners:
+            return self._stream(method, url, data, output, base64_value)
+        return self._record(
+            command, lambda event: self._stream(method, url, data, output, base64_value, event))
+
+    def _stream(self, method, url, data, output, base64_value, event=None):
+        LOGGER.debug('%s %s %s', method, url, _LoggedBody(data, self._log_body_limit))
+        if method != 'POST' and method != 'PUT':
+            data = None
+
+        kwargs = {}
+        if self.keep_alive:
+            http = self._conn
+        else:
+            http = self._get_shared_pool(self._pool_key)
+            if self._timeout != socket._GLOBAL_DEFAULT_TIMEOUT:
+                kwargs['timeout'] = self._timeout
+        if event is not None:
+            event.method, event.url = method, url
+            event.request_size = len(data) if data else 0
+            start = common_utils._clock()
+        resp = http.request(method, url, body=data, headers=self._request_headers(url),
+                            preload_content=False, **kwargs)
+        try:
+            if event is not None:
+                event.status = resp.status
+                now = common_utils._clock()
+                event.response_time, start = now - start, now
+            content_type = resp.headers.get('Content-Type')
+            if not 199 < resp.status < 300 or 'image/png' in (content_type or ''):
+                body = resp.read()
+                if event is not None:
+                    event.response_size = len(body)
+                return _parse_response(resp.status, content_type, body)
+            writer = _ResponseValueWriter(output, base64_value)
+            for chunk in resp.stream(_STREAM_CHUNK_SIZE):
+                if event is not None:
+                    event.response_size += len(chunk)
+                writer.feed(chunk)
+            # The value is parsed while it is received.
+            response = writer.close(resp.status, content_type)
+            if event is not None:
+                event.transfer_time = common_utils._clock() - start
+            return response
+        finally:
+            LOGGER.debug("Finished Request")
+            resp.release_conn()
+
+    def _command_request(self, command, params):
+        """
+        Resolves a command and its parameters to the HTTP method, URL and UTF-8
+        encoded JSON body to send to the remote server.
+        """
         command_info = self._commands[command]
         assert command_info is not None, 'Unrecognised command %s' % command
-        path = string.Template(command_info[1]).substitute(params)
+        path = _compile_path(command_info[1])(params)
         if hasattr(self, 'w3c') and self.w3c and isinstance(params, dict) and 'sessionId' in params:
             del params['sessionId']
         data = utils.dump_json(params)
+        if not isinstance(data, bytes):
+            # The faster JSON backends don't escape non-ASCII characters, and
+            # http.client would encode a text body as Latin-1.
+            data = data.encode('utf-8')
         url = '%s%s' % (self._url, path)
-        return self._request(command_info[0], url, body=data)
+        return command_info[0], url, data
 
-    def _request(self, method, url, body=None):
+    def _request_headers(self, url):
+        """
+        Returns the headers to send with a request to the given URL.
+        """
+        if url.startswith(self._url):
+            # Headers only depend on the server address, so build them once.
+            if self._headers is None:
+                self._headers = self.get_remote_connection_headers(
+                    parse.urlparse(self._url), self.keep_alive)
+            return self._headers
+        return self.get_remote_connection_headers(parse.urlparse(url), self.keep_alive)
+
+    def _request(self, method, url, body=None, event=None):
         """
         Send an HTTP request to the remote server.
 
@@ -381,25 +876,47 @@ class RemoteConnection(object):
          - method - A string for the HTTP method to send the request with.
          - url - A string for the URL to send the request to.
          - body - A string for request body. Ignored unless method is POST or PUT.
+         - event - A CommandEvent to record the request in, if any.
 
         :Returns:
           A dictionary with the server's parsed JSON response.
         """
-        LOGGER.debug('%s %s %s' % (method, url, body))
+        LOGGER.debug('%s %s %s', method, url, _LoggedBody(body, self._log_body_limit))
 
-        parsed_url = parse.urlparse(url)
-        headers = self.get_remote_connection_headers(parsed_url, self.keep_alive)
+        headers = self._request_headers(url)
         resp = None
         if body and method != 'POST' and method != 'PUT':
             body = None
 
+        if not hasattr(body, 'read'):
+            size = len(body) if body else 0
+        else:
+            # Bodies streamed from a file are sent with their length, rather
+            # than in chunks, which not every remote end supports.
+            body.seek(0, os.SEEK_END)
+            size = body.tell()
+            body.seek(0)
+            headers = dict(headers)
+            headers['Content-Length'] = '%d' % size
+
+        if event is not None:
+            if event.url is None:
+                event.method, event.url = method, url
+            event.request_size += size
+            start = common_utils._clock()
+
         if self.keep_alive:
-            resp = self._conn.request(method, url, body=body, headers=headers)
+            resp = self._conn.request(method, url, body=body, headers=headers,
+                                      preload_content=event is None)
 
             statuscode = resp.status
         else:
-            http = urllib3.PoolManager(timeout=self._timeout)
-            resp = http.request(method, url, body=body, headers=headers)
+            http = self._get_shared_pool(self._pool_key)
+            kwargs = {}
+            if self._timeout != socket._GLOBAL_DEFAULT_TIMEOUT:
+                kwargs['timeout'] = self._timeout
+            resp = http.request(method, url, body=body, headers=headers,
+                                preload_content=event is None, **kwargs)
 
             statuscode = resp.status
             if not hasattr(resp, 'getheader'):
@@ -408,34 +925,33 @@ class RemoteConnection(object):
                 elif hasattr(resp.headers, 'get'):
                     resp.getheader = lambda x: resp.headers.get(x)
 
-        data = resp.data.decode('UTF-8')
+        if event is not None:
+            # The body is only read now, so waiting for the server and
+            # receiving its answer are timed separately.
+            now = common_utils._clock()
+            event.response_time += now - start
+            data = resp.data
+            start, now = now, common_utils._clock()
+            event.transfer_time += now - start
+            event.status = statuscode
+            event.response_size += len(data)
+            retries = getattr(resp, 'retries', None)
+            if retries is not None:
+                event.retries += sum(1 for attempt in retries.history
+                                     if not attempt.redirect_location)
+        else:
+            data = resp.data
         try:
             if 300 <= statuscode < 304:
-                return self._request('GET', resp.getheader('location'))
-            if 399 < statuscode <= 500:
-                return {'status': statuscode, 'value': data}
-            content_type = []
-            if resp.getheader('Content-Type') is not None:
-                content_type = resp.getheader('Content-Type').split(';')
-            if not any([x.startswith('image/png') for x in content_type]):
-
-                try:
-                    data = utils.load_json(data.strip())
-                except ValueError:
-                    if 199 < statuscode < 300:
-                        status = ErrorCode.SUCCESS
-                    else:
-                        status = ErrorCode.UNKNOWN_ERROR
-                    return {'status': status, 'value': data.strip()}
-
-                # Some of the drivers incorrectly return a response
-                # with no 'value' field when they should return null.
-                if 'value' not in data:
-                    data['value'] = None
-                return data
-            else:
-                data = {'status': 0, 'value': data}
-                return data
+                if event is not None:
+                    event.redirects += 1
+                return self._request('GET', resp.getheader('location'), event=event)
+            if event is None:
+                return _parse_response(statuscode, resp.getheader('Content-Type'), data)
+            start = common_utils._clock()
+            response = _parse_response(statuscode, resp.getheader('Content-Type'), data)
+            event.parse_time += common_utils._clock() - start
+            return response
         finally:
             LOGGER.debug("Finished Request")
             resp.close()
@@ -21,20 +21,80 @@ import os
 import tempfile
 import zipfile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _json_dumps(json_struct):
+    return json.dumps(json_struct)
+
+
+def _json_loads(s):
+    if isinstance(s, bytes):
+        s = s.decode('utf-8')
+    return json.loads(s)
+
+
+def _orjson_dumps(json_struct):
+    try:
+        return orjson.dumps(json_struct).decode('utf-8')
+    except TypeError:
+        # e.g. non string keys or integers over 64 bits, which json accepts
+        return json.dumps(json_struct)
+
+
+def _ujson_dumps(json_struct):
+    return ujson.dumps(json_struct, ensure_ascii=False, escape_forward_slashes=False)
+
+
+JSON_BACKENDS = {'json': (_json_dumps, _json_loads)}
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = (_orjson_dumps, orjson.loads)
+if ujson is not None:
+    JSON_BACKENDS['ujson'] = (_ujson_dumps, ujson.loads)
+
+_dumps, _loads = JSON_BACKENDS[
+    'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json']
+
+
+def set_json_backend(name):
+    """
+    Selects the library used to encode commands and decode responses.
+
+    By default the fastest installed library is used: orjson, then ujson,
+    falling back to the standard library json module.
+
+    :Args:
+     - name - One of 'json', 'orjson' or 'ujson'. The library must be installed.
+    """
+    global _dumps, _loads
+    if name not in JSON_BACKENDS:
+        raise ValueError("JSON backend %r is not available, choose from %s"
+                         % (name, ', '.join(sorted(JSON_BACKENDS))))
+    _dumps, _loads = JSON_BACKENDS[name]
+
+
 def format_json(json_struct):
     return json.dumps(json_struct, indent=4)
 
 
 def dump_json(json_struct):
-    return json.dumps(json_struct)
+    return _dumps(json_struct)
 
 
 def load_json(s):
-    return json.loads(s)
+    """Decodes a JSON document given as a string or as UTF-8 encoded bytes."""
+    return _loads(s)
 
 
 def unzip_to_temp_dir(zip_file_name):
@@ -19,15 +19,19 @@
 
 import base64
 import copy
+import os
 import warnings
 from contextlib import contextmanager
 
+from .batch import CommandBatch, DEFAULT_MAX_WORKERS
 from .command import Command
-from .webelement import WebElement
+from .element_cache import ElementCache, DEFAULT_MAX_ENTRIES
+from .webelement import WebElement, getAttribute_js, isDisplayed_js
 from .remote_connection import RemoteConnection
 from .errorhandler import ErrorHandler
 from .switch_to import SwitchTo
 from .mobile import Mobile
+from . import utils
 from .file_detector import FileDetector, LocalFileDetector
 from selenium.common.exceptions import (InvalidArgumentException,
                                         WebDriverException,
@@ -40,6 +44,15 @@ try:
 except NameError:
     pass
 
+_W3C_ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# Types of the values that never hold an element reference.
+_SCALAR_TYPES = set([type(None), bool, int, float, type(u''), type(b'')])
+try:
+    _SCALAR_TYPES.add(long)
+except NameError:  # 3+
+    pass
+
 
 _W3C_CAPABILITY_NAMES = frozenset([
     'acceptInsecureCerts',
@@ -93,6 +106,136 @@ def _make_w3c_caps(caps):
     return {"firstMatch": [{}], "alwaysMatch": always_match}
 
 
+# Dialects remote servers spoke when sessions were created, by server URL.
+_dialects = {}
+
+
+def _new_session_parameters(capabilities, dialect):
+    """
+    Returns the NEW_SESSION parameters for the 'w3c' or 'oss' dialect, or
+    for both if the dialect is None.
+    """
+    parameters = {}
+    if dialect != 'oss':
+        parameters['capabilities'] = _make_w3c_caps(capabilities)
+    if dialect != 'w3c':
+        parameters['desiredCapabilities'] = capabilities
+    return parameters
+
+
+_READ_ELEMENTS_JS = """
+var elements = arguments[0], attributes = arguments[1], properties = arguments[2],
+    text = arguments[3], displayed = arguments[4], rect = arguments[5];
+var getAttribute = %s;
+var isDisplayed = %s;
+var rows = [];
+for (var i = 0; i < elements.length; i++) {
+  var e = elements[i], row = [], j;
+  for (j = 0; j < attributes.length; j++) {
+    row.push(getAttribute(e, attributes[j]));
+  }
+  for (j = 0; j < properties.length; j++) {
+    row.push(e[properties[j]]);
+  }
+  if (text) {
+    row.push(((e.innerText === undefined ? e.textContent : e.innerText) || '').trim());
+  }
+  if (displayed) {
+    row.push(isDisplayed(e));
+  }
+  if (rect) {
+    var r = e.getBoundingClientRect();
+    row.push({x: r.left + window.pageXOffset, y: r.top + window.pageYOffset,
+              width: r.width, height: r.height});
+  }
+  rows.push(row);
+}
+return rows;
+"""
+
+_read_elements_scripts = {}
+
+
+def _read_elements_script(attributes, displayed):
+    """Returns the bulk reader script, embedding only the atoms it needs."""
+    key = (attributes, displayed)
+    if key not in _read_elements_scripts:
+        _read_elements_scripts[key] = _READ_ELEMENTS_JS % (
+            getAttribute_js if attributes else 'null',
+            isDisplayed_js if displayed else 'null')
+    return _read_elements_scripts[key]
+
+
+def _function(method):
+    """Returns the function of a method, which Python 2 wraps in unbound methods."""
+    return getattr(method, '__func__', method)
+
+
+def _element_ids(values):
+    """Returns the ids of a list of element references, or None if it holds anything else."""
+    ids = []
+    for value in values:
+        if not isinstance(value, dict):
+            return None
+        element_id = value.get('ELEMENT') or value.get(_W3C_ELEMENT_KEY)
+        if element_id is None:
+            return None
+        ids.append(element_id)
+    return ids
+
+
+def _convert_values(value, convert, in_place):
+    """
+    Replaces the values nested in dicts and lists, walking them iteratively
+    so deeply nested values don't hit the recursion limit.
+
+    `convert` is called with every value that isn't a plain scalar, and
+    returns what to replace it with, or the value itself to keep it, in
+    which case its items are walked if it is a dict or a list. Dicts and
+    lists nothing was replaced in are returned as they are; the others are
+    updated in place, or copied if `in_place` is False.
+    """
+    scalars = _SCALAR_TYPES
+    if type(value) in scalars:
+        return value
+    converted = convert(value)
+    if converted is not value or not isinstance(value, (dict, list)):
+        return converted
+    # Each frame holds a container, an iterator over its items, the items
+    # replaced so far, if any, and the container's key in its parent.
+    frame = [value, iter(value.items()) if isinstance(value, dict) else enumerate(value),
+             None, None]
+    stack = [frame]
+    while True:
+        for key, item in frame[1]:
+            if type(item) in scalars:
+                continue
+            converted = convert(item)
+            if converted is not item:
+                if frame[2] is None:
+                    frame[2] = {}
+                frame[2][key] = converted
+            elif item and isinstance(item, (dict, list)):
+                frame = [item, iter(item.items()) if isinstance(item, dict) else enumerate(item),
+                         None, key]
+                stack.append(frame)
+                break
+        else:
+            container, _, replaced, key = stack.pop()
+            if replaced is not None:
+                if not in_place:
+                    container = container.copy() if isinstance(container, dict) else list(container)
+                for replaced_key, item in replaced.items():
+                    container[replaced_key] = item
+            if not stack:
+                return container
+            frame = stack[-1]
+            if replaced is not None:
+                if frame[2] is None:
+                    frame[2] = {}
+                frame[2][key] = container
+
+
 class WebDriver(object):
     """
     Controls a browser by sending commands to a remote server.
@@ -109,6 +252,20 @@ class WebDriver(object):
     """
 
     _web_element_cls = WebElement
+    _element_cache = None
+
+    # The dialect new sessions are requested in. None requests them in both
+    # the W3C and the legacy JSON wire protocol dialects, 'w3c' or 'oss'
+    # only in one, saving the capabilities, Firefox profile included, from
+    # being sent twice. 'detect' requests the first session on a remote
+    # server in both, and later ones in the dialect the server answered in.
+    session_dialect = None
+
+    # Compression level of the files send_keys uploads to remote servers:
+    # None for zlib's default, 0 to send files that are already compressed
+    # as they are, up to 9 for the smallest upload. Levels other than 0
+    # need Python 3.7.
+    upload_compress_level = None
 
     def __init__(self, command_executor='http://127.0.0.1:4444/wd/hub',
                  desired_capabilities=None, browser_profile=None, proxy=None,
@@ -154,6 +311,7 @@ class WebDriver(object):
         if browser_profile is not None:
             warnings.warn("Please use FirefoxOptions to set browser profile",
                           DeprecationWarning, stacklevel=2)
+        self._uploaded_files = {}
         self.start_session(capabilities, browser_profile)
         self._switch_to = SwitchTo(self)
         self._mobile = Mobile(self)
@@ -198,6 +356,48 @@ class WebDriver(object):
             if last_detector is not None:
                 self.file_detector = last_detector
 
+    def batch(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Returns a CommandBatch that sends the commands queued on it concurrently,
+        instead of waiting for each round trip in turn.
+
+        :Args:
+         - max_workers - maximum number of commands in flight at once.
+
+        :Usage:
+            with driver.batch() as batch:
+                texts = [batch.call(getattr, cell, 'text') for cell in cells]
+            texts = [text.result() for text in texts]
+        """
+        return CommandBatch(self, max_workers)
+
+    @property
+    def element_cache(self):
+        """The ElementCache in use, or None if elements aren't cached."""
+        return self._element_cache
+
+    def enable_element_cache(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Starts remembering the elements found by locator with find_element,
+        so finding them again is answered without a round trip to the remote
+        server. See ElementCache for when cached elements are dropped.
+
+        :Args:
+         - max_entries - number of locators to remember at most.
+
+        :Returns:
+          The ElementCache.
+        """
+        if self._element_cache is None:
+            self._element_cache = ElementCache(self, max_entries)
+        return self._element_cache
+
+    def disable_element_cache(self):
+        """
+        Stops caching elements and forgets those cached.
+        """
+        self._element_cache = None
+
     @property
     def mobile(self):
         return self._mobile
@@ -246,10 +446,17 @@ class WebDriver(object):
                 capabilities["moz:firefoxOptions"]["profile"] = browser_profile.encoded
             else:
                 capabilities.update({'firefox_profile': browser_profile.encoded})
-        w3c_caps = _make_w3c_caps(capabilities)
-        parameters = {"capabilities": w3c_caps,
-                      "desiredCapabilities": capabilities}
-        response = self.execute(Command.NEW_SESSION, parameters)
+        dialect = self._session_dialect()
+        try:
+            response = self.execute(Command.NEW_SESSION,
+                                    _new_session_parameters(capabilities, dialect))
+        except WebDriverException:
+            if self.session_dialect != 'detect' or dialect is None:
+                raise
+            # The remote server may have been replaced by one speaking the
+            # other dialect.
+            response = self.execute(Command.NEW_SESSION,
+                                    _new_session_parameters(capabilities, None))
         if 'sessionId' not in response:
             response = response['value']
         self.session_id = response['sessionId']
@@ -263,40 +470,51 @@ class WebDriver(object):
         # Double check to see if we have a W3C Compliant browser
         self.w3c = response.get('status') is None
         self.command_executor.w3c = self.w3c
+        if self.session_dialect == 'detect':
+            _dialects[self._dialect_key()] = 'w3c' if self.w3c else 'oss'
+
+    def _session_dialect(self):
+        if self.session_dialect == 'detect':
+            return _dialects.get(self._dialect_key())
+        return self.session_dialect
+
+    def _dialect_key(self):
+        return getattr(self.command_executor, '_url', None)
 
     def _wrap_value(self, value):
-        if isinstance(value, dict):
-            converted = {}
-            for key, val in value.items():
-                converted[key] = self._wrap_value(val)
-            return converted
-        elif isinstance(value, self._web_element_cls):
-            return {'ELEMENT': value.id, 'element-6066-11e4-a52e-4f735466cecf': value.id}
-        elif isinstance(value, list):
-            return list(self._wrap_value(item) for item in value)
-        else:
-            return value
+        return _convert_values(value, self._wrap_element, in_place=False)
+
+    def _wrap_element(self, value):
+        if isinstance(value, self._web_element_cls):
+            return {'ELEMENT': value.id, _W3C_ELEMENT_KEY: value.id}
+        return value
 
     def create_web_element(self, element_id):
         """Creates a web element with the specified `element_id`."""
         return self._web_element_cls(self, element_id, w3c=self.w3c)
 
+    def _create_web_elements(self, element_ids):
+        if _function(type(self).create_web_element) is not _function(WebDriver.create_web_element):
+            # Subclasses overriding the public hook get it called for every element.
+            return [self.create_web_element(element_id) for element_id in element_ids]
+        cls, w3c = self._web_element_cls, self.w3c
+        return [cls(self, element_id, w3c) for element_id in element_ids]
+
     def _unwrap_value(self, value):
+        # Responses are freshly parsed, so they are updated in place.
+        return _convert_values(value, self._unwrap_element, in_place=True)
+
+    def _unwrap_element(self, value):
         if isinstance(value, dict):
-            if 'ELEMENT' in value or 'element-6066-11e4-a52e-4f735466cecf' in value:
-                wrapped_id = value.get('ELEMENT', None)
-                if wrapped_id:
-                    return self.create_web_element(value['ELEMENT'])
-                else:
-                    return self.create_web_element(value['element-6066-11e4-a52e-4f735466cecf'])
-            else:
-                for key, val in value.items():
-                    value[key] = self._unwrap_value(val)
-                return value
-        elif isinstance(value, list):
-            return list(self._unwrap_value(item) for item in value)
-        else:
-            return value
+            element_id = value.get('ELEMENT') or value.get(_W3C_ELEMENT_KEY)
+            if element_id is not None:
+                return self.create_web_element(element_id)
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            # Results of find_elements are created in one go.
+            element_ids = _element_ids(value)
+            if element_ids is not None:
+                return self._create_web_elements(element_ids)
+        return value
 
     def execute(self, driver_command, params=None):
         """
@@ -309,14 +527,29 @@ class WebDriver(object):
         :Returns:
           The command's JSON response loaded into a dictionary object.
         """
-        if self.session_id is not None:
-            if not params:
-                params = {'sessionId': self.session_id}
-            elif 'sessionId' not in params:
-                params['sessionId'] = self.session_id
+        if self._element_cache is not None:
+            return self._element_cache.execute(driver_command, params)
+        return self._execute(driver_command, params)
 
-        params = self._wrap_value(params)
-        response = self.command_executor.execute(driver_command, params)
+    def _execute(self, driver_command, params=None):
+        params = self._command_params(params)
+        return self._response(self.command_executor.execute(driver_command, params))
+
+    def _execute_with_body(self, driver_command, body, params=None):
+        """
+        Executes a command whose JSON payload is read from `body`, a binary
+        file object, without loading it into memory if the command executor
+        supports it.
+        """
+        params = self._command_params(params)
+        execute_with_body = getattr(self.command_executor, 'execute_with_body', None)
+        if execute_with_body is None:
+            params = dict(params or {})
+            params.update(utils.load_json(body.read()))
+            return self._response(self.command_executor.execute(driver_command, params))
+        return self._response(execute_with_body(driver_command, params, body))
+
+    def _response(self, response):
         if response:
             self.error_handler.check_response(response)
             response['value'] = self._unwrap_value(
@@ -326,6 +559,58 @@ class WebDriver(object):
         # a success
         return {'success': 0, 'value': None, 'sessionId': self.session_id}
 
+    def _command_params(self, params):
+        if self.session_id is not None:
+            if not params:
+                params = {'sessionId': self.session_id}
+            elif 'sessionId' not in params:
+                params['sessionId'] = self.session_id
+        return self._wrap_value(params)
+
+    def _execute_to_file(self, driver_command, params, filename, base64_value=False):
+        """
+        Executes a command whose value is a string, such as a screenshot, and
+        saves the value to a file. The value is written out while it is being
+        received when the command executor supports it, so large values are
+        never held in memory as a whole. Returns False if there is any
+        IOError, else returns True.
+
+        :Args:
+         - driver_command: The name of the command to execute as a string.
+         - params: A dictionary of named parameters to send with the command.
+         - filename: The path of the file to save the value to.
+         - base64_value: Whether the value is base64 encoded binary data.
+        """
+        try:
+            f = open(filename, 'wb')
+        except IOError:
+            return False
+        try:
+            with f:
+                self._execute_streaming(driver_command, params, f, base64_value)
+        except IOError:
+            os.remove(filename)
+            return False
+        except BaseException:
+            os.remove(filename)
+            raise
+        return True
+
+    def _execute_streaming(self, driver_command, params, output, base64_value):
+        streaming = getattr(self.command_executor, 'execute_streaming', None)
+        if streaming is None:
+            value = self.execute(driver_command, params)['value']
+        else:
+            response = streaming(driver_command, self._command_params(params),
+                                 output, base64_value)
+            self.error_handler.check_response(response)
+            value = response['value']
+        if value is not None:
+            if base64_value:
+                output.write(base64.b64decode(value.encode('ascii')))
+            else:
+                output.write(value.encode('utf-8'))
+
     def get(self, url):
         """
         Loads a web page in the current browser session.
@@ -658,6 +943,53 @@ class WebDriver(object):
             'script': script,
             'args': converted_args})['value']
 
+    def read_elements(self, elements, attributes=(), properties=(), text=False,
+                      displayed=False, rect=False):
+        """
+        Reads attributes, properties, text, visibility and position of many
+        elements with a single script, instead of one command per value.
+
+        :Args:
+         - elements: The WebElements to read.
+         - attributes: Names of attributes to read, with the semantics of WebElement.get_attribute.
+         - properties: Names of DOM properties to read, like WebElement.get_property.
+         - text: Whether to read the text. This is the element's ``innerText``,
+           which closely approximates WebElement.text.
+         - displayed: Whether to read visibility, like WebElement.is_displayed.
+         - rect: Whether to read the size and location, like WebElement.rect.
+
+        :Returns:
+          A list with a dictionary per element, in the order given. Each has an
+          'attributes' and 'properties' dictionary keyed by name, and 'text',
+          'displayed' and 'rect' entries for the values requested.
+
+        :Usage:
+            rows = driver.read_elements(links, attributes=['href'], text=True)
+            hrefs = [row['attributes']['href'] for row in rows]
+        """
+        attributes = list(attributes)
+        properties = list(properties)
+        elements = list(elements)
+        if not elements:
+            return []
+        rows = self.execute_script(
+            _read_elements_script(bool(attributes), bool(displayed)),
+            elements, attributes, properties, bool(text), bool(displayed), bool(rect))
+
+        table = []
+        for row in rows:
+            entry = {'attributes': dict(zip(attributes, row[:len(attributes)])),
+                     'properties': dict(zip(properties, row[len(attributes):len(attributes) + len(properties)]))}
+            rest = iter(row[len(attributes) + len(properties):])
+            if text:
+                entry['text'] = next(rest)
+            if displayed:
+                entry['displayed'] = next(rest)
+            if rect:
+                entry['rect'] = next(rest)
+            table.append(entry)
+        return table
+
     @property
     def current_url(self):
         """
@@ -678,6 +1010,20 @@ class WebDriver(object):
         """
         return self.execute(Command.GET_PAGE_SOURCE)['value']
 
+    def save_page_source(self, filename):
+        """
+        Saves the source of the current page to a file, UTF-8 encoded. Returns
+           False if there is any IOError, else returns True. Unlike
+           `page_source`, the source is written out as it is received.
+
+        :Args:
+         - filename: The full path you wish to save the source to.
+
+        :Usage:
+            driver.save_page_source('/Sources/foo.html')
+        """
+        return self._execute_to_file(Command.GET_PAGE_SOURCE, None, filename)
+
     def close(self):
         """
         Closes the current window.
@@ -1029,15 +1375,7 @@ class WebDriver(object):
         if not filename.lower().endswith('.png'):
             warnings.warn("name used for saved screenshot does not match file "
                           "type. It should end with a `.png` extension", UserWarning)
-        png = self.get_screenshot_as_png()
-        try:
-            with open(filename, 'wb') as f:
-                f.write(png)
-        except IOError:
-            return False
-        finally:
-            del png
-        return True
+        return self._execute_to_file(Command.SCREENSHOT, None, filename, base64_value=True)
 
     def save_screenshot(self, filename):
         """
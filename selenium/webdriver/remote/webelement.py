@@ -19,6 +19,8 @@ import base64
 import hashlib
 import os
 import pkgutil
+import sys
+import tempfile
 import warnings
 import zipfile
 
@@ -34,15 +36,100 @@ except NameError:
     pass
 
 try:
-    from StringIO import StringIO as IOStream
-except ImportError:  # 3+
-    from io import BytesIO as IOStream
+    from sys import intern
+except ImportError:  # 2.x
+    pass
 
 # not relying on __package__ here as it can be `None` in some situations (see #4558)
 _pkg = '.'.join(__name__.split('.')[:-1])
 getAttribute_js = pkgutil.get_data(_pkg, 'getAttribute.js').decode('utf8')
 isDisplayed_js = pkgutil.get_data(_pkg, 'isDisplayed.js').decode('utf8')
 
+# Atoms are installed in the page under this window property on first use, so
+# later calls only send a short stub instead of the whole atom.
+_ATOM_STORE = '__webdriver_atoms'
+_ATOM_MISSING = {'webdriver-atom-missing': True}
+
+_ATOM_STUB_JS = (
+    "var atoms = window['%(store)s'];"
+    "if (!atoms || !atoms['%(name)s']) { return {'webdriver-atom-missing': true}; }"
+    "return atoms['%(name)s'].apply(null, arguments);")
+
+_ATOM_INSTALL_JS = (
+    "var atom = (%(source)s);"
+    "try {"
+    "  if (!window['%(store)s']) {"
+    "    Object.defineProperty(window, '%(store)s', {value: {}, configurable: true});"
+    "  }"
+    "  window['%(store)s']['%(name)s'] = atom;"
+    "} catch (e) {}"
+    "return atom.apply(null, arguments);")
+
+
+def _atom_scripts(name, source):
+    """Returns the stub calling an installed atom, and the script installing it."""
+    values = {'store': _ATOM_STORE, 'name': name, 'source': source}
+    return _ATOM_STUB_JS % values, _ATOM_INSTALL_JS % values
+
+
+_getAttribute_stub_js, _getAttribute_install_js = _atom_scripts('getAttribute', getAttribute_js)
+_isDisplayed_stub_js, _isDisplayed_install_js = _atom_scripts('isDisplayed', isDisplayed_js)
+
+
+# Uploads are zipped and encoded in temporary files that stay in memory up to
+# this size, and are written to disk beyond it.
+_UPLOAD_SPOOL_SIZE = 4 * 1024 * 1024
+_UPLOAD_CHUNK_SIZE = 3 * 256 * 1024  # a multiple of 3, so chunks encode separately
+
+# SHA-1 digests of uploaded files, keyed by path, size and modification time.
+_file_digests = {}
+
+
+def _file_digest(filename):
+    """Returns the SHA-1 digest of a file, reading it only if it changed."""
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_size, stat.st_mtime)
+    digest = _file_digests.get(key)
+    if digest is None:
+        sha1 = hashlib.sha1()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(_UPLOAD_CHUNK_SIZE), b''):
+                sha1.update(chunk)
+        digest = _file_digests[key] = sha1.hexdigest()
+    return digest
+
+
+def _upload_body(filename, compress_level=None):
+    """
+    Returns a temporary file holding the JSON payload of the command
+    uploading `filename`, zipped and base64 encoded a chunk at a time.
+    """
+    if compress_level == 0:
+        compression, kwargs = zipfile.ZIP_STORED, {}
+    else:
+        compression, kwargs = zipfile.ZIP_DEFLATED, {}
+        if compress_level is not None and sys.version_info >= (3, 7):
+            kwargs['compresslevel'] = compress_level
+    with tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_SIZE) as zipped:
+        with zipfile.ZipFile(zipped, 'w', compression, **kwargs) as archive:
+            archive.write(filename, os.path.basename(filename))
+        zipped.seek(0)
+        body = tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_SIZE)
+        body.write(b'{"file": "')
+        for chunk in iter(lambda: zipped.read(_UPLOAD_CHUNK_SIZE), b''):
+            body.write(base64.b64encode(chunk))
+        body.write(b'"}')
+    body.seek(0)
+    return body
+
+
+def _intern_id(id_):
+    """Interns an element id, so references to the same element share it."""
+    try:
+        return intern(id_)
+    except TypeError:  # unicode on 2.x, or not a string at all
+        return id_
+
 
 class WebElement(object):
     """Represents a DOM element.
@@ -56,10 +143,15 @@ class WebElement(object):
     ``StaleElementReferenceException`` is thrown, and all future calls to this
     instance will fail."""
 
+    # Scripts can hold on to tens of thousands of elements, in sets and dicts
+    # too, so elements carry no __dict__ and compute their hash once.
+    __slots__ = ('_parent', '_id', '_w3c', '_hash', '__weakref__')
+
     def __init__(self, parent, id_, w3c=False):
         self._parent = parent
-        self._id = id_
+        self._id = _intern_id(id_)
         self._w3c = w3c
+        self._hash = hash(self._id)
 
     def __repr__(self):
         return '<{0.__module__}.{0.__name__} (session="{1}", element="{2}")>'.format(
@@ -136,9 +228,8 @@ class WebElement(object):
 
         attributeValue = ''
         if self._w3c:
-            attributeValue = self.parent.execute_script(
-                "return (%s).apply(null, arguments);" % getAttribute_js,
-                self, name)
+            attributeValue = self._execute_atom(
+                _getAttribute_stub_js, _getAttribute_install_js, name)
         else:
             resp = self._execute(Command.GET_ELEMENT_ATTRIBUTE, {'name': name})
             attributeValue = resp.get('value')
@@ -483,9 +574,7 @@ class WebElement(object):
         """Whether the element is visible to a user."""
         # Only go into this conditional for browsers that don't use the atom themselves
         if self._w3c:
-            return self.parent.execute_script(
-                "return (%s).apply(null, arguments);" % isDisplayed_js,
-                self)
+            return self._execute_atom(_isDisplayed_stub_js, _isDisplayed_install_js)
         else:
             return self._execute(Command.IS_ELEMENT_DISPLAYED)['value']
 
@@ -582,15 +671,8 @@ class WebElement(object):
         if not filename.lower().endswith('.png'):
             warnings.warn("name used for saved screenshot does not match file "
                           "type. It should end with a `.png` extension", UserWarning)
-        png = self.screenshot_as_png
-        try:
-            with open(filename, 'wb') as f:
-                f.write(png)
-        except IOError:
-            return False
-        finally:
-            del png
-        return True
+        return self._parent._execute_to_file(Command.ELEMENT_SCREENSHOT, {'id': self._id},
+                                             filename, base64_value=True)
 
     @property
     def parent(self):
@@ -632,6 +714,14 @@ class WebElement(object):
         params['id'] = self._id
         return self._parent.execute(command, params)
 
+    def _execute_atom(self, stub, install, *args):
+        """Calls an atom installed in the page, installing it first if the
+        current document doesn't have it yet."""
+        result = self._parent.execute_script(stub, self, *args)
+        if result == _ATOM_MISSING:
+            result = self._parent.execute_script(install, self, *args)
+        return result
+
     def find_element(self, by=By.ID, value=None):
         """
         Find an element given a By strategy and locator. Prefer the find_element_by_* methods when
@@ -685,18 +775,24 @@ class WebElement(object):
                              {"using": by, "value": value})['value']
 
     def __hash__(self):
-        return int(hashlib.md5(self._id.encode('utf-8')).hexdigest(), 16)
+        return self._hash
 
     def _upload(self, filename):
-        fp = IOStream()
-        zipped = zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED)
-        zipped.write(filename, os.path.split(filename)[1])
-        zipped.close()
-        content = base64.encodestring(fp.getvalue())
-        if not isinstance(content, str):
-            content = content.decode('utf-8')
+        """
+        Uploads a local file to the remote server, once per session unless
+        it changes, and returns its path on the server.
+        """
+        uploaded = getattr(self._parent, '_uploaded_files', None)
+        key = None
+        if uploaded is not None:
+            key = (self._parent.session_id, os.path.basename(filename), _file_digest(filename))
+            path = uploaded.get(key)
+            if path is not None:
+                return path
+        body = _upload_body(filename, getattr(self._parent, 'upload_compress_level', None))
         try:
-            return self._execute(Command.UPLOAD_FILE, {'file': content})['value']
+            with body:
+                path = self._parent._execute_with_body(Command.UPLOAD_FILE, body)['value']
         except WebDriverException as e:
             if "Unrecognized command: POST" in e.__str__():
                 return filename
@@ -706,3 +802,6 @@ class WebElement(object):
                 return filename
             else:
                 raise e
+        if key is not None:
+            uploaded[key] = path
+        return path
@@ -0,0 +1,84 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Waiting for conditions from an asyncio event loop. Requires Python 3.5+."""
+
+import asyncio
+import inspect
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.utils import _clock
+from .wait import WebDriverWait
+
+
+class AsyncWebDriverWait(WebDriverWait):
+    """WebDriverWait for an AsyncWebDriver.
+
+    The condition may be a plain callable or a coroutine function. Polling
+    sleeps with ``asyncio.sleep`` so other sessions keep running meanwhile.
+
+    Example::
+
+        async def has_results(driver):
+            return await driver.find_elements(By.CLASS_NAME, 'result')
+
+        results = await AsyncWebDriverWait(driver, 10).until(has_results)
+    """
+
+    async def until(self, method, message=''):
+        """Calls the method provided with the driver as an argument until the
+        return value is not False."""
+        screen = None
+        stacktrace = None
+
+        end_time = _clock() + self._timeout
+        delays = self._polling.delays()
+        while True:
+            try:
+                value = method(self._driver)
+                if inspect.isawaitable(value):
+                    value = await value
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, 'screen', None)
+                stacktrace = getattr(exc, 'stacktrace', None)
+            delay = self._next_delay(delays, end_time)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        raise TimeoutException(message, screen, stacktrace)
+
+    async def until_not(self, method, message=''):
+        """Calls the method provided with the driver as an argument until the
+        return value is False."""
+        end_time = _clock() + self._timeout
+        delays = self._polling.delays()
+        while True:
+            try:
+                value = method(self._driver)
+                if inspect.isawaitable(value):
+                    value = await value
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+            delay = self._next_delay(delays, end_time)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        raise TimeoutException(message)
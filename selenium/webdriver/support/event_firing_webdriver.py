@@ -66,7 +66,7 @@ class EventFiringWebDriver(object):
         if not isinstance(event_listener, AbstractEventListener):
             raise WebDriverException("Event listener must be a subclass of AbstractEventListener")
         self._driver = driver
-        self._driver._wrap_value = self._wrap_value
+        self._driver._wrap_element = self._wrap_element
         self._listener = event_listener
 
     @property
@@ -171,10 +171,10 @@ class EventFiringWebDriver(object):
         else:
             return args
 
-    def _wrap_value(self, value):
+    def _wrap_element(self, value):
         if isinstance(value, EventFiringWebElement):
-            return WebDriver._wrap_value(self._driver, value.wrapped_element)
-        return WebDriver._wrap_value(self._driver, value)
+            value = value.wrapped_element
+        return WebDriver._wrap_element(self._driver, value)
 
     def __setattr__(self, item, value):
         if item.startswith("_") or not hasattr(self._driver, item):
@@ -404,6 +404,87 @@ class alert_is_present(object):
             return False
 
 
+class any_of(object):
+    """ An expectation that any of multiple expected conditions is true.
+    Equivalent to a logical 'OR'.
+    Conditions that can be evaluated in the page are checked with a single
+    script call, the others one by one.
+    returns the value of the first condition found to be true, False otherwise
+    """
+    def __init__(self, *expected_conditions):
+        self.expected_conditions = expected_conditions
+
+    def __call__(self, driver):
+        values = _evaluate_in_page(driver, self.expected_conditions)
+        for value in values:
+            if value:
+                return value
+        for condition, value in zip(self.expected_conditions, values):
+            if value is None:
+                value = _call_condition(driver, condition)
+                if value:
+                    return value
+        return False
+
+
+class all_of(object):
+    """ An expectation that all of multiple expected conditions are true.
+    Equivalent to a logical 'AND'.
+    Conditions that can be evaluated in the page are checked with a single
+    script call, the others one by one.
+    returns a list with the value of each condition when all of them are
+    true, False otherwise
+    """
+    def __init__(self, *expected_conditions):
+        self.expected_conditions = expected_conditions
+
+    def __call__(self, driver):
+        values = _evaluate_in_page(driver, self.expected_conditions)
+        if any(value is False for value in values):
+            return False
+        results = []
+        for condition, value in zip(self.expected_conditions, values):
+            if value is None:
+                value = _call_condition(driver, condition)
+                if not value:
+                    return False
+            results.append(value)
+        return results
+
+
+class none_of(object):
+    """ An expectation that none of multiple expected conditions is true.
+    Equivalent to a logical 'NOT-OR'.
+    Conditions that can be evaluated in the page are checked with a single
+    script call, the others one by one.
+    returns True when none of the conditions is true, False otherwise
+    """
+    def __init__(self, *expected_conditions):
+        self.expected_conditions = expected_conditions
+
+    def __call__(self, driver):
+        values = _evaluate_in_page(driver, self.expected_conditions)
+        if any(values):
+            return False
+        for condition, value in zip(self.expected_conditions, values):
+            if value is None and _call_condition(driver, condition):
+                return False
+        return True
+
+
+def _evaluate_in_page(driver, conditions):
+    from .page_conditions import evaluate_in_page
+    return evaluate_in_page(driver, conditions)
+
+
+def _call_condition(driver, condition):
+    """Calls a condition, treating a ``WebDriverException`` as not met."""
+    try:
+        return condition(driver)
+    except WebDriverException:
+        return False
+
+
 def _find_element(driver, by):
     """Looks up an element. Logs and re-raises ``WebDriverException``
     if thrown."""
@@ -0,0 +1,113 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Waiting for conditions by observing the page instead of polling it."""
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.utils import _clock
+from selenium.webdriver.remote.webelement import _ATOM_MISSING
+from .page_conditions import observe_script, page_condition
+from .wait import POLL_FREQUENCY, WebDriverWait
+
+MAX_SCRIPT_TIME = 10  # Longest time a single observing script waits for, in seconds
+RECHECK_INTERVAL = 0.1  # How often the page re-checks a condition without DOM mutations
+
+
+class ObservingWebDriverWait(WebDriverWait):
+    """WebDriverWait that waits for supported expected conditions inside the page.
+
+    Conditions that look elements up by locator, and the title conditions,
+    are checked by an asynchronous script that re-evaluates them whenever a
+    MutationObserver reports a change to the DOM, and answers as soon as the
+    condition is met. There is no polling delay, and a single command covers
+    up to `max_script_time` seconds of waiting.
+
+    Other conditions, and `until_not`, are polled like in WebDriverWait. So
+    is the rest of a wait once the session's script timeout, see
+    `WebDriver.set_script_timeout`, turns out to be shorter than
+    `max_script_time`.
+
+    Example::
+
+        from selenium.webdriver.support import expected_conditions as EC
+
+        wait = ObservingWebDriverWait(driver, 10)
+        element = wait.until(EC.visibility_of_element_located((By.ID, 'result')))
+    """
+
+    def __init__(self, driver, timeout, poll_frequency=POLL_FREQUENCY, ignored_exceptions=None,
+                 max_script_time=MAX_SCRIPT_TIME):
+        """
+        :Args:
+         - max_script_time - longest time in seconds a single script waits in
+           the page before returning to check the deadline.
+
+        See WebDriverWait for the other arguments.
+        """
+        WebDriverWait.__init__(self, driver, timeout, poll_frequency, ignored_exceptions)
+        self._max_script_time = max_script_time
+
+    def until(self, method, message=''):
+        """Waits until the condition provided is met and returns its value,
+        observing the page if the condition can be evaluated there."""
+        spec = page_condition(method)
+        if spec is None:
+            return WebDriverWait.until(self, method, message)
+
+        end_time = _clock() + self._timeout
+        delays = self._polling.delays()
+        while True:
+            try:
+                result = self._observe(observe_script(spec), spec, end_time)
+                if result == _ATOM_MISSING:
+                    result = self._observe(observe_script(spec, install=True), spec, end_time)
+            except TimeoutException:
+                # The session's script timeout is too short to observe the page.
+                return self._poll_until(method, message, end_time)
+            except WebDriverException:
+                # Most likely the page navigated away while it was observed.
+                # Check once from here, which raises if the session is gone.
+                result = None
+                try:
+                    value = method(self._driver)
+                    if value:
+                        return value
+                except self._ignored_exceptions:
+                    pass
+                # Wait before observing again, in case the script keeps failing.
+                if not self._sleep(delays, end_time):
+                    raise TimeoutException(message)
+            if result is not None:
+                if len(result) > 2:
+                    # The page could not evaluate the condition, e.g. because
+                    # of an invalid selector. Polling reports it properly.
+                    return self._poll_until(method, message, end_time)
+                if result[0]:
+                    return result[1]
+            if _clock() >= end_time:
+                raise TimeoutException(message)
+
+    def _observe(self, script, spec, end_time):
+        remaining = max(end_time - _clock(), 0)
+        return self._driver.execute_async_script(
+            script, spec, int(min(remaining, self._max_script_time) * 1000),
+            int(RECHECK_INTERVAL * 1000))
+
+    def _poll_until(self, method, message, end_time):
+        wait = WebDriverWait(self._driver, max(end_time - _clock(), 0),
+                             self._poll, self._ignored_exceptions)
+        return wait.until(method, message)
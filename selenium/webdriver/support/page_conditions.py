@@ -0,0 +1,337 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Evaluating expected conditions inside the page.
+
+Supported conditions from expected_conditions are translated to a spec, a
+small dictionary a script evaluates in the page, so checking a condition
+takes one script call, or none at all while a page observer waits for it."""
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webelement import _ATOM_MISSING, _ATOM_STORE, isDisplayed_js
+from . import expected_conditions as EC
+
+_EVALUATE_JS = """
+var isDisplayed = %s;
+function quoteAttribute(value) {
+  return '"' + String(value).replace(/(["\\\\])/g, '\\\\$1') + '"';
+}
+function textOf(e) {
+  return ((e.innerText === undefined ? e.textContent : e.innerText) || '').trim();
+}
+function locate(by, value, many) {
+  var d = document, found;
+  switch (by) {
+    case 'id': found = d.querySelectorAll('[id=' + quoteAttribute(value) + ']'); break;
+    case 'name': found = d.querySelectorAll('[name=' + quoteAttribute(value) + ']'); break;
+    case 'class name': found = d.getElementsByClassName(value); break;
+    case 'tag name': found = d.getElementsByTagName(value); break;
+    case 'css selector': found = d.querySelectorAll(value); break;
+    case 'xpath':
+      var snapshot = d.evaluate(value, d, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      found = [];
+      for (var i = 0; i < snapshot.snapshotLength; i++) {
+        found.push(snapshot.snapshotItem(i));
+      }
+      break;
+    case 'link text':
+    case 'partial link text':
+      found = Array.prototype.filter.call(d.getElementsByTagName('a'), function(a) {
+        var text = textOf(a);
+        return by == 'link text' ? text == value : text.indexOf(value) != -1;
+      });
+      break;
+    default:
+      throw new Error('Unsupported locator strategy: ' + by);
+  }
+  found = Array.prototype.slice.call(found);
+  return many ? found : (found[0] || null);
+}
+function evaluate(spec) {
+  var e, all;
+  switch (spec.op) {
+    case 'title_is':
+      return [document.title == spec.text, true];
+    case 'title_contains':
+      return [document.title.indexOf(spec.text) != -1, true];
+    case 'present':
+      e = locate(spec.by, spec.value);
+      return [!!e, e];
+    case 'present_all':
+      all = locate(spec.by, spec.value, true);
+      return [all.length > 0, all];
+    case 'visible':
+      e = locate(spec.by, spec.value);
+      return [!!e && isDisplayed(e), e];
+    case 'visible_any':
+      all = locate(spec.by, spec.value, true).filter(function(e) { return isDisplayed(e); });
+      return [all.length > 0, all];
+    case 'visible_all':
+      all = locate(spec.by, spec.value, true);
+      return [all.length > 0 && all.every(function(e) { return isDisplayed(e); }), all];
+    case 'invisible':
+      e = locate(spec.by, spec.value);
+      return [!e || !isDisplayed(e), e || true];
+    case 'clickable':
+      e = locate(spec.by, spec.value);
+      return [!!e && isDisplayed(e) && !e.disabled, e];
+    case 'selected':
+      // Like WebElement.is_selected: options are selected, checkboxes and
+      // radio buttons checked.
+      e = locate(spec.by, spec.value);
+      return [!!e && (e.tagName == 'OPTION' ? e.selected : !!e.checked) == spec.selected, true];
+    case 'text':
+      e = locate(spec.by, spec.value);
+      return [!!e && textOf(e).indexOf(spec.text) != -1, true];
+    case 'value':
+      e = locate(spec.by, spec.value);
+      return [!!e && !!e.value && e.value.indexOf(spec.text) != -1, true];
+    case 'all_of':
+      var values = [];
+      for (var i = 0; i < spec.conditions.length; i++) {
+        var result = evaluate(spec.conditions[i]);
+        if (!result[0]) {
+          return [false, null];
+        }
+        values.push(result[1]);
+      }
+      return [true, values];
+    case 'any_of':
+      for (var i = 0; i < spec.conditions.length; i++) {
+        var result = evaluate(spec.conditions[i]);
+        if (result[0]) {
+          return result;
+        }
+      }
+      return [false, null];
+    case 'none_of':
+      for (var i = 0; i < spec.conditions.length; i++) {
+        if (evaluate(spec.conditions[i])[0]) {
+          return [false, null];
+        }
+      }
+      return [true, true];
+    case 'each':
+      return [true, spec.conditions.map(function(c) { return evaluate(c); })];
+  }
+  throw new Error('Unsupported condition: ' + spec.op);
+}
+"""
+
+_OBSERVE_JS = """
+var spec = arguments[0], timeout = arguments[1], recheck = arguments[2],
+    done = arguments[arguments.length - 1];
+%s
+var finished = false, observer = null, timer = null, interval = null;
+function finish(result) {
+  if (finished) {
+    return;
+  }
+  finished = true;
+  if (observer) {
+    observer.disconnect();
+  }
+  clearTimeout(timer);
+  clearInterval(interval);
+  done(result);
+}
+function check() {
+  try {
+    var result = evaluate(spec);
+    if (result[0]) {
+      finish(result);
+    }
+  } catch (e) {
+    finish([false, null, String(e && e.message || e)]);
+  }
+}
+%s
+check();
+if (!finished) {
+  observer = new MutationObserver(check);
+  observer.observe(document, {childList: true, subtree: true, attributes: true,
+                              characterData: true});
+  // Style changes that affect visibility don't always mutate the DOM.
+  interval = setInterval(check, recheck);
+  timer = setTimeout(function() { finish([false, null]); }, timeout);
+}
+"""
+
+_DISPLAY_OPS = frozenset(['visible', 'visible_any', 'visible_all', 'invisible', 'clickable'])
+
+# Conditions on visibility use the isDisplayed atom WebElement.is_displayed
+# installs in the page, and only send it along when the page lacks it. The
+# scripts then answer _ATOM_MISSING, and are sent again installing it.
+_INSTALLED_ATOM_JS = "(window['%s'] || {})['isDisplayed']" % _ATOM_STORE
+_INSTALL_ATOM_JS = """(function() {
+  var atom = (%s);
+  try {
+    if (!window['%s']) {
+      Object.defineProperty(window, '%s', {value: {}, configurable: true});
+    }
+    window['%s']['isDisplayed'] = atom;
+  } catch (e) {}
+  return atom;
+})()""" % (isDisplayed_js, _ATOM_STORE, _ATOM_STORE, _ATOM_STORE)
+_MISSING_JS = "{'webdriver-atom-missing': true}"
+
+_evaluate_scripts = {}
+_observe_scripts = {}
+
+
+def _locator_spec(op, locator, **extra):
+    if not isinstance(locator, tuple) or len(locator) != 2:
+        return None
+    spec = {'op': op, 'by': locator[0], 'value': locator[1]}
+    spec.update(extra)
+    return spec
+
+
+_CONVERTERS = {
+    EC.title_is: lambda c: {'op': 'title_is', 'text': c.title},
+    EC.title_contains: lambda c: {'op': 'title_contains', 'text': c.title},
+    EC.presence_of_element_located: lambda c: _locator_spec('present', c.locator),
+    EC.presence_of_all_elements_located: lambda c: _locator_spec('present_all', c.locator),
+    EC.visibility_of_element_located: lambda c: _locator_spec('visible', c.locator),
+    EC.visibility_of_any_elements_located: lambda c: _locator_spec('visible_any', c.locator),
+    EC.visibility_of_all_elements_located: lambda c: _locator_spec('visible_all', c.locator),
+    EC.invisibility_of_element_located: lambda c: _locator_spec('invisible', c.target),
+    EC.element_to_be_clickable: lambda c: _locator_spec('clickable', c.locator),
+    EC.element_located_to_be_selected: lambda c: _locator_spec('selected', c.locator,
+                                                               selected=True),
+    EC.element_located_selection_state_to_be:
+        lambda c: _locator_spec('selected', c.locator, selected=c.is_selected),
+    EC.text_to_be_present_in_element: lambda c: _locator_spec('text', c.locator, text=c.text),
+    EC.text_to_be_present_in_element_value:
+        lambda c: _locator_spec('value', c.locator, text=c.text),
+}
+
+
+def _composite_spec(op, condition):
+    specs = [page_condition(c) for c in condition.expected_conditions]
+    if None in specs:
+        return None
+    return {'op': op, 'conditions': specs}
+
+
+_CONVERTERS[EC.all_of] = lambda c: _composite_spec('all_of', c)
+_CONVERTERS[EC.any_of] = lambda c: _composite_spec('any_of', c)
+_CONVERTERS[EC.none_of] = lambda c: _composite_spec('none_of', c)
+
+
+def page_condition(condition):
+    """
+    Translates an expected condition to a spec that can be evaluated in the
+    page, or returns None if it can't be. Only instances of the classes in
+    expected_conditions that look elements up by locator are supported, not
+    subclasses of them nor arbitrary callables, as well as all_of, any_of
+    and none_of combining only supported conditions.
+
+    :Args:
+     - condition - an expected condition instance.
+    """
+    converter = _CONVERTERS.get(type(condition))
+    if converter is None:
+        return None
+    return converter(condition)
+
+
+def _needs_display(spec):
+    if 'conditions' in spec:
+        return any(_needs_display(c) for c in spec['conditions'])
+    return spec['op'] in _DISPLAY_OPS
+
+
+def evaluate_in_page(driver, conditions):
+    """
+    Evaluates the expected conditions that can be evaluated in the page with
+    a single script call.
+
+    :Args:
+     - driver - the WebDriver instance to evaluate the conditions with.
+     - conditions - a sequence of expected condition instances.
+
+    :Returns:
+      A list with, for every condition, the value it would have returned,
+      False if it is not met, or None if it has to be evaluated by calling
+      it, because it can't be evaluated in the page or the script failed.
+    """
+    specs = [page_condition(c) for c in conditions]
+    batch = [spec for spec in specs if spec is not None]
+    if not batch:
+        return specs
+    spec = {'op': 'each', 'conditions': batch}
+    try:
+        result = driver.execute_script(evaluate_script(spec), spec)
+        if result == _ATOM_MISSING:
+            result = driver.execute_script(evaluate_script(spec, install=True), spec)
+        results = iter(result[1])
+    except WebDriverException:
+        return [None] * len(specs)
+    values = []
+    for spec in specs:
+        if spec is not None:
+            met, value = next(results)
+            spec = value if met else False
+        values.append(spec)
+    return values
+
+
+def _display_js(spec, install):
+    """Returns the isDisplayed expression of a script evaluating `spec`, and
+    the statement it starts with to report a missing atom."""
+    if not _needs_display(spec):
+        return 'null', None
+    if install:
+        return _INSTALL_ATOM_JS, None
+    return _INSTALLED_ATOM_JS, 'if (!isDisplayed) { %s }'
+
+
+def evaluate_script(spec, install=False):
+    """
+    Returns the script evaluating `spec`, passed as its first argument, once.
+    The script returns a list of whether the condition is met and the value
+    the expected condition would have returned.
+
+    Scripts for conditions on visibility return _ATOM_MISSING instead if the
+    page lacks the isDisplayed atom. The script with `install` set installs it.
+    """
+    key = (_needs_display(spec), install)
+    if key not in _evaluate_scripts:
+        display, check = _display_js(spec, install)
+        _evaluate_scripts[key] = (
+            _EVALUATE_JS % display +
+            (check % ('return %s;' % _MISSING_JS) if check else '') +
+            'return evaluate(arguments[0]);')
+    return _evaluate_scripts[key]
+
+
+def observe_script(spec, install=False):
+    """
+    Returns the asynchronous script waiting for `spec` to be met. Its
+    arguments are the spec, the milliseconds to wait for at most and the
+    milliseconds between checks made in case the page changes without
+    mutating the DOM. It resolves like `evaluate_script`, with an error
+    message as a third item if the condition could not be evaluated.
+    """
+    key = (_needs_display(spec), install)
+    if key not in _observe_scripts:
+        display, check = _display_js(spec, install)
+        _observe_scripts[key] = _OBSERVE_JS % (
+            _EVALUATE_JS % display,
+            check % ('done(%s); return;' % _MISSING_JS) if check else '')
+    return _observe_scripts[key]
@@ -18,6 +18,17 @@
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, UnexpectedTagNameException
 
+_READ_OPTIONS_JS = """
+var options = arguments[0].options, rows = [];
+for (var i = 0; i < options.length; i++) {
+  var o = options[i];
+  rows.push([o, o.text, o.value, o.getAttribute('value'), o.index, o.selected, o.disabled]);
+}
+return rows;
+"""
+
+_OPTION_KEYS = ('element', 'text', 'value', 'value_attribute', 'index', 'selected', 'disabled')
+
 
 class Select(object):
 
@@ -49,21 +60,29 @@ class Select(object):
     @property
     def all_selected_options(self):
         """Returns a list of all selected options belonging to this select tag"""
-        ret = []
-        for opt in self.options:
-            if opt.is_selected():
-                ret.append(opt)
-        return ret
+        return [opt['element'] for opt in self.read_options() if opt['selected']]
 
     @property
     def first_selected_option(self):
         """The first selected option in this select tag (or the currently selected option in a
         normal select)"""
-        for opt in self.options:
-            if opt.is_selected():
-                return opt
+        for opt in self.read_options():
+            if opt['selected']:
+                return opt['element']
         raise NoSuchElementException("No options are selected")
 
+    def read_options(self):
+        """Reads the state of all options belonging to this select tag with a single script call.
+
+           Returns a list with a dictionary per option, holding the option's 'element', its
+           whitespace normalized 'text', its 'value' and 'index', and whether it is 'selected'
+           and 'disabled'. Options without a value attribute have their text as 'value', and
+           None as 'value_attribute', the attribute select_by_value matches.
+           """
+        element = getattr(self._el, 'wrapped_element', self._el)
+        rows = element.parent.execute_script(_READ_OPTIONS_JS, element)
+        return [dict(zip(_OPTION_KEYS, row)) for row in rows]
+
     def select_by_value(self, value):
         """Select all options that have a value matching the argument. That is, when given "foo" this
            would select an option like:
@@ -75,14 +94,13 @@ class Select(object):
 
            throws NoSuchElementException If there is no option with specisied value in SELECT
            """
-        css = "option[value =%s]" % self._escapeString(value)
-        opts = self._el.find_elements(By.CSS_SELECTOR, css)
         matched = False
-        for opt in opts:
-            self._setSelected(opt)
-            if not self.is_multiple:
-                return
-            matched = True
+        for opt in self.read_options():
+            if opt['value_attribute'] == value:
+                self._set_state(opt, True)
+                if not self.is_multiple:
+                    return
+                matched = True
         if not matched:
             raise NoSuchElementException("Cannot locate option with value: %s" % value)
 
@@ -95,10 +113,10 @@ class Select(object):
 
            throws NoSuchElementException If there is no option with specisied index in SELECT
            """
-        match = str(index)
-        for opt in self.options:
-            if opt.get_attribute("index") == match:
-                self._setSelected(opt)
+        index = int(index)
+        for opt in self.read_options():
+            if opt['index'] == index:
+                self._set_state(opt, True)
                 return
         raise NoSuchElementException("Could not locate element with index %d" % index)
 
@@ -113,25 +131,22 @@ class Select(object):
 
             throws NoSuchElementException If there is no option with specisied text in SELECT
            """
-        xpath = ".//option[normalize-space(.) = %s]" % self._escapeString(text)
-        opts = self._el.find_elements(By.XPATH, xpath)
+        options = self.read_options()
         matched = False
-        for opt in opts:
-            self._setSelected(opt)
-            if not self.is_multiple:
-                return
-            matched = True
-
-        if len(opts) == 0 and " " in text:
+        for opt in options:
+            if opt['text'] == text:
+                self._set_state(opt, True)
+                if not self.is_multiple:
+                    return
+                matched = True
+
+        if not matched and " " in text:
             subStringWithoutSpace = self._get_longest_token(text)
-            if subStringWithoutSpace == "":
-                candidates = self.options
-            else:
-                xpath = ".//option[contains(.,%s)]" % self._escapeString(subStringWithoutSpace)
-                candidates = self._el.find_elements(By.XPATH, xpath)
-            for candidate in candidates:
-                if text == candidate.text:
-                    self._setSelected(candidate)
+            for candidate in options:
+                if subStringWithoutSpace not in candidate['text']:
+                    continue
+                if text == candidate['element'].text:
+                    self._set_state(candidate, True)
                     if not self.is_multiple:
                         return
                     matched = True
@@ -145,8 +160,8 @@ class Select(object):
         """
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect all options of a multi-select")
-        for opt in self.options:
-            self._unsetSelected(opt)
+        for opt in self.read_options():
+            self._set_state(opt, False)
 
     def deselect_by_value(self, value):
         """Deselect all options that have a value matching the argument. That is, when given "foo" this
@@ -162,11 +177,10 @@ class Select(object):
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect options of a multi-select")
         matched = False
-        css = "option[value = %s]" % self._escapeString(value)
-        opts = self._el.find_elements(By.CSS_SELECTOR, css)
-        for opt in opts:
-            self._unsetSelected(opt)
-            matched = True
+        for opt in self.read_options():
+            if opt['value_attribute'] == value:
+                self._set_state(opt, False)
+                matched = True
         if not matched:
             raise NoSuchElementException("Could not locate element with value: %s" % value)
 
@@ -181,9 +195,10 @@ class Select(object):
         """
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect options of a multi-select")
-        for opt in self.options:
-            if opt.get_attribute("index") == str(index):
-                self._unsetSelected(opt)
+        index = int(index)
+        for opt in self.read_options():
+            if opt['index'] == index:
+                self._set_state(opt, False)
                 return
         raise NoSuchElementException("Could not locate element with index %d" % index)
 
@@ -199,14 +214,19 @@ class Select(object):
         if not self.is_multiple:
             raise NotImplementedError("You may only deselect options of a multi-select")
         matched = False
-        xpath = ".//option[normalize-space(.) = %s]" % self._escapeString(text)
-        opts = self._el.find_elements(By.XPATH, xpath)
-        for opt in opts:
-            self._unsetSelected(opt)
-            matched = True
+        for opt in self.read_options():
+            if opt['text'] == text:
+                self._set_state(opt, False)
+                matched = True
         if not matched:
             raise NoSuchElementException("Could not locate element with visible text: %s" % text)
 
+    def _set_state(self, option, selected):
+        """Clicks an option read by read_options if its selected state differs from `selected`."""
+        if option['selected'] != selected:
+            option['element'].click()
+            option['selected'] = selected
+
     def _setSelected(self, option):
         if not option.is_selected():
             option.click()
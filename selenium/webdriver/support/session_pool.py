@@ -0,0 +1,268 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Reusing browser sessions across short jobs."""
+
+import threading
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.utils import _clock
+from selenium.webdriver.remote.command import Command
+
+_CLEAR_STORAGE_JS = """
+try { window.localStorage && window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage && window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def reset_session(driver):
+    """
+    The default reset policy of a SessionPool. Closes every window but the
+    first, clears the cookies, local storage and session storage of the
+    current page and navigates to about:blank.
+
+    Cookies and storage of other origins visited in the session are left
+    alone, as WebDriver can only reach those of the current page.
+
+    :Args:
+     - driver - the WebDriver instance to reset.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.delete_all_cookies()
+    driver.execute_script(_CLEAR_STORAGE_JS)
+    driver.get('about:blank')
+
+
+class SessionPool(object):
+    """
+    Keeps browser sessions running and hands them out to jobs one at a time,
+    saving the cost of starting a browser for every job.
+
+    Sessions are reset when they are given back, checked with the remote
+    server's status endpoint before they are handed out again, and quit
+    after `max_uses` jobs. Sessions that fail either step are replaced.
+
+    Example::
+
+        from functools import partial
+
+        pool = SessionPool(partial(webdriver.Chrome, options=options), size=4)
+        with pool.session() as driver:
+            driver.get('http://www.example.com')
+        pool.close()
+    """
+
+    def __init__(self, factory, size=1, max_uses=None, reset=reset_session,
+                 health_check=True, prestart=True):
+        """
+        :Args:
+         - factory - callable taking no arguments and returning a new WebDriver.
+         - size - maximum number of sessions kept by the pool.
+         - max_uses - number of jobs after which a session is quit and
+           replaced. None to reuse sessions for as long as they work.
+         - reset - callable taking a WebDriver, run when it is given back.
+           None to hand sessions out again as they were left.
+         - health_check - whether to check the remote server's status before
+           handing a session out.
+         - prestart - whether to start all `size` sessions right away.
+        """
+        self._factory = factory
+        self._size = size
+        self._max_uses = max_uses
+        self._reset = reset
+        self._health_check = health_check
+        self._lock = threading.Condition()
+        self._idle = []
+        self._uses = {}
+        self._starting = 0
+        self._closed = False
+        if prestart:
+            try:
+                self.fill()
+            except Exception:
+                # Nothing holds the pool yet to close it later.
+                self.close()
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def fill(self):
+        """
+        Starts sessions concurrently until the pool holds `size` of them.
+        """
+        with self._lock:
+            count = self._size - len(self._uses) - self._starting
+            self._starting += max(count, 0)
+        if count <= 0:
+            return
+
+        def start(_):
+            try:
+                return self._start()
+            except Exception as e:
+                return e
+
+        pool = ThreadPool(count)
+        try:
+            started = pool.map(start, range(count))
+        finally:
+            pool.close()
+            pool.join()
+        errors = [e for e in started if isinstance(e, Exception)]
+        drivers = [d for d in started if not isinstance(d, Exception)]
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._idle.extend(drivers)
+            self._lock.notify_all()
+        if closed:
+            # The pool was closed while the sessions started.
+            for driver in drivers:
+                self._discard(driver)
+        if errors:
+            raise errors[0]
+
+    def acquire(self, timeout=None):
+        """
+        Takes a session out of the pool, starting one if the pool has room,
+        or waiting for one to be given back otherwise.
+
+        :Args:
+         - timeout - seconds to wait for a session, None to wait indefinitely.
+
+        :Raises:
+         - TimeoutException - if no session became available in time.
+        """
+        end_time = None if timeout is None else _clock() + timeout
+        while True:
+            with self._lock:
+                while not self._idle and len(self._uses) + self._starting >= self._size:
+                    if self._closed:
+                        raise WebDriverException("The session pool is closed")
+                    remaining = None if end_time is None else end_time - _clock()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutException("No session became available")
+                    self._lock.wait(remaining)
+                if self._closed:
+                    raise WebDriverException("The session pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._starting += 1
+            if driver is None:
+                return self._start()
+            if not self._health_check or self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver, discard=False):
+        """
+        Gives a session back to the pool, resetting it for the next job.
+
+        :Args:
+         - driver - a WebDriver instance taken out with `acquire`.
+         - discard - whether to quit the session instead, e.g. because the
+           job left it in a bad state.
+        """
+        with self._lock:
+            self._uses[driver] += 1
+            discard = (discard or self._closed or
+                       (self._max_uses is not None and self._uses[driver] >= self._max_uses))
+        if not discard and self._reset is not None:
+            try:
+                self._reset(driver)
+            except WebDriverException:
+                discard = True
+        if discard:
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+            self._lock.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Takes a session out of the pool for the duration of a ``with`` block.
+        The session is quit rather than reused if the block raises a
+        WebDriverException.
+
+        :Args:
+         - timeout - seconds to wait for a session, None to wait indefinitely.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except WebDriverException:
+            self.release(driver, discard=True)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        self.release(driver)
+
+    def close(self):
+        """
+        Quits the idle sessions. Sessions still in use are quit when they are
+        given back.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def _start(self):
+        try:
+            driver = self._factory()
+        except BaseException:
+            with self._lock:
+                self._starting -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._starting -= 1
+            self._uses[driver] = 0
+        return driver
+
+    def _is_healthy(self, driver):
+        try:
+            driver.execute(Command.STATUS)
+        except Exception:
+            return False
+        return True
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._uses.pop(driver, None)
+            self._lock.notify()
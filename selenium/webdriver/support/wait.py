@@ -15,14 +15,77 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import random
 import time
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.utils import _clock
 
 POLL_FREQUENCY = 0.5  # How long to sleep inbetween calls to the method
 IGNORED_EXCEPTIONS = (NoSuchElementException,)  # exceptions ignored during calls to the method
 
 
+class FixedInterval(object):
+    """Polling strategy sleeping the same time between every two calls."""
+
+    def __init__(self, interval=POLL_FREQUENCY):
+        self.interval = interval
+
+    def delays(self):
+        """Returns an iterator over the times to sleep between calls."""
+        while True:
+            yield self.interval
+
+
+class ExponentialBackoff(object):
+    """Polling strategy starting with short sleeps and growing them by
+    `factor` after every call, up to `maximum` seconds."""
+
+    def __init__(self, initial=0.05, factor=2, maximum=1.0):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+
+    def delays(self):
+        """Returns an iterator over the times to sleep between calls."""
+        delay = self.initial
+        while True:
+            yield min(delay, self.maximum)
+            delay *= self.factor
+
+
+class FastThenSlow(object):
+    """Polling strategy sleeping `fast` seconds between calls for the first
+    `fast_for` seconds of a wait, and `slow` seconds after that."""
+
+    def __init__(self, fast=0.05, fast_for=1.0, slow=POLL_FREQUENCY):
+        self.fast = fast
+        self.fast_for = fast_for
+        self.slow = slow
+
+    def delays(self):
+        """Returns an iterator over the times to sleep between calls."""
+        switch_time = _clock() + self.fast_for
+        while _clock() < switch_time:
+            yield self.fast
+        while True:
+            yield self.slow
+
+
+class Jittered(object):
+    """Polling strategy randomizing the sleeps of another one by up to
+    `ratio` either way, so many clients waiting at once spread their polls."""
+
+    def __init__(self, strategy, ratio=0.25):
+        self.strategy = strategy
+        self.ratio = ratio
+
+    def delays(self):
+        """Returns an iterator over the times to sleep between calls."""
+        for delay in self.strategy.delays():
+            yield delay * random.uniform(1 - self.ratio, 1 + self.ratio)
+
+
 class WebDriverWait(object):
     def __init__(self, driver, timeout, poll_frequency=POLL_FREQUENCY, ignored_exceptions=None):
         """Constructor, takes a WebDriver instance and timeout in seconds.
@@ -31,7 +94,8 @@ class WebDriverWait(object):
             - driver - Instance of WebDriver (Ie, Firefox, Chrome or Remote)
             - timeout - Number of seconds before timing out
             - poll_frequency - sleep interval between calls
-              By default, it is 0.5 second.
+              By default, it is 0.5 second. A polling strategy such as
+              ExponentialBackoff can be given instead of a number.
             - ignored_exceptions - iterable structure of exception classes ignored during calls.
               By default, it contains NoSuchElementException only.
 
@@ -47,6 +111,10 @@ class WebDriverWait(object):
         # avoid the divide by zero
         if self._poll == 0:
             self._poll = POLL_FREQUENCY
+        if hasattr(self._poll, 'delays'):
+            self._polling = self._poll
+        else:
+            self._polling = FixedInterval(self._poll)
         exceptions = list(IGNORED_EXCEPTIONS)
         if ignored_exceptions is not None:
             try:
@@ -65,7 +133,8 @@ class WebDriverWait(object):
         screen = None
         stacktrace = None
 
-        end_time = time.time() + self._timeout
+        end_time = _clock() + self._timeout
+        delays = self._polling.delays()
         while True:
             try:
                 value = method(self._driver)
@@ -74,15 +143,15 @@ class WebDriverWait(object):
             except self._ignored_exceptions as exc:
                 screen = getattr(exc, 'screen', None)
                 stacktrace = getattr(exc, 'stacktrace', None)
-            time.sleep(self._poll)
-            if time.time() > end_time:
+            if not self._sleep(delays, end_time):
                 break
         raise TimeoutException(message, screen, stacktrace)
 
     def until_not(self, method, message=''):
         """Calls the method provided with the driver as an argument until the \
         return value is False."""
-        end_time = time.time() + self._timeout
+        end_time = _clock() + self._timeout
+        delays = self._polling.delays()
         while True:
             try:
                 value = method(self._driver)
@@ -90,7 +159,21 @@ class WebDriverWait(object):
                     return value
             except self._ignored_exceptions:
                 return True
-            time.sleep(self._poll)
-            if time.time() > end_time:
+            if not self._sleep(delays, end_time):
                 break
         raise TimeoutException(message)
+
+    def _next_delay(self, delays, end_time):
+        """Returns how long to sleep before the next call, never past the
+        deadline, or None if the deadline has passed."""
+        remaining = end_time - _clock()
+        if remaining <= 0:
+            return None
+        return min(next(delays), remaining)
+
+    def _sleep(self, delays, end_time):
+        delay = self._next_delay(delays, end_time)
+        if delay is None:
+            return False
+        time.sleep(delay)
+        return True
@@ -14,6 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import base64
 import platform
 from os import path
 
@@ -147,3 +148,29 @@ def test_creates_capabilities(options):
     assert 'baz' in opts['extensions']
     assert opts['debuggerAddress'] == '/foo/bar'
     assert opts['foo'] == 'bar'
+
+
+def test_extension_files_are_encoded_once(options, tmpdir, mocker):
+    crx = tmpdir.join('extension.crx')
+    crx.write_binary(b'Cr24' * 100)
+    options.add_extension(str(crx))
+    encode = mocker.spy(base64, 'b64encode')
+    first = Options()
+    first.add_extension(str(crx))
+    assert options.extensions == first.extensions
+    assert encode.call_count == 1
+
+    crx.write_binary(b'Cr24' * 101)
+    assert base64.b64decode(options.extensions[0]) == b'Cr24' * 101
+
+
+def test_unpacked_extensions_are_loaded_by_argument(options, tmpdir):
+    first, second = tmpdir.mkdir('first'), tmpdir.mkdir('second')
+    options.add_argument('foo')
+    options.add_unpacked_extension(str(first))
+    options.add_unpacked_extension(str(second))
+    args = options.to_capabilities()[Options.KEY]['args']
+    assert args == ['foo', '--load-extension=%s,%s' % (first, second)]
+    assert options.arguments == ['foo']
+    with pytest.raises(IOError):
+        options.add_unpacked_extension(str(tmpdir.join('missing')))
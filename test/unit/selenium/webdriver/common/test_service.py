@@ -0,0 +1,67 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import sys
+import time
+
+import pytest
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common import utils
+from selenium.webdriver.common.service import Service
+
+
+class SleepingService(Service):
+
+    def __init__(self, seconds):
+        Service.__init__(self, sys.executable)
+        self.seconds = seconds
+
+    def command_line_args(self):
+        return ['-c', 'import time; time.sleep(%s)' % self.seconds]
+
+
+def test_poll_until_backs_off(mocker):
+    sleep = mocker.patch('time.sleep')
+    condition = mocker.Mock(side_effect=[False, False, False, True])
+    assert utils.poll_until(condition, 30, interval=0.01, max_interval=0.03)
+    assert [c[0][0] for c in sleep.call_args_list] == [0.01, 0.02, 0.03]
+
+
+def test_poll_until_gives_up_at_the_deadline():
+    start = time.time()
+    assert not utils.poll_until(lambda: False, 0.1, interval=0.05, max_interval=1)
+    assert time.time() - start < 0.5
+
+
+def test_start_returns_as_soon_as_service_is_connectable(mocker):
+    service = SleepingService(5)
+    mocker.patch.object(service, 'is_connectable', side_effect=[False, False, True, False])
+    start = time.time()
+    try:
+        service.start()
+        assert time.time() - start < 1
+    finally:
+        service.stop()
+
+
+def test_start_fails_when_service_exits():
+    service = SleepingService(0)
+    service.start_timeout = 5
+    with pytest.raises(WebDriverException) as e:
+        service.start()
+    assert 'unexpectedly exited' in e.value.msg
@@ -0,0 +1,100 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from multiprocessing.pool import ThreadPool
+
+import pytest
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common import utils
+from selenium.webdriver.common.service_pool import ServicePool
+
+
+@pytest.fixture
+def factory(mocker):
+    def service():
+        service = mocker.Mock(port=utils.free_port())
+        service.process.poll.return_value = None
+        return service
+    return mocker.Mock(side_effect=service)
+
+
+def test_free_port_does_not_repeat_under_concurrency():
+    pool = ThreadPool(16)
+    try:
+        ports = pool.map(lambda _: utils.free_port(), range(200))
+    finally:
+        pool.close()
+        pool.join()
+    assert len(set(ports)) == len(ports)
+
+
+def test_starts_services_up_front(factory):
+    pool = ServicePool(factory, size=3)
+    pool.start()
+    assert factory.call_count == 3
+    for service in pool._sessions:
+        service.start.assert_called_once_with()
+
+
+def test_sessions_share_the_least_busy_service(factory):
+    pool = ServicePool(factory, size=2, max_sessions=2)
+    leases = [pool.acquire() for _ in range(4)]
+    services = [lease.service for lease in leases]
+    assert factory.call_count == 2
+    assert services.count(services[0]) == 2
+    with pytest.raises(TimeoutException):
+        pool.acquire(timeout=0.01)
+
+    leases[1].stop()
+    leases[1].stop()
+    assert pool.acquire().service is services[1]
+
+
+def test_stopping_a_lease_keeps_the_service_running(factory):
+    with ServicePool(factory) as pool:
+        lease = pool.acquire()
+        lease.start()
+        lease.stop()
+        assert not lease.service.stop.called
+    lease.service.stop.assert_called_once_with()
+
+
+def test_exited_services_are_replaced(factory):
+    pool = ServicePool(factory)
+    lease = pool.acquire()
+    lease.stop()
+    lease.service.process.poll.return_value = 1
+    assert pool.acquire().service is not lease.service
+
+
+def test_services_started_while_stopping_are_stopped(factory):
+    pool = ServicePool(factory)
+    services = []
+    new_service = factory.side_effect
+
+    def stop_while_starting():
+        service = new_service()
+        service.start.side_effect = pool.stop
+        services.append(service)
+        return service
+
+    factory.side_effect = stop_while_starting
+    with pytest.raises(WebDriverException):
+        pool.acquire()
+    services[0].stop.assert_called_once_with()
+    assert pool._sessions == {}
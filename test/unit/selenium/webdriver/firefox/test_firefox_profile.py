@@ -0,0 +1,139 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import base64
+import io
+import os
+import zipfile
+
+import pytest
+
+from selenium.webdriver.firefox import firefox_profile
+from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
+
+
+@pytest.fixture
+def template(tmpdir, monkeypatch):
+    monkeypatch.setattr(FirefoxProfile, 'DEFAULT_PREFERENCES', {'mutable': {}, 'frozen': {}})
+    monkeypatch.setattr(firefox_profile, '_encoded_cache', firefox_profile._EncodedProfileCache())
+    template = tmpdir.mkdir('template')
+    template.join('cert9.db').write_binary(os.urandom(4096))
+    template.join('prefs.js').write('user_pref("browser.startup.page", 1);\n')
+    template.mkdir('extensions').join('addon.xpi').write_binary(b'PK' * 1024)
+    return str(template)
+
+
+@pytest.fixture
+def zip_profile(mocker):
+    return mocker.spy(firefox_profile, '_zip_profile')
+
+
+def unzip(encoded):
+    return zipfile.ZipFile(io.BytesIO(base64.b64decode(encoded)))
+
+
+def test_encoded_profile_is_cached_until_it_changes(template, zip_profile):
+    profile = FirefoxProfile(template)
+    encoded = profile.encoded
+    assert profile.encoded == encoded
+    assert zip_profile.call_count == 1
+
+    profile.set_preference('browser.startup.page', 0)
+    assert 'browser.startup.page' in unzip(profile.encoded).read('user.js').decode('utf-8')
+    assert zip_profile.call_count == 2
+
+
+def test_rewritten_preferences_are_encoded_despite_unchanged_mtime(template):
+    profile = FirefoxProfile(template)
+    profile.set_preference('x', 1)
+    profile.encoded
+    stat = os.stat(profile.userPrefs)
+    profile.set_preference('x', 2)
+    profile.update_preferences()
+    os.utime(profile.userPrefs, (stat.st_atime, stat.st_mtime))
+    assert 'user_pref("x", 2);' in unzip(profile.encoded).read('user.js').decode('utf-8')
+
+
+def test_memory_cache_is_bounded_by_size(template):
+    cache = firefox_profile._EncodedProfileCache(max_bytes=1)
+    first = FirefoxProfile(template)
+    second = FirefoxProfile(template)
+    second.set_preference('x', 1)
+    second.update_preferences()
+    cache.encode(first.path, None)
+    cache.encode(second.path, None)
+    assert len(cache._encoded) == 1
+
+
+def test_profiles_with_the_same_content_share_the_encoded_profile(template, zip_profile):
+    encoded = FirefoxProfile(template).encoded
+    assert FirefoxProfile(template).encoded == encoded
+    assert zip_profile.call_count == 1
+    assert sorted(unzip(encoded).namelist()) == ['cert9.db', 'extensions/addon.xpi', 'prefs.js', 'user.js']
+
+
+def test_store_only_compression(template):
+    profile = FirefoxProfile(template)
+    profile.compress_level = 0
+    infos = unzip(profile.encoded).infolist()
+    assert all(info.compress_type == zipfile.ZIP_STORED for info in infos)
+
+
+def test_encoded_profiles_are_shared_through_the_cache_dir(template, tmpdir, zip_profile):
+    FirefoxProfile.set_encoded_cache_dir(str(tmpdir.join('cache')))
+    try:
+        encoded = FirefoxProfile(template).encoded
+        firefox_profile._encoded_cache.clear()
+        assert FirefoxProfile(template).encoded == encoded
+    finally:
+        FirefoxProfile.set_encoded_cache_dir(None)
+    assert zip_profile.call_count == 1
+    assert len(tmpdir.join('cache').listdir()) == 1
+
+
+@pytest.fixture
+def link_clones(tmpdir, monkeypatch):
+    root = tmpdir.mkdir('clones')
+    monkeypatch.setattr(FirefoxProfile, 'clone_mode', 'link')
+    monkeypatch.setattr(FirefoxProfile, 'clone_root', str(root))
+    return root
+
+
+def test_link_clones_share_immutable_files_with_a_template(template, link_clones):
+    first, second = FirefoxProfile(template), FirefoxProfile(template)
+    assert first.path.startswith(str(link_clones))
+    assert first.path != second.path
+
+    addon = os.path.join('extensions', 'addon.xpi')
+    assert os.path.samefile(os.path.join(first.path, addon), os.path.join(second.path, addon))
+    assert not os.path.samefile(os.path.join(first.path, addon), os.path.join(template, addon))
+    for name in ('prefs.js', 'cert9.db'):
+        assert not os.path.samefile(os.path.join(first.path, name),
+                                    os.path.join(second.path, name))
+    assert len(link_clones.join(firefox_profile._TEMPLATES_DIR).listdir()) == 1
+
+    FirefoxProfile.remove_templates(str(link_clones))
+    assert os.path.isfile(os.path.join(first.path, 'cert9.db'))
+
+
+def test_changed_profile_gets_a_new_template(template, link_clones):
+    FirefoxProfile(template)
+    with open(os.path.join(template, 'cert9.db'), 'ab') as f:
+        f.write(b'more')
+    clone = FirefoxProfile(template)
+    assert os.path.getsize(os.path.join(clone.path, 'cert9.db')) == 4100
+    assert len(link_clones.join(firefox_profile._TEMPLATES_DIR).listdir()) == 2
@@ -0,0 +1,215 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""A stand-in W3C WebDriver server for unit tests.
+
+Serves a single fake page whose elements are looked up by id, so the client
+side of the wire protocol can be exercised without a browser."""
+
+import base64
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:  # 3+
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+PAGE = {
+    'heading': {'tag': 'h1', 'text': 'Stand-in', 'displayed': True,
+                'rect': {'x': 0, 'y': 0, 'width': 200, 'height': 40},
+                'attributes': {'class': 'title'}},
+    'name': {'tag': 'input', 'text': '', 'displayed': True,
+             'rect': {'x': 0, 'y': 50, 'width': 100, 'height': 20},
+             'attributes': {'type': 'text', 'value': 'cheese'}},
+    'hidden': {'tag': 'div', 'text': '', 'displayed': False,
+               'rect': {'x': 0, 'y': 0, 'width': 0, 'height': 0},
+               'attributes': {}},
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length).decode('utf-8')) if length else {}
+        with self.server.lock:
+            self.server.requests.append((method, self.path, body))
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            if self.server.latency:
+                time.sleep(self.server.latency)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+        for route_method, pattern, handler in _ROUTES:
+            match = re.match(pattern + '$', self.path)
+            if route_method == method and match:
+                status, value = handler(self.server, body, *match.groups())
+                break
+        else:
+            status, value = 404, {'error': 'unknown command', 'message': self.path}
+        self._respond(status, value)
+
+    def _respond(self, status, value):
+        data = json.dumps({'value': value}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _new_session(server, body):
+    with server.lock:
+        server.session_count += 1
+        session_id = 'session-%d' % server.session_count
+    return 200, {'sessionId': session_id, 'capabilities': {'browserName': 'stand-in'}}
+
+
+def _element(element_id):
+    if element_id not in PAGE:
+        return 404, {'error': 'stale element reference', 'message': element_id}
+    return 200, PAGE[element_id]
+
+
+def _find(server, body, session_id, parent_id=None, many=False):
+    match = re.match(r'\[id="(.*)"\]$', body.get('value', ''))
+    found = [match.group(1)] if match and match.group(1) in PAGE else []
+    if many:
+        return 200, [{ELEMENT_KEY: f} for f in found]
+    if not found:
+        return 404, {'error': 'no such element', 'message': body.get('value')}
+    return 200, {ELEMENT_KEY: found[0]}
+
+
+def _element_value(key):
+    def handler(server, body, session_id, element_id, name=None):
+        status, element = _element(element_id)
+        if status != 200:
+            return status, element
+        if name is not None:
+            return 200, element[key].get(name)
+        return 200, element[key]
+    return handler
+
+
+def _execute(server, body, session_id):
+    return 200, body.get('args')
+
+
+def _screenshot(server, body, session_id, element_id=None):
+    if element_id is not None and element_id not in PAGE:
+        return _element(element_id)
+    return 200, base64.b64encode(server.screenshot).decode('ascii')
+
+
+def _upload(server, body, session_id):
+    archive = zipfile.ZipFile(io.BytesIO(base64.b64decode(body['file'])))
+    name = archive.namelist()[0]
+    with server.lock:
+        server.uploads.append((archive.getinfo(name).compress_type, archive.read(name)))
+    return 200, '/uploads/%d/%s' % (len(server.uploads), name)
+
+
+def _send_keys(server, body, session_id, element_id):
+    status, element = _element(element_id)
+    if status != 200:
+        return status, element
+    return 200, None
+
+
+_ROUTES = [
+    ('POST', r'/session', _new_session),
+    ('DELETE', r'/session/([^/]+)', lambda server, body, s: (200, None)),
+    ('POST', r'/session/([^/]+)/url', lambda server, body, s: (200, None)),
+    ('GET', r'/session/([^/]+)/title', lambda server, body, s: (200, 'Stand-in')),
+    ('POST', r'/session/([^/]+)/element', _find),
+    ('POST', r'/session/([^/]+)/elements',
+     lambda server, body, s: _find(server, body, s, many=True)),
+    ('GET', r'/session/([^/]+)/element/([^/]+)/text', _element_value('text')),
+    ('GET', r'/session/([^/]+)/element/([^/]+)/name', _element_value('tag')),
+    ('GET', r'/session/([^/]+)/element/([^/]+)/rect', _element_value('rect')),
+    ('GET', r'/session/([^/]+)/element/([^/]+)/displayed', _element_value('displayed')),
+    ('GET', r'/session/([^/]+)/element/([^/]+)/attribute/([^/]+)', _element_value('attributes')),
+    ('POST', r'/session/([^/]+)/element/([^/]+)/value', _send_keys),
+    ('POST', r'/session/([^/]+)/file', _upload),
+    ('POST', r'/session/([^/]+)/execute/sync', _execute),
+    ('GET', r'/session/([^/]+)/source', lambda server, body, s: (200, server.page_source)),
+    ('GET', r'/session/([^/]+)/screenshot', _screenshot),
+    ('GET', r'/session/([^/]+)/element/([^/]+)/screenshot', _screenshot),
+]
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """Threaded stand-in server, started on a free port with `start`."""
+
+    daemon_threads = True
+
+    def __init__(self, latency=0):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _Handler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0  # most requests handled at once
+        self.session_count = 0
+        self.page_source = '<html></html>'
+        self.screenshot = b'\x89PNG'
+        self.uploads = []
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self.server_port
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
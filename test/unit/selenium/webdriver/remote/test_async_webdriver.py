@@ -0,0 +1,129 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+
+import pytest
+
+from selenium.common.exceptions import (NoSuchElementException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.async_remote_connection import AsyncRemoteConnection
+from selenium.webdriver.remote.async_webdriver import AsyncWebDriver
+from selenium.webdriver.remote.async_webelement import AsyncWebElement
+from selenium.webdriver.support.async_wait import AsyncWebDriverWait
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_starts_w3c_session_and_quits(server):
+    async def scenario():
+        async with AsyncWebDriver(server.url) as driver:
+            assert driver.session_id == 'session-1'
+            assert driver.w3c
+            assert driver.name == 'stand-in'
+            await driver.get('http://example.com')
+            return await driver.title
+
+    assert run(scenario()) == 'Stand-in'
+    assert server.requests[-1][:2] == ('DELETE', '/session/session-1')
+
+
+def test_finds_elements_and_reads_them(server):
+    async def scenario():
+        async with AsyncWebDriver(server.url) as driver:
+            heading = await driver.find_element(By.ID, 'heading')
+            assert isinstance(heading, AsyncWebElement)
+            assert await driver.find_elements(By.ID, 'missing') == []
+            return await heading.text, await heading.tag_name, await heading.size
+
+    assert run(scenario()) == ('Stand-in', 'h1', {'width': 200, 'height': 40})
+
+
+def test_errors_are_raised_through_error_handler(server):
+    async def scenario():
+        async with AsyncWebDriver(server.url) as driver:
+            await driver.find_element(By.ID, 'missing')
+
+    with pytest.raises(NoSuchElementException):
+        run(scenario())
+
+
+def test_elements_are_wrapped_in_script_arguments(server):
+    async def scenario():
+        async with AsyncWebDriver(server.url) as driver:
+            heading = await driver.find_element(By.ID, 'heading')
+            return heading, await driver.execute_script('return arguments', heading, 1)
+
+    heading, result = run(scenario())
+    assert result == [heading, 1]
+
+
+def test_drives_sessions_concurrently_on_one_loop(server):
+    server.latency = 0.2
+
+    async def session():
+        async with AsyncWebDriver(server.url) as driver:
+            return await driver.title
+
+    async def scenario():
+        return await asyncio.gather(*[session() for _ in range(10)])
+
+    assert run(scenario()) == ['Stand-in'] * 10
+    # The round trips of the sessions are run side by side.
+    assert server.max_active > 1
+
+
+def test_reuses_connections_between_commands(server):
+    async def scenario():
+        async with AsyncWebDriver(server.url) as driver:
+            for _ in range(5):
+                await driver.title
+
+    run(scenario())
+    assert len(server.requests) == 7
+    assert server.connections == 1
+
+
+def test_wait_accepts_coroutine_conditions(server):
+    async def scenario():
+        async with AsyncWebDriver(server.url) as driver:
+            heading = await AsyncWebDriverWait(driver, 1).until(
+                lambda d: d.find_element(By.ID, 'heading'))
+            with pytest.raises(TimeoutException):
+                await AsyncWebDriverWait(driver, 0.2, poll_frequency=0.05).until(
+                    lambda d: d.find_element(By.ID, 'missing'))
+            return heading
+
+    assert run(scenario()).id == 'heading'
+
+
+def test_synchronous_connection_methods_are_not_supported(server):
+    connection = AsyncRemoteConnection(server.url)
+    with pytest.raises(WebDriverException):
+        connection.execute_streaming('getPageSource', {'sessionId': 'x'}, None)
+    with pytest.raises(WebDriverException):
+        connection.execute_with_body('uploadFile', {'sessionId': 'x'}, None)
+    with pytest.raises(WebDriverException):
+        connection.add_command_listener(lambda event: None)
+    assert not server.requests
@@ -0,0 +1,75 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.batch import DEFAULT_MAX_WORKERS
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def test_results_are_returned_in_order(driver):
+    heading = driver.find_element(By.ID, 'heading')
+    with driver.batch() as batch:
+        text = batch.call(getattr, heading, 'text')
+        tag = batch.execute(Command.GET_ELEMENT_TAG_NAME, {'id': heading.id})
+        title = batch.call(getattr, driver, 'title')
+    assert [text.result(), tag.result(), title.result()] == ['Stand-in', 'h1', 'Stand-in']
+
+
+def test_commands_are_sent_concurrently(server, driver):
+    server.latency = 0.2
+    with driver.batch(max_workers=10) as batch:
+        results = [batch.call(getattr, driver, 'title') for _ in range(10)]
+    assert server.max_active > 1
+    assert [r.result() for r in results] == ['Stand-in'] * 10
+
+
+def test_keep_alive_connections_are_reused_across_batches(server):
+    server.latency = 0.05
+    driver = WebDriver(server.url, keep_alive=True)
+    try:
+        connections = []
+        for _ in range(3):
+            with driver.batch() as batch:
+                results = [batch.call(getattr, driver, 'title') for _ in range(DEFAULT_MAX_WORKERS)]
+            assert [r.result() for r in results] == ['Stand-in'] * DEFAULT_MAX_WORKERS
+            connections.append(server.connections)
+    finally:
+        driver.quit()
+    assert connections[0] == connections[-1]
+
+
+def test_errors_only_fail_their_own_result(driver):
+    with driver.batch() as batch:
+        missing = batch.call(driver.find_element, By.ID, 'missing')
+        found = batch.call(driver.find_element, By.ID, 'name')
+    with pytest.raises(NoSuchElementException):
+        missing.result()
+    assert found.result().id == 'name'
+
+
+def test_result_is_unavailable_before_the_batch_runs(driver):
+    batch = driver.batch()
+    result = batch.call(getattr, driver, 'title')
+    assert not result.done()
+    with pytest.raises(WebDriverException):
+        result.result()
+    assert batch.run() == [result]
+    assert result.done()
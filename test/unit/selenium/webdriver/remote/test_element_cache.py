@@ -0,0 +1,112 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from test.unit.selenium.webdriver.remote import stand_in_server
+
+
+@pytest.fixture
+def driver(driver):
+    driver.enable_element_cache()
+    return driver
+
+
+def finds(server):
+    return [r for r in server.requests if r[1].endswith(('/element', '/elements'))]
+
+
+def test_finding_an_element_again_uses_the_cache(server, driver):
+    heading = driver.find_element(By.ID, 'heading')
+    assert driver.find_element(By.ID, 'heading') == heading
+    assert len(finds(server)) == 1
+
+
+def test_element_lists_are_found_again(mocker):
+    driver = WebDriver.__new__(WebDriver)
+    driver.w3c = False
+    found = iter([['a'], ['a', 'b']])
+    mocker.patch.object(WebDriver, '_execute', side_effect=lambda command, params=None: {
+        'value': [WebElement(driver, id_, w3c=False) for id_ in next(found)]})
+    driver.enable_element_cache()
+    assert len(driver.find_elements(By.CSS_SELECTOR, 'li')) == 1
+    assert len(driver.find_elements(By.CSS_SELECTOR, 'li')) == 2
+
+
+def test_missing_elements_are_not_cached(server, driver):
+    assert driver.find_elements(By.ID, 'missing') == []
+    assert driver.find_elements(By.ID, 'missing') == []
+    assert len(finds(server)) == 2
+
+
+def test_navigating_forgets_cached_elements(server, driver):
+    driver.find_element(By.ID, 'heading')
+    driver.get('http://localhost/other')
+    driver.find_element(By.ID, 'heading')
+    assert len(finds(server)) == 2
+
+
+def test_disabling_the_cache(server, driver):
+    driver.find_element(By.ID, 'heading')
+    driver.disable_element_cache()
+    assert driver.element_cache is None
+    driver.find_element(By.ID, 'heading')
+    assert len(finds(server)) == 2
+
+
+def test_oldest_locators_are_evicted(server, driver):
+    driver.disable_element_cache()
+    driver.enable_element_cache(max_entries=1)
+    driver.find_element(By.ID, 'heading')
+    driver.find_element(By.ID, 'name')
+    driver.find_element(By.ID, 'heading')
+    assert len(finds(server)) == 3
+
+
+def test_stale_element_is_raised_if_it_cannot_be_found_again(server, driver, monkeypatch):
+    heading = driver.find_element(By.ID, 'heading')
+    monkeypatch.delitem(stand_in_server.PAGE, 'heading')
+    with pytest.raises(StaleElementReferenceException):
+        heading.text
+    assert len(finds(server)) == 2
+
+
+def test_stale_element_is_found_again_and_the_command_retried(mocker):
+    driver = WebDriver.__new__(WebDriver)
+    driver.w3c = False
+    old, new = WebElement(driver, 'old', w3c=False), WebElement(driver, 'new', w3c=False)
+    found = iter([old, new])
+
+    def execute(command, params=None):
+        if command == Command.FIND_ELEMENT:
+            return {'value': next(found)}
+        if params['id'] == 'old':
+            raise StaleElementReferenceException()
+        return {'value': 'text of %s' % params['id']}
+
+    mocker.patch.object(WebDriver, '_execute', side_effect=execute)
+    driver.enable_element_cache()
+    element = driver.find_element(By.ID, 'heading')
+    assert element.text == 'text of new'
+    assert element.is_displayed() is not None
+    assert driver.find_element(By.ID, 'heading') is new
+    assert WebDriver._execute.call_args_list[-1][0][1]['id'] == 'new'
@@ -0,0 +1,101 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import json
+
+import pytest
+from urllib3.util.retry import RequestHistory, Retry
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.instrumentation import CommandEvent, CommandHistogram, error_name
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def test_listeners_receive_measured_commands(server):
+    driver = WebDriver(server.url)
+    events = []
+    driver.command_executor.add_command_listener(events.append)
+    driver.find_element(By.ID, 'heading')
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(By.ID, 'missing')
+    driver.command_executor.remove_command_listener(events.append)
+    driver.quit()
+
+    found, missing = events
+    assert found.command == missing.command == Command.FIND_ELEMENT
+    assert found.method == 'POST' and found.url.endswith('/element')
+    assert found.status == 200 and found.error is None
+    assert missing.status == 404 and missing.error == 'no such element'
+    assert found.request_size > 0 and found.response_size > 0
+    assert found.duration >= found.response_time + found.transfer_time + found.parse_time
+
+
+def test_retries_are_counted_without_redirects(mocker):
+    response = mocker.Mock(status=200, data=b'{"value": null}')
+    response.getheader.return_value = 'application/json'
+    response.retries = Retry(3, history=(
+        RequestHistory('GET', '/status', None, None, None),
+        RequestHistory('GET', '/status', None, 301, '/elsewhere')))
+    mocker.patch.object(RemoteConnection, '_get_shared_pool').return_value.request \
+        .return_value = response
+    connection = RemoteConnection('http://localhost:4444', resolve_ip=False)
+    events = []
+    connection.add_command_listener(events.append)
+    connection.execute(Command.STATUS, {})
+    assert events[0].retries == 1
+
+
+def test_error_names():
+    assert error_name({'status': 0, 'value': None}) is None
+    assert error_name({'status': 7, 'value': {'message': 'gone'}}) == 'no such element'
+    assert error_name({'value': {'error': 'stale element reference'}}) == 'stale element reference'
+    assert error_name({'status': 404, 'value': '{"value": {"error": "no such window"}}'}) \
+        == 'no such window'
+
+
+def event(command, duration, error=None):
+    event = CommandEvent(command)
+    event.duration, event.error, event.request_size = duration, error, 10
+    event.retries = 1
+    return event
+
+
+def test_histogram_exports():
+    histogram = CommandHistogram(buckets=(0.1, 1))
+    histogram(event('findElement', 0.05))
+    histogram(event('findElement', 0.5, error='no such element'))
+    histogram(event('get', 3))
+
+    snapshot = json.loads(histogram.to_json())
+    assert snapshot['findElement']['buckets'] == [[0.1, 1], [1, 2]]
+    assert snapshot['findElement']['errors'] == {'no such element': 1}
+    assert snapshot['get']['buckets'] == [[0.1, 0], [1, 0]]
+
+    text = histogram.to_prometheus()
+    assert 'selenium_command_duration_seconds_bucket{command="findElement",le="1.0"} 2' in text
+    assert 'selenium_command_duration_seconds_bucket{command="get",le="+Inf"} 1' in text
+    assert 'selenium_command_duration_seconds_count{command="get"} 1' in text
+    assert 'selenium_command_request_bytes_total{command="findElement"} 20' in text
+    assert 'selenium_command_retries_total{command="get"} 1' in text
+    assert ('selenium_command_errors_total{command="findElement",error="no such element"} 1'
+            in text)
+
+    histogram.reset()
+    assert histogram.snapshot() == {}
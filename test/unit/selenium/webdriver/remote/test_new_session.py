@@ -70,3 +70,28 @@ def test_accepts_firefox_options_to_remote_driver(mocker, browser_name):
 
     WebDriver(desired_capabilities=caps, options=opts)
     mock.assert_called_with(expected_caps, None)
+
+
+def test_requests_session_in_a_single_dialect(mocker, monkeypatch):
+    mock = mocker.patch('selenium.webdriver.remote.webdriver.WebDriver.execute')
+    caps = {'browserName': 'firefox', 'firefox_profile': 'UEsDBA=='}
+    monkeypatch.setattr(WebDriver, 'session_dialect', 'w3c')
+    WebDriver(desired_capabilities=deepcopy(caps))
+    assert list(mock.call_args[0][1]) == ['capabilities']
+    always_match = mock.call_args[0][1]['capabilities']['alwaysMatch']
+    assert always_match['moz:firefoxOptions'] == {'profile': 'UEsDBA=='}
+
+    monkeypatch.setattr(WebDriver, 'session_dialect', 'oss')
+    WebDriver(desired_capabilities=deepcopy(caps))
+    mock.assert_called_with(Command.NEW_SESSION, {'desiredCapabilities': caps})
+
+
+def test_detects_session_dialect_of_remote_server(mocker, monkeypatch):
+    mock = mocker.patch('selenium.webdriver.remote.webdriver.WebDriver.execute',
+                        return_value={'sessionId': 'abc', 'value': {}})
+    monkeypatch.setattr(WebDriver, 'session_dialect', 'detect')
+    url = 'http://detect.example:4444/wd/hub'
+    WebDriver(url)
+    assert sorted(mock.call_args[0][1]) == ['capabilities', 'desiredCapabilities']
+    WebDriver(url)
+    assert list(mock.call_args[0][1]) == ['capabilities']
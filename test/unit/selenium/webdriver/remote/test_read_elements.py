@@ -0,0 +1,70 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import getAttribute_js, isDisplayed_js
+
+
+@pytest.fixture
+def driver(mocker):
+    mocker.patch('selenium.webdriver.remote.webdriver.WebDriver.start_session')
+    driver = WebDriver()
+    driver.w3c = True
+    return driver
+
+
+def test_reads_many_elements_in_one_script(driver, mocker):
+    elements = [driver.create_web_element('a'), driver.create_web_element('b')]
+    rect = {'x': 0, 'y': 1, 'width': 2, 'height': 3}
+    execute_script = mocker.patch.object(driver, 'execute_script', return_value=[
+        ['x', True, 'one', True, rect],
+        [None, False, 'two', False, rect],
+    ])
+
+    rows = driver.read_elements(elements, attributes=['href'], properties=['checked'],
+                                text=True, displayed=True, rect=True)
+
+    assert execute_script.call_count == 1
+    assert execute_script.call_args[0][1:] == (elements, ['href'], ['checked'], True, True, True)
+    assert rows == [
+        {'attributes': {'href': 'x'}, 'properties': {'checked': True},
+         'text': 'one', 'displayed': True, 'rect': rect},
+        {'attributes': {'href': None}, 'properties': {'checked': False},
+         'text': 'two', 'displayed': False, 'rect': rect},
+    ]
+
+
+def test_only_embeds_atoms_that_are_needed(driver, mocker):
+    execute_script = mocker.patch.object(driver, 'execute_script',
+                                         side_effect=[[['text']], [['a', True]]])
+    driver.read_elements([driver.create_web_element('a')], text=True)
+    script = execute_script.call_args[0][0]
+    assert getAttribute_js not in script
+    assert isDisplayed_js not in script
+
+    driver.read_elements([driver.create_web_element('a')], attributes=['id'], displayed=True)
+    script = execute_script.call_args[0][0]
+    assert getAttribute_js in script
+    assert isDisplayed_js in script
+
+
+def test_reading_no_elements_sends_nothing(driver, mocker):
+    execute_script = mocker.patch.object(driver, 'execute_script')
+    assert driver.read_elements([], text=True) == []
+    assert execute_script.call_count == 0
@@ -0,0 +1,98 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import base64
+import io
+import json
+import os
+
+import pytest
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.remote_connection import _ResponseValueWriter
+
+
+def write_value(body, base64_value=False, chunk_size=1):
+    output = io.BytesIO()
+    writer = _ResponseValueWriter(output, base64_value)
+    for i in range(0, len(body), chunk_size):
+        writer.feed(body[i:i + chunk_size])
+    return writer.close(200, 'application/json'), output.getvalue()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 4096])
+def test_writes_unescaped_string_value(chunk_size):
+    source = u'<p title="a\\b">caf\xe9 \U0001f600\n</p>'
+    body = json.dumps({'sessionId': 'x', 'status': 0, 'value': source}).encode('utf-8')
+    response, data = write_value(body, chunk_size=chunk_size)
+    assert response == {'sessionId': 'x', 'status': 0, 'value': None}
+    assert data == source.encode('utf-8')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 4096])
+def test_decodes_base64_value(chunk_size):
+    png = bytes(bytearray(range(256))) * 3
+    encoded = base64.encodestring(png) if hasattr(base64, 'encodestring') else base64.encodebytes(png)
+    body = json.dumps({'value': encoded.decode('ascii')}).replace('/', '\\/').encode('utf-8')
+    response, data = write_value(body, base64_value=True, chunk_size=chunk_size)
+    assert response == {'value': None}
+    assert data == png
+
+
+def test_non_string_values_are_parsed_as_usual():
+    body = b'{"value": {"error": "no such window", "message": "gone"}}'
+    response, data = write_value(body)
+    assert response == {'value': {'error': 'no such window', 'message': 'gone'}}
+    assert data == b''
+
+
+def test_save_page_source(server, driver, tmpdir):
+    server.page_source = u'<html>\u2603</html>' * 10000
+    path = str(tmpdir.join('source.html'))
+    assert driver.save_page_source(path)
+    with io.open(path, encoding='utf-8') as f:
+        assert f.read() == server.page_source
+
+
+def test_screenshots_are_saved(server, driver, tmpdir):
+    server.screenshot = os.urandom(200000)
+    path = str(tmpdir.join('window.png'))
+    assert driver.get_screenshot_as_file(path)
+    with open(path, 'rb') as f:
+        assert f.read() == server.screenshot
+
+    path = str(tmpdir.join('element.png'))
+    assert driver.find_element(By.ID, 'heading').screenshot(path)
+    with open(path, 'rb') as f:
+        assert f.read() == server.screenshot
+
+
+def test_file_is_removed_when_command_fails(driver, tmpdir):
+    path = str(tmpdir.join('element.png'))
+    with pytest.raises(StaleElementReferenceException):
+        driver.create_web_element('missing').screenshot(path)
+    assert not os.path.exists(path)
+
+
+def test_falls_back_to_execute_without_streaming_support(driver, mocker, tmpdir):
+    mocker.patch.object(driver, 'command_executor', mocker.Mock(spec=['execute']))
+    driver.command_executor.execute.return_value = {'value': base64.b64encode(b'png').decode('ascii')}
+    path = str(tmpdir.join('window.png'))
+    assert driver.save_screenshot(path)
+    with open(path, 'rb') as f:
+        assert f.read() == b'png'
@@ -0,0 +1,89 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import zipfile
+
+import pytest
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.instrumentation import CommandHistogram
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+@pytest.fixture
+def photo(tmpdir):
+    path = tmpdir.join('photo.jpg')
+    path.write_binary(bytes(bytearray(range(256))) * 4096)
+    return str(path)
+
+
+def test_uploads_a_file_with_its_content_length(server, driver, photo):
+    histogram = CommandHistogram()
+    driver.command_executor.add_command_listener(histogram)
+    driver.find_element(By.ID, 'name').send_keys(photo)
+
+    assert server.uploads == [(zipfile.ZIP_DEFLATED, open(photo, 'rb').read())]
+    assert server.requests[-1][2]['text'] == '/uploads/1/photo.jpg'
+    assert histogram.snapshot()['uploadFile']['request_bytes'] > 0
+
+
+def test_uploads_each_file_once_per_session(server, driver, photo, tmpdir):
+    element = driver.find_element(By.ID, 'name')
+    element.send_keys(photo)
+    element.send_keys(photo)
+    assert len(server.uploads) == 1
+    assert server.requests[-1][2]['text'] == '/uploads/1/photo.jpg'
+
+    with open(photo, 'ab') as f:
+        f.write(b'changed')
+    element.send_keys(photo)
+    assert len(server.uploads) == 2
+
+    other = WebDriver(server.url)
+    try:
+        other.find_element(By.ID, 'name').send_keys(photo)
+    finally:
+        other.quit()
+    assert len(server.uploads) == 3
+
+
+def test_stores_files_uncompressed_at_level_0(server, driver, photo, mocker):
+    mocker.patch.object(WebDriver, 'upload_compress_level', 0)
+    driver.find_element(By.ID, 'name').send_keys(photo)
+    assert server.uploads == [(zipfile.ZIP_STORED, open(photo, 'rb').read())]
+
+
+def test_uploads_through_executors_without_streaming(server, photo):
+    class Executor(object):
+        def __init__(self, url):
+            self._connection = RemoteConnection(url)
+            self.commands = []
+
+        def execute(self, command, params):
+            self.commands.append((command, params))
+            return self._connection.execute(command, params)
+
+    executor = Executor(server.url)
+    driver = WebDriver(executor)
+    try:
+        driver.find_element(By.ID, 'name').send_keys(photo)
+    finally:
+        driver.quit()
+    params = [params for command, params in executor.commands if command == 'uploadFile'][0]
+    assert 'file' in params
+    assert server.uploads == [(zipfile.ZIP_DEFLATED, open(photo, 'rb').read())]
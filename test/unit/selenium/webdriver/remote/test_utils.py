@@ -0,0 +1,70 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote import utils
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection, _parse_response
+
+
+@pytest.fixture(params=['json', 'orjson', 'ujson'])
+def backend(request):
+    if request.param not in utils.JSON_BACKENDS:
+        pytest.skip('%s is not installed' % request.param)
+    dumps, loads = utils._dumps, utils._loads
+    utils.set_json_backend(request.param)
+    yield request.param
+    utils._dumps, utils._loads = dumps, loads
+
+
+def test_round_trips_command_payloads(backend):
+    payload = {'script': u'return "\xe9"', 'args': [1, 2.5, None, True, {'a': []}]}
+    dumped = utils.dump_json(payload)
+    assert isinstance(dumped, type(u''))
+    assert utils.load_json(dumped) == payload
+
+
+def test_loads_utf8_bytes(backend):
+    assert utils.load_json(u'{"value": "\xe9"}'.encode('utf-8')) == {'value': u'\xe9'}
+
+
+def test_invalid_json_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        utils.load_json(b'not json')
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        utils.set_json_backend('simplejson-3000')
+
+
+def test_parses_response_bytes(backend):
+    assert _parse_response(200, 'application/json', b' {"value": [1]}\n') == {'value': [1]}
+    assert _parse_response(200, 'application/json', b'{"sessionId": "a"}') == {'sessionId': 'a', 'value': None}
+    assert _parse_response(200, 'text/plain', b' ok ') == {'status': 0, 'value': 'ok'}
+    assert _parse_response(404, 'application/json', b'{"value": 1}') == {'status': 404, 'value': '{"value": 1}'}
+
+
+def test_non_ascii_commands_are_sent_as_utf8(backend, server, driver):
+    params = {'sessionId': 'x', 'id': 'name', 'text': u'caf\xe9 \u4e2d'}
+    data = RemoteConnection(server.url)._command_request(Command.SEND_KEYS_TO_ELEMENT, params)[2]
+    assert utils.load_json(data.decode('utf-8'))['text'] == u'caf\xe9 \u4e2d'
+
+    driver.find_element(By.ID, 'name').send_keys(u'caf\xe9 \u4e2d')
+    assert server.requests[-1][2]['text'] == u'caf\xe9 \u4e2d'
@@ -0,0 +1,113 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import sys
+
+import pytest
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement, getAttribute_js, isDisplayed_js
+
+
+@pytest.fixture
+def driver(mocker):
+    mocker.patch('selenium.webdriver.remote.webdriver.WebDriver.start_session')
+    driver = WebDriver()
+    driver.w3c = True
+    return driver
+
+
+def test_is_displayed_installs_atom_once(driver, mocker):
+    element = driver.create_web_element('a')
+    element._w3c = True
+    execute_script = mocker.patch.object(driver, 'execute_script', side_effect=[
+        {'webdriver-atom-missing': True}, True, False])
+
+    assert element.is_displayed() is True
+    assert element.is_displayed() is False
+
+    scripts = [c[0][0] for c in execute_script.call_args_list]
+    assert isDisplayed_js not in scripts[0]
+    assert isDisplayed_js in scripts[1]
+    assert scripts[2] == scripts[0]
+
+
+def test_get_attribute_reinstalls_atom_when_page_changes(driver, mocker):
+    element = driver.create_web_element('a')
+    element._w3c = True
+    missing = {'webdriver-atom-missing': True}
+    execute_script = mocker.patch.object(driver, 'execute_script', side_effect=[
+        missing, 'first', 'second', missing, 'third'])
+
+    assert [element.get_attribute('href') for _ in range(3)] == ['first', 'second', 'third']
+
+    installs = [c for c in execute_script.call_args_list if getAttribute_js in c[0][0]]
+    assert len(installs) == 2
+    assert installs[0][0][1:] == (element, 'href')
+
+
+def test_elements_with_the_same_id_are_equal_and_hash_alike(driver):
+    first, second = driver.create_web_element('a'), driver.create_web_element(''.join(['a']))
+    assert first == second
+    assert len({first, second, driver.create_web_element('b')}) == 2
+    assert not hasattr(first, '__dict__')
+    assert first.id is second.id
+
+
+def test_unwrapping_element_lists_in_bulk(driver):
+    key = 'element-6066-11e4-a52e-4f735466cecf'
+    elements = driver._unwrap_value([{key: 'a'}, {'ELEMENT': 'b'}])
+    assert [e.id for e in elements] == ['a', 'b']
+    assert all(e._w3c for e in elements)
+    mixed = driver._unwrap_value([{key: 'a'}, 1, {'b': [{key: 'c'}]}])
+    assert mixed[0].id == 'a' and mixed[1] == 1 and mixed[2]['b'][0].id == 'c'
+
+
+def test_unwrapping_element_lists_uses_overridden_create_web_element(mocker):
+    class CustomElement(WebElement):
+        __slots__ = ()
+
+    class CustomDriver(WebDriver):
+        def create_web_element(self, element_id):
+            return CustomElement(self, element_id, w3c=self.w3c)
+
+    mocker.patch('selenium.webdriver.remote.webdriver.WebDriver.start_session')
+    driver = CustomDriver()
+    driver.w3c = True
+    key = 'element-6066-11e4-a52e-4f735466cecf'
+    assert type(driver._unwrap_value({key: 'a'})) is CustomElement
+    assert [type(e) for e in driver._unwrap_value([{key: 'a'}, {key: 'b'}])] == [CustomElement] * 2
+
+
+def test_wrapping_copies_only_containers_holding_elements(driver):
+    element = driver.create_web_element('a')
+    untouched = {'b': [1, 'two']}
+    args = [untouched, [element]]
+    wrapped = driver._wrap_value({'script': 'return 1', 'args': args})
+    assert wrapped['args'][0] is untouched
+    assert wrapped['args'][1] == [{'ELEMENT': 'a', 'element-6066-11e4-a52e-4f735466cecf': 'a'}]
+    assert args[1] == [element]
+
+
+def test_unwrapping_deeply_nested_values(driver):
+    value = nested = []
+    for _ in range(sys.getrecursionlimit() * 2):
+        nested.append([])
+        nested = nested[0]
+    nested.extend([{'ELEMENT': 'a'}, 1])
+    assert driver._unwrap_value(value) is value
+    assert nested[0].id == 'a'
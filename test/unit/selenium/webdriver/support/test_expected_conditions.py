@@ -0,0 +1,84 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.remote.webelement import isDisplayed_js
+from selenium.webdriver.support.page_conditions import page_condition
+
+banner = EC.visibility_of_element_located((By.ID, 'error'))
+dashboard = EC.presence_of_element_located((By.ID, 'dashboard'))
+
+
+@pytest.fixture
+def driver(mocker):
+    return mocker.Mock()
+
+
+def test_any_of_evaluates_supported_conditions_in_one_script(driver, mocker):
+    driver.execute_script.return_value = [True, [[False, None], [True, mocker.sentinel.dashboard]]]
+    assert EC.any_of(banner, dashboard)(driver) is mocker.sentinel.dashboard
+    assert driver.execute_script.call_count == 1
+    spec = driver.execute_script.call_args[0][1]
+    assert spec == {'op': 'each', 'conditions': [page_condition(banner), page_condition(dashboard)]}
+    assert not driver.find_element.called
+
+
+def test_all_of_calls_other_conditions_only_when_needed(driver, mocker):
+    other = mocker.Mock(return_value='other')
+    driver.execute_script.return_value = [True, [[False, None]]]
+    assert EC.all_of(other, dashboard)(driver) is False
+    assert not other.called
+
+    driver.execute_script.return_value = [True, [[True, mocker.sentinel.dashboard]]]
+    assert EC.all_of(other, dashboard)(driver) == ['other', mocker.sentinel.dashboard]
+    other.assert_called_once_with(driver)
+
+
+def test_none_of(driver, mocker):
+    failing = mocker.Mock(side_effect=NoSuchElementException())
+    driver.execute_script.return_value = [True, [[False, None]]]
+    assert EC.none_of(failing, dashboard)(driver) is True
+    driver.execute_script.return_value = [True, [[True, mocker.sentinel.dashboard]]]
+    assert EC.none_of(failing, dashboard)(driver) is False
+
+
+def test_falls_back_to_calling_conditions_when_script_fails(driver, mocker):
+    driver.execute_script.side_effect = JavascriptException('unsupported')
+    driver.find_element.return_value = mocker.sentinel.dashboard
+    assert EC.any_of(dashboard)(driver) is mocker.sentinel.dashboard
+    driver.find_element.assert_called_once_with(By.ID, 'dashboard')
+
+
+def test_composites_of_supported_conditions_can_be_observed(mocker):
+    assert page_condition(EC.none_of(banner, dashboard)) == {
+        'op': 'none_of', 'conditions': [page_condition(banner), page_condition(dashboard)]}
+    assert page_condition(EC.all_of(banner, mocker.Mock())) is None
+
+
+def test_visibility_atom_is_only_sent_when_the_page_lacks_it(driver, mocker):
+    driver.execute_script.side_effect = [
+        {'webdriver-atom-missing': True},
+        [True, [[True, mocker.sentinel.banner]]],
+        [True, [[True, mocker.sentinel.banner]]]]
+    assert EC.any_of(banner)(driver) is mocker.sentinel.banner
+    assert EC.any_of(banner)(driver) is mocker.sentinel.banner
+    scripts = [call[0][0] for call in driver.execute_script.call_args_list]
+    assert [isDisplayed_js in script for script in scripts] == [False, True, False]
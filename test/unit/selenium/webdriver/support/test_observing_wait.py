@@ -0,0 +1,129 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import json
+import subprocess
+
+import pytest
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import isDisplayed_js
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.observing_wait import ObservingWebDriverWait
+from selenium.webdriver.support.page_conditions import evaluate_script, page_condition
+
+
+def node_available():
+    try:
+        subprocess.check_output(['node', '--version'])
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+def evaluate_in_node(spec, elements):
+    """Evaluates `spec` with node against a document of stand-in elements keyed by id."""
+    source = (
+        'var elements = %s;'
+        'var document = {querySelectorAll: function(selector) {'
+        '  var e = elements[/"(.*)"/.exec(selector)[1]]; return e ? [e] : []; }};'
+        'console.log(JSON.stringify((function() { %s }).apply(null, [%s])));'
+        % (json.dumps(elements), evaluate_script(spec), json.dumps(spec)))
+    return json.loads(subprocess.check_output(['node', '-e', source]).decode('utf-8'))
+
+
+def test_translates_locator_conditions():
+    assert page_condition(EC.visibility_of_element_located((By.ID, 'a'))) == {
+        'op': 'visible', 'by': By.ID, 'value': 'a'}
+    assert page_condition(EC.text_to_be_present_in_element((By.NAME, 'q'), 'x')) == {
+        'op': 'text', 'by': By.NAME, 'value': 'q', 'text': 'x'}
+    assert page_condition(EC.title_is('t')) == {'op': 'title_is', 'text': 't'}
+
+
+def test_does_not_translate_other_conditions(mocker):
+    assert page_condition(lambda driver: True) is None
+    assert page_condition(EC.visibility_of(mocker.sentinel.element)) is None
+    assert page_condition(EC.invisibility_of_element_located(mocker.Mock())) is None
+
+
+def test_returns_the_value_the_page_resolves_with(mocker):
+    driver = mocker.Mock()
+    driver.execute_async_script.side_effect = [[False, None], [True, mocker.sentinel.element]]
+    condition = EC.presence_of_element_located((By.ID, 'a'))
+    assert ObservingWebDriverWait(driver, 10).until(condition) is mocker.sentinel.element
+    args = driver.execute_async_script.call_args[0]
+    assert args[1] == {'op': 'present', 'by': By.ID, 'value': 'a'}
+    assert args[2] <= 10000
+    assert not driver.find_element.called
+
+
+def test_times_out(mocker):
+    driver = mocker.Mock()
+    driver.execute_async_script.return_value = [False, None]
+    with pytest.raises(TimeoutException):
+        ObservingWebDriverWait(driver, 0).until(EC.title_is('t'), 'no title')
+
+
+def test_polls_when_script_timeout_is_too_short(mocker):
+    driver = mocker.Mock(title='t')
+    driver.execute_async_script.side_effect = TimeoutException()
+    assert ObservingWebDriverWait(driver, 1).until(EC.title_is('t'))
+    assert driver.execute_async_script.call_count == 1
+
+
+def test_checks_from_client_when_page_navigates(mocker):
+    driver = mocker.Mock(title='t')
+    driver.execute_async_script.side_effect = JavascriptException('document unloaded')
+    assert ObservingWebDriverWait(driver, 1).until(EC.title_is('t'))
+
+
+def test_waits_between_failing_scripts(mocker):
+    driver = mocker.Mock(title='other')
+    driver.execute_async_script.side_effect = JavascriptException('no MutationObserver')
+    with pytest.raises(TimeoutException):
+        ObservingWebDriverWait(driver, 0.3, poll_frequency=0.1).until(EC.title_is('t'))
+    assert driver.execute_async_script.call_count <= 5
+
+
+@pytest.mark.skipif(not node_available(), reason='node is not installed')
+def test_selection_state_matches_is_selected():
+    elements = {
+        'checked': {'tagName': 'INPUT', 'checked': True},
+        'unchecked': {'tagName': 'INPUT', 'checked': False},
+        'option': {'tagName': 'OPTION', 'selected': True},
+    }
+
+    def met(condition):
+        return evaluate_in_node(page_condition(condition), elements)[0]
+
+    assert met(EC.element_located_to_be_selected((By.ID, 'checked')))
+    assert met(EC.element_located_selection_state_to_be((By.ID, 'unchecked'), False))
+    assert not met(EC.element_located_to_be_selected((By.ID, 'unchecked')))
+    assert met(EC.element_located_to_be_selected((By.ID, 'option')))
+    assert met(EC.all_of(EC.element_located_to_be_selected((By.ID, 'checked')),
+                         EC.element_located_to_be_selected((By.ID, 'option'))))
+
+
+def test_installs_the_visibility_atom_when_the_page_lacks_it(mocker):
+    driver = mocker.Mock()
+    driver.execute_async_script.side_effect = [
+        {'webdriver-atom-missing': True}, [True, mocker.sentinel.element]]
+    condition = EC.visibility_of_element_located((By.ID, 'a'))
+    assert ObservingWebDriverWait(driver, 10).until(condition) is mocker.sentinel.element
+    scripts = [call[0][0] for call in driver.execute_async_script.call_args_list]
+    assert [isDisplayed_js in script for script in scripts] == [False, True]
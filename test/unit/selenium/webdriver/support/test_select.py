@@ -0,0 +1,90 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.support.select import Select
+
+
+@pytest.fixture
+def options(mocker):
+    return [mocker.Mock(name='option%d' % i) for i in range(3)]
+
+
+def make_select(mocker, options, selected, multiple=None):
+    element = mocker.Mock(spec=['tag_name', 'get_attribute', 'parent'], tag_name='select')
+    element.get_attribute.return_value = multiple
+    element.parent.execute_script.return_value = [
+        [option, 'Option %d' % i, 'v%d' % i, 'v%d' % i, i, i in selected, False]
+        for i, option in enumerate(options)]
+    return Select(element)
+
+
+def test_reads_all_options_in_one_call(mocker, options):
+    select = make_select(mocker, options, selected=[1, 2], multiple='true')
+    assert select.all_selected_options == options[1:]
+    element = select._el
+    assert element.parent.execute_script.call_count == 1
+    assert element.parent.execute_script.call_args[0][1] is element
+    assert select.read_options()[0] == {'element': options[0], 'text': 'Option 0', 'value': 'v0',
+                                        'value_attribute': 'v0', 'index': 0, 'selected': False,
+                                        'disabled': False}
+    assert not any(option.is_selected.called for option in options)
+
+
+def test_first_selected_option(mocker, options):
+    assert make_select(mocker, options, selected=[2]).first_selected_option is options[2]
+    with pytest.raises(NoSuchElementException):
+        make_select(mocker, options, selected=[]).first_selected_option
+
+
+def test_select_only_clicks_the_matching_option(mocker, options):
+    select = make_select(mocker, options, selected=[0])
+    select.select_by_index(2)
+    select.select_by_value('v1')
+    select.select_by_visible_text('Option 0')
+    assert [option.click.call_count for option in options] == [0, 1, 1]
+    assert not any(option.get_attribute.called for option in options)
+    with pytest.raises(NoSuchElementException):
+        select.select_by_value('missing')
+
+
+def test_select_by_value_ignores_options_without_a_value_attribute(mocker, options):
+    select = make_select(mocker, options, selected=[], multiple='true')
+    rows = select._el.parent.execute_script.return_value
+    rows[1][2:4] = ['Option 1', None]
+    with pytest.raises(NoSuchElementException):
+        select.select_by_value('Option 1')
+    with pytest.raises(NoSuchElementException):
+        select.deselect_by_value('Option 1')
+    assert not options[1].click.called
+
+
+def test_indexes_may_be_given_as_strings(mocker, options):
+    select = make_select(mocker, options, selected=[0], multiple='true')
+    select.select_by_index('2')
+    select.deselect_by_index('0')
+    assert [option.click.call_count for option in options] == [1, 0, 1]
+    with pytest.raises(NoSuchElementException):
+        select.select_by_index('5')
+
+
+def test_deselect_all_only_clicks_selected_options(mocker, options):
+    select = make_select(mocker, options, selected=[0, 2], multiple='true')
+    select.deselect_all()
+    assert [option.click.call_count for option in options] == [1, 0, 1]
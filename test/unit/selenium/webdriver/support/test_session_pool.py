@@ -0,0 +1,126 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.session_pool import SessionPool, reset_session
+
+
+@pytest.fixture
+def factory(mocker):
+    return mocker.Mock(side_effect=lambda: mocker.Mock(window_handles=['main']))
+
+
+def test_prestarts_sessions(factory):
+    pool = SessionPool(factory, size=3)
+    assert factory.call_count == 3
+    drivers = set(pool.acquire() for _ in range(3))
+    assert len(drivers) == 3
+    assert factory.call_count == 3
+
+
+def test_sessions_are_quit_when_prestarting_fails(mocker):
+    drivers = [mocker.Mock(), WebDriverException('no browser'), mocker.Mock()]
+    factory = mocker.Mock(side_effect=drivers)
+    with pytest.raises(WebDriverException):
+        SessionPool(factory, size=3)
+    drivers[0].quit.assert_called_once_with()
+    drivers[2].quit.assert_called_once_with()
+
+
+def test_sessions_started_while_closing_are_quit(mocker):
+    pools = []
+
+    def close_while_starting():
+        pools[0].close()
+        return mocker.Mock()
+
+    pools.append(SessionPool(mocker.Mock(side_effect=close_while_starting), size=2,
+                             prestart=False))
+    pools[0].fill()
+    assert pools[0]._idle == []
+    assert pools[0]._uses == {}
+
+
+def test_sessions_are_reset_and_reused(factory, mocker):
+    reset = mocker.Mock()
+    pool = SessionPool(factory, size=1, reset=reset)
+    with pool.session() as driver:
+        pass
+    reset.assert_called_once_with(driver)
+    with pool.session() as again:
+        assert again is driver
+    driver.execute.assert_called_with(Command.STATUS)
+
+
+def test_sessions_are_replaced_after_max_uses(factory):
+    pool = SessionPool(factory, size=1, max_uses=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+    first.quit.assert_called_once_with()
+    assert pool.acquire() is not first
+
+
+def test_unhealthy_sessions_are_replaced(factory):
+    pool = SessionPool(factory, size=1)
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.execute.side_effect = WebDriverException('gone')
+    assert pool.acquire() is not driver
+    driver.quit.assert_called_once_with()
+
+
+def test_session_is_discarded_when_job_fails(factory):
+    pool = SessionPool(factory, size=1)
+    with pytest.raises(WebDriverException):
+        with pool.session() as driver:
+            raise WebDriverException('boom')
+    driver.quit.assert_called_once_with()
+
+
+def test_acquire_times_out_when_pool_is_exhausted(factory):
+    pool = SessionPool(factory, size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutException):
+        pool.acquire(timeout=0.01)
+
+
+def test_close_quits_idle_sessions(factory):
+    pool = SessionPool(factory, size=2)
+    busy = pool.acquire()
+    idle = pool.acquire()
+    pool.release(idle)
+    pool.close()
+    idle.quit.assert_called_once_with()
+    assert not busy.quit.called
+    pool.release(busy)
+    busy.quit.assert_called_once_with()
+    with pytest.raises(WebDriverException):
+        pool.acquire()
+
+
+def test_reset_session(mocker):
+    driver = mocker.Mock(window_handles=['main', 'popup'])
+    reset_session(driver)
+    assert driver.mock_calls[:4] == [
+        mocker.call.switch_to.window('popup'), mocker.call.close(),
+        mocker.call.switch_to.window('main'), mocker.call.delete_all_cookies()]
+    driver.get.assert_called_once_with('about:blank')
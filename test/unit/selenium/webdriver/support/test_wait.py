@@ -0,0 +1,77 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from itertools import islice
+
+import pytest
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import (ExponentialBackoff, FastThenSlow,
+                                             FixedInterval, Jittered, WebDriverWait)
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [100.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    mocker.patch('selenium.webdriver.support.wait._clock', side_effect=lambda: now[0])
+    return mocker.patch('time.sleep', side_effect=sleep)
+
+
+def test_exponential_backoff_is_capped():
+    delays = ExponentialBackoff(initial=0.1, factor=2, maximum=0.5).delays()
+    assert list(islice(delays, 5)) == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_fast_then_slow(clock):
+    delays = FastThenSlow(fast=0.1, fast_for=0.25, slow=1).delays()
+    found = []
+    for delay in islice(delays, 5):
+        found.append(delay)
+        clock(delay)
+    assert found == [0.1, 0.1, 0.1, 1, 1]
+
+
+def test_jittered_stays_within_ratio():
+    delays = Jittered(FixedInterval(1), ratio=0.5).delays()
+    assert all(0.5 <= delay <= 1.5 for delay in islice(delays, 50))
+
+
+def test_never_sleeps_past_the_deadline(clock, mocker):
+    condition = mocker.Mock(return_value=False)
+    with pytest.raises(TimeoutException):
+        WebDriverWait(mocker.sentinel.driver, 1.2, poll_frequency=0.5).until(condition)
+    assert [c[0][0] for c in clock.call_args_list] == [0.5, 0.5, pytest.approx(0.2)]
+    # The condition gets a last chance at the deadline.
+    assert condition.call_count == 4
+
+
+def test_uses_polling_strategy(clock, mocker):
+    condition = mocker.Mock(side_effect=[False, False, False, 'done'])
+    wait = WebDriverWait(mocker.sentinel.driver, 10, poll_frequency=ExponentialBackoff(initial=0.01))
+    assert wait.until(condition) == 'done'
+    assert [c[0][0] for c in clock.call_args_list] == [0.01, 0.02, 0.04]
+
+
+def test_until_not_uses_the_same_schedule(clock, mocker):
+    condition = mocker.Mock(side_effect=[True, True, False])
+    wait = WebDriverWait(mocker.sentinel.driver, 10, poll_frequency=0.3)
+    assert wait.until_not(condition) is False
+    assert [c[0][0] for c in clock.call_args_list] == [0.3, 0.3]